@@ -0,0 +1,163 @@
+import pickle
+
+import pytest
+from typing_extensions import NotRequired
+
+from typingx import CheckedDict, CheckedList, CheckedTypedDict, List, TypedDict, Union
+
+
+class Movie(TypedDict):
+    name: str
+    year: NotRequired[int]
+    __extra__: str
+
+
+def test_checked_list():
+    lst = CheckedList[int]([1, 2])
+    assert lst == [1, 2]
+    assert isinstance(lst, list)
+    assert type(lst) is CheckedList[int]
+    assert type(lst).__name__ == "CheckedList[int]"
+
+    lst.append(3)
+    lst.insert(0, 0)
+    lst.extend(iter([4, 5]))
+    lst += [6]
+    lst[0] = -1
+    lst[1:3] = [10, 20, 30]
+    assert lst == [-1, 10, 20, 30, 3, 4, 5, 6]
+    assert type(lst) is CheckedList[int]
+
+    with pytest.raises(TypeError) as e:
+        lst.append("7")
+    assert str(e.value) == "Item (value: '7') is not a valid int"
+
+    for mutate in (
+        lambda: lst.insert(0, "0"),
+        lambda: lst.extend([7, "8"]),
+        lambda: lst.__iadd__([7, "8"]),
+        lambda: lst.__setitem__(0, "0"),
+        lambda: lst.__setitem__(slice(0, 1), [0, "0"]),
+    ):
+        with pytest.raises(TypeError):
+            mutate()
+    assert lst == [-1, 10, 20, 30, 3, 4, 5, 6]
+
+    with pytest.raises(TypeError):
+        CheckedList[int]([1, "2"])
+
+
+def test_checked_list_parameters():
+    assert CheckedList[int] is CheckedList[int]
+    assert CheckedList[Union[int, str]]([1, "2"]) == [1, "2"]
+    assert CheckedList[List[int]]([[1], []]) == [[1], []]
+    assert CheckedList[[int, ..., str]]([[1, 2, "3"]]) == [[1, 2, "3"]]
+    assert CheckedList({"a": 1}) == ["a"]
+    assert CheckedList[{"a": int}]([{"a": 1}]) == [{"a": 1}]
+    with pytest.raises(TypeError) as e:
+        CheckedList[int, str]
+    assert str(e.value) == "CheckedList expects 1 type(s) but got 2"
+
+
+def test_checked_dict():
+    dct = CheckedDict[str, int]({"a": 1}, b=2)
+    assert dct == {"a": 1, "b": 2}
+
+    dct["c"] = 3
+    dct.update({"d": 4}, e=5)
+    dct |= {"f": 6}
+    assert dct.setdefault("g", 7) == 7
+    assert dct.setdefault("g", "not checked since not set") == 7
+    assert dct == {"a": 1, "b": 2, "c": 3, "d": 4, "e": 5, "f": 6, "g": 7}
+
+    with pytest.raises(TypeError) as e:
+        dct["h"] = "8"
+    assert str(e.value) == "Value of key 'h' (value: '8') is not a valid int"
+
+    with pytest.raises(TypeError) as e:
+        dct[1] = 8
+    assert str(e.value) == "Key (value: 1) is not a valid str"
+
+    for mutate in (
+        lambda: dct.update({"h": 8, "i": "9"}),
+        lambda: dct.setdefault("h", "8"),
+        lambda: dct.__ior__({"h": "8"}),
+    ):
+        with pytest.raises(TypeError):
+            mutate()
+    assert dct == {"a": 1, "b": 2, "c": 3, "d": 4, "e": 5, "f": 6, "g": 7}
+
+    with pytest.raises(TypeError):
+        CheckedDict[str, int](a="1")
+
+
+def test_checked_typeddict():
+    movie = CheckedTypedDict[Movie](name="The Matrix")
+    movie["year"] = 1999
+    movie["director"] = "Wachowski"
+    movie.update(studio="Warner")
+    assert movie == {
+        "name": "The Matrix",
+        "year": 1999,
+        "director": "Wachowski",
+        "studio": "Warner",
+    }
+
+    assert movie.pop("studio") == "Warner"
+    assert movie.popitem() == ("director", "Wachowski")
+    del movie["year"]
+    assert movie.pop("year", None) is None
+    assert movie == {"name": "The Matrix"}
+
+    with pytest.raises(TypeError) as e:
+        movie["year"] = "1999"
+    assert str(e.value) == "Field 'year' (value: '1999') is not a valid NotRequired[int]"
+
+    with pytest.raises(TypeError) as e:
+        del movie["name"]
+    assert str(e.value) == "Field 'name' is required in a valid Movie"
+
+    for mutate in (movie.popitem, movie.clear, lambda: movie.pop("name")):
+        with pytest.raises(TypeError):
+            mutate()
+    assert movie == {"name": "The Matrix"}
+
+    with pytest.raises(TypeError) as e:
+        CheckedTypedDict[Movie](year=1999)
+    assert str(e.value) == "Missing keys ['name'] for a valid Movie"
+
+    with pytest.raises(TypeError) as e:
+        CheckedTypedDict[{"a": int}](a=1, b=2)
+    assert str(e.value) == "Field 'b' is not allowed in a valid _TypedDict"
+
+    with pytest.raises(TypeError):
+        CheckedTypedDict(a=1)
+
+    with pytest.raises(TypeError) as e:
+        CheckedTypedDict[int]
+    assert str(e.value) == "CheckedTypedDict expects a TypedDict but got int"
+
+
+class IntList(CheckedList[int]):
+    pass
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        CheckedList[int]([1, 2]),
+        CheckedList[List[int]]([[1]]),
+        CheckedDict[str, int](a=1),
+        CheckedTypedDict[Movie](name="The Matrix", year=1999),
+        IntList([1]),
+    ],
+)
+def test_checked_pickle(obj):
+    """It should pickle parameterized containers and keep checking them once unpickled"""
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        copy = pickle.loads(pickle.dumps(obj, protocol))
+        assert copy == obj
+        assert type(copy) is type(obj)
+
+    with pytest.raises(TypeError):
+        copy[next(iter(copy))] = object()
@@ -0,0 +1,129 @@
+import json
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import typingx.__main__ as cli
+from typingx.__main__ import main
+
+MODELS = """
+from typingx import Annotated, Constraints, TypedDict
+
+class Movie(TypedDict):
+    name: str
+    year: Annotated[int, Constraints(ge=1900)]
+"""
+
+
+@pytest.fixture
+def models(tmp_path, monkeypatch):
+    (tmp_path / "cli_models.py").write_text(textwrap.dedent(MODELS))
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+
+MOVIES = [
+    {"name": "The Matrix", "year": 1999},
+    {"name": "Alien", "year": "1979"},
+    {"name": "Metropolis", "year": 1927},
+    {"year": 1800},
+    {"name": "Dune", "year": 2021, "director": "Villeneuve"},
+]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_jsonl(models, tmp_path, capsys, workers):
+    path = tmp_path / "movies.jsonl"
+    lines = [json.dumps(movie) for movie in MOVIES]
+    path.write_text("\n".join([*lines[:2], "{invalid", "", *lines[2:]]) + "\n")
+
+    args = ["validate", "cli_models:Movie", str(path), "--workers", str(workers)]
+    assert main(args) == 1
+
+    out = capsys.readouterr().out.splitlines()
+    assert out[0] == "6 records checked against Movie: 4 invalid"
+    assert "records/s" in out[1] and "MB/s" in out[1]
+    assert out[2:] == [
+        "invalid records:",
+        "  record 2: year",
+        "  record 3: <invalid JSON>",
+        "  record 6: name (missing), year",
+        "  record 7: director (not allowed)",
+        "failures by field:",
+        "  year: 2",
+        "  <invalid JSON>: 1",
+        "  name (missing): 1",
+        "  director (not allowed): 1",
+    ]
+
+
+def test_validate_json_array(models, tmp_path, capsys):
+    path = tmp_path / "movies.json"
+    path.write_text(json.dumps(MOVIES[:1] * 3))
+
+    assert main(["validate", "cli_models:Movie", str(path)]) == 0
+    assert capsys.readouterr().out.startswith("3 records checked against Movie: 0 invalid\n")
+
+    path.write_text(json.dumps(MOVIES))
+    assert main(["validate", "cli_models:Movie", str(path), "--max-errors", "1"]) == 1
+    out = capsys.readouterr().out
+    assert "  record 1: year\n  ... and 2 more\n" in out
+
+
+def test_validate_invalid_type(models, tmp_path):
+    with pytest.raises(SystemExit, match="expected `module:Type`"):
+        main(["validate", "cli_models.Movie", str(tmp_path / "movies.json")])
+
+
+def test_validate_json_array_nested_items(models, tmp_path, capsys):
+    path = tmp_path / "movies.json"
+    movies = [
+        {"name": 'The "Matrix", [1999] {', "year": 1999},
+        {"name": "Alien\\", "year": 1979, "cast": [{"name": "]"}]},
+    ]
+    path.write_text(" \n" + json.dumps(movies, indent=2))
+
+    assert main(["validate", "cli_models:Movie", str(path)]) == 1
+    out = capsys.readouterr().out
+    assert out.startswith("2 records checked against Movie: 1 invalid\n")
+    assert "  record 1: cast (not allowed)\n" in out
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ("", "0 records checked against Movie: 0 invalid"),
+        ("[ ]", "0 records checked against Movie: 0 invalid"),
+        ('[{"name": "Alien", "year": 1979}, {"name"', "2 records checked against Movie: 1 invalid"),
+        ('[{"name": "Alien", "year": 1979}]\n', "1 records checked against Movie: 0 invalid"),
+        (
+            '[{"name": "Alien", "year": 1979}] garbage {"x": ',
+            "2 records checked against Movie: 1 invalid",
+        ),
+        ('[] {"name": "Alien", "year": 1979}', "1 records checked against Movie: 1 invalid"),
+    ],
+)
+def test_validate_json_array_edge_cases(models, tmp_path, capsys, content, expected):
+    path = tmp_path / "movies.json"
+    path.write_text(content)
+
+    exit_code = main(["validate", "cli_models:Movie", str(path)])
+    assert capsys.readouterr().out.splitlines()[0] == expected
+    assert exit_code == (0 if expected.endswith(" 0 invalid") else 1)
+
+
+def test_map_bounded(monkeypatch):
+    monkeypatch.setattr(cli, "_validate_chunk", lambda chunk: (len(chunk), []))
+    consumed = []
+
+    def chunks():
+        for i in range(10):
+            consumed.append(i)
+            yield [(i, b"{}")]
+
+    with ThreadPoolExecutor(2) as pool:
+        for i, result in enumerate(cli._map_bounded(pool, chunks(), 3)):
+            assert result == (1, [])
+            # chunks are only consumed as results are yielded
+            assert len(consumed) <= i + 4
+    assert consumed == list(range(10))
@@ -0,0 +1,51 @@
+from typing import Dict, List
+
+import pytest
+
+from typingx import TypeCheckError, func_check
+
+
+@pytest.fixture
+def value_repr():
+    limits = vars(TypeCheckError.value_repr).copy()
+    yield TypeCheckError.value_repr
+    vars(TypeCheckError.value_repr).update(limits)
+
+
+def test_type_check_error():
+    e = TypeCheckError("Input a", "x", List[int])
+    assert isinstance(e, TypeError)
+    assert (e.name, e.value, e.tp) == ("Input a", "x", List[int])
+    assert str(e) == "Input a (value: 'x') is not a valid List[int]"
+    assert repr(e) == "TypeCheckError(\"Input a (value: 'x') is not a valid List[int]\")"
+
+
+def test_type_check_error_truncated():
+    e = TypeCheckError("Input a", list(range(100_000)), List[str])
+    assert str(e) == (
+        "Input a (value: [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, ...]) is not a valid List[str]"
+    )
+
+    e = TypeCheckError("Value", "a" * 1000, int)
+    assert len(str(e)) < 120
+
+
+def test_type_check_error_limits(value_repr):
+    value_repr.maxlist = 3
+    e = TypeCheckError("Value", [1, 2, 3, 4], List[str])
+    assert str(e) == "Value (value: [1, 2, 3, ...]) is not a valid List[str]"
+
+
+def test_func_check_error():
+    @func_check
+    def my_func(a: Dict[str, int]) -> None:
+        pass
+
+    value = {str(i): i for i in range(1000)}
+    value["x"] = "y"
+    with pytest.raises(TypeCheckError) as e:
+        my_func(value)
+    assert e.value.value is value
+    assert e.value.tp == Dict[str, int]
+    assert str(e.value).startswith("Input a (value: {'0': 0, '1': 1,")
+    assert str(e.value).endswith("...}) is not a valid Dict[str, int]")
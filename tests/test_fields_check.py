@@ -0,0 +1,204 @@
+from dataclasses import dataclass, field
+from typing import Generic, NamedTuple, TypeVar
+
+import pytest
+
+from typingx import (
+    Annotated,
+    Any,
+    Budget,
+    BudgetExceeded,
+    Constraints,
+    Dict,
+    List,
+    Optional,
+    TypeCheckError,
+    fields_check,
+    isinstancex,
+)
+from typingx.fields_check import _is_validated
+from typingx.main import _CLASS_HANDLERS, _ORIGIN_HANDLERS, _TYPE_HANDLERS
+
+T = TypeVar("T")
+
+
+@pytest.fixture
+def custom_handlers():
+    registries = [
+        (registry, dict(registry))
+        for registry in (_ORIGIN_HANDLERS, _TYPE_HANDLERS, _CLASS_HANDLERS)
+    ]
+    yield
+    for registry, handlers in registries:
+        registry.clear()
+        registry.update(handlers)
+
+
+def test_fields_check_dataclass(custom_handlers):
+    @fields_check
+    @dataclass
+    class Movie:
+        name: str
+        year: Annotated[int, Constraints(ge=1900)]
+        tags: List[str] = field(default_factory=list)
+        extra: Any = None
+
+    assert isinstancex(Movie("The Matrix", 1999, ["sf"]), Movie) is True
+    assert isinstancex(Movie("The Matrix", 1899), Movie) is False
+    assert isinstancex(Movie("The Matrix", 1999, ["sf", 1]), Movie) is False
+    assert isinstancex([Movie("The Matrix", 1999)], List[Movie]) is True
+    assert isinstancex({"a": Movie("The Matrix", "1999")}, Dict[str, Movie]) is False
+    assert isinstancex("The Matrix", Movie) is False
+
+
+def test_fields_check_namedtuple(custom_handlers):
+    @fields_check
+    class Point(NamedTuple):
+        x: int
+        y: int = 0
+
+    assert isinstancex(Point(1, 2), Point) is True
+    assert isinstancex(Point(1, "2"), Point) is False
+    assert isinstancex((1, 2), Point) is False
+
+
+@fields_check
+@dataclass
+class Node:
+    value: int
+    children: List["Node"]
+
+
+def test_fields_check_forward_ref():
+    assert isinstancex(Node(1, [Node(2, [])]), Node) is True
+    assert isinstancex(Node(1, [Node("2", [])]), Node) is False
+
+
+def test_fields_check_budget(custom_handlers):
+    @fields_check
+    @dataclass
+    class Movie:
+        name: str
+        tags: List[str]
+
+    movie = Movie("The Matrix", ["sf"] * 100)
+    assert isinstancex(movie, Movie, budget=Budget(max_elements=200)) is True
+    with pytest.raises(BudgetExceeded, match="more than 10 elements"):
+        isinstancex(movie, Movie, budget=Budget(max_elements=10))
+    with pytest.raises(BudgetExceeded, match="deeper than 1 levels"):
+        isinstancex(movie, Movie, budget=Budget(max_depth=1))
+
+
+def test_fields_check_init(custom_handlers):
+    @fields_check(check_init=True)
+    @dataclass(frozen=True)
+    class Movie:
+        name: str
+        year: Optional[int] = None
+
+    movie = Movie("The Matrix", 1999)
+    assert isinstancex(movie, Movie) is True
+
+    with pytest.raises(TypeCheckError) as e:
+        Movie("The Matrix", "1999")
+    assert str(e.value) == "Field 'year' (value: '1999') is not a valid Optional[int]"
+
+    # instances validated when created are not checked again
+    object.__setattr__(movie, "year", "1999")
+    assert isinstancex(movie, Movie) is True
+
+    @fields_check(check_init=True)
+    class Point(NamedTuple):
+        x: int
+        y: int = 0
+
+    assert Point(1) == (1, 0)
+    with pytest.raises(TypeError, match=r"Field 'x' \(value: '1'\) is not a valid int"):
+        Point("1")
+    assert Point._make([1, 2]) == (1, 2)
+    with pytest.raises(TypeError, match=r"Field 'y' \(value: '2'\) is not a valid int"):
+        Point._make([1, "2"])
+    with pytest.raises(TypeError, match=r"Field 'y' \(value: '2'\) is not a valid int"):
+        Point(1)._replace(y="2")
+
+
+def test_fields_check_init_slots(custom_handlers):
+    @fields_check(check_init=True)
+    @dataclass(frozen=True)
+    class Movie:
+        __slots__ = ("name", "__weakref__")
+        name: str
+
+    @fields_check(check_init=True)
+    @dataclass(frozen=True)
+    class Point:
+        __slots__ = ("x",)
+        x: int
+
+    movie, point = Movie("The Matrix"), Point(1)
+    assert not hasattr(movie, "__dict__")
+    assert _is_validated(movie) is True
+    # cannot be referenced weakly so checked each time
+    assert _is_validated(point) is False
+    assert isinstancex(point, Point) is True
+    with pytest.raises(TypeCheckError):
+        Point("1")
+
+
+def test_fields_check_subclass(custom_handlers):
+    @fields_check
+    @dataclass
+    class Movie:
+        name: str
+
+    assert isinstancex(Movie(1), Movie) is False
+
+    class OldMovie(Movie):
+        pass
+
+    @dataclass
+    class RatedMovie(Movie):
+        rating: float = 0.0
+
+    assert isinstancex(OldMovie("Metropolis"), OldMovie) is True
+    assert isinstancex(OldMovie(1), OldMovie) is False
+    assert isinstancex(Movie("Metropolis"), OldMovie) is False
+    assert isinstancex(RatedMovie("The Matrix", 8.7), RatedMovie) is True
+    assert isinstancex(RatedMovie("The Matrix", "8.7"), RatedMovie) is False
+    assert isinstancex(RatedMovie("The Matrix", "8.7"), Movie) is True
+    assert isinstancex([RatedMovie(1)], List[Movie]) is False
+
+
+def test_fields_check_generic(custom_handlers):
+    @fields_check
+    @dataclass
+    class Box(Generic[T]):
+        item: T
+        history: List[T]
+        label: str = ""
+
+    assert isinstancex(Box(1, [2]), Box) is True
+    assert isinstancex(Box(1, [2], label=3), Box) is False
+    assert isinstancex(Box(1, [2]), Box[int]) is True
+    assert isinstancex(Box(1, ["2"]), Box[int]) is False
+    assert isinstancex(Box("1", []), Box[int]) is False
+    assert isinstancex([Box(1, []), Box("1", [])], List[Box[int]]) is False
+
+
+def test_fields_check_registered_after_subclass_check(custom_handlers):
+    @dataclass
+    class Movie:
+        name: str
+
+    @dataclass
+    class RatedMovie(Movie):
+        rating: float = 0.0
+
+    assert isinstancex(RatedMovie(1), RatedMovie) is True
+    fields_check(Movie)
+    assert isinstancex(RatedMovie(1), RatedMovie) is False
+
+
+def test_fields_check_invalid_class():
+    with pytest.raises(TypeError, match="expects a dataclass or a NamedTuple"):
+        fields_check(int)
@@ -0,0 +1,97 @@
+import pytest
+
+from typingx import (
+    Annotated,
+    Constraints,
+    List,
+    Literal,
+    Optional,
+    TypedDict,
+    Union,
+    validate_frame,
+)
+
+pd = pytest.importorskip("pandas")
+pa = pytest.importorskip("pyarrow")
+
+
+class Movie(TypedDict, total=False):
+    name: str
+    year: Annotated[int, Constraints(ge=1900, lt=2100)]
+    rating: Optional[float]
+    tags: List[str]
+
+
+class RequiredMovie(TypedDict):
+    name: Annotated[str, Constraints(min_length=2, regex="^[A-Z]")]
+    year: int
+
+
+MOVIES = {
+    "name": ["The Matrix", "Alien"],
+    "year": [1999, 1979],
+    "rating": [8.7, None],
+    "tags": [["sf"], []],
+}
+
+
+@pytest.fixture(params=["pandas", "pyarrow"])
+def to_frame(request):
+    if request.param == "pandas":
+        return pd.DataFrame
+    return pa.table
+
+
+@pytest.mark.parametrize(
+    "data,tp,expected",
+    [
+        (MOVIES, Movie, True),
+        ({"name": ["The Matrix"]}, Movie, True),
+        ({"name": ["The Matrix"], "year": [1999.5]}, Movie, False),
+        ({"name": ["The Matrix"], "year": [1899]}, Movie, False),
+        ({"name": ["The Matrix"], "year": [2100]}, Movie, False),
+        ({"name": ["The Matrix", None], "year": [1999, None]}, Movie, True),
+        ({"name": [1999]}, Movie, False),
+        ({"name": ["The Matrix"], "tags": [["sf", 1]]}, Movie, False),
+        ({"name": ["The Matrix"], "director": ["Wachowski"]}, Movie, False),
+        ({"name": ["The Matrix"], "year": [1999]}, RequiredMovie, True),
+        ({"name": ["The Matrix"]}, RequiredMovie, False),
+        ({"name": ["The Matrix", None], "year": [1999, 2000]}, RequiredMovie, False),
+        ({"name": ["the Matrix"], "year": [1999]}, RequiredMovie, False),
+        ({"name": ["T"], "year": [1999]}, RequiredMovie, False),
+        ({"name": ["The Matrix"], "year": [True]}, RequiredMovie, False),
+        ({"a": [1, 2], "b": ["x", "y"]}, {"a": int, ...: str}, True),
+        ({"a": [1, 2], "b": ["x", 2]}, {"a": int, ...: str}, False),
+    ],
+)
+def test_validate_frame(to_frame, data, tp, expected):
+    """It should check all the rows of a frame column by column"""
+    try:
+        frame = to_frame(data)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pytest.skip("mixed column not supported by pyarrow")
+    assert validate_frame(frame, tp) is expected
+
+
+def test_validate_frame_multiple_of(to_frame):
+    class Row(TypedDict):
+        a: Annotated[int, Constraints(multiple_of=3)]
+
+    assert validate_frame(to_frame({"a": [3, 6, 9]}), Row) is True
+    assert validate_frame(to_frame({"a": [3, 6, 10]}), Row) is False
+
+
+def test_validate_frame_null_column(to_frame):
+    class Row(TypedDict):
+        a: int
+        b: Union[None, Literal[None]]
+
+    assert validate_frame(to_frame({"a": [1, 2], "b": [None, None]}), Row) is True
+    assert validate_frame(to_frame({"a": [1, 2], "b": [None, 3]}), Row) is False
+
+
+def test_validate_frame_invalid_args():
+    with pytest.raises(TypeError, match="expects a TypedDict"):
+        validate_frame(pd.DataFrame(), int)
+    with pytest.raises(TypeError, match="expects a pandas DataFrame or a pyarrow Table"):
+        validate_frame([{"a": 1}], {"a": int})
@@ -1,8 +1,22 @@
+import pickle
+import random
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Generator, Iterable, Iterator, Tuple
 
 import pytest
 
-from typingx import Annotated, Constraints, func_check
+from typingx import (
+    Annotated,
+    Any,
+    CheckPolicy,
+    Constraints,
+    func_check,
+    func_check_class,
+    get_check_stats,
+    set_check_policy,
+)
+from typingx.func_check import POLICY_ENV_VAR, _get_env_policy
 
 
 def test_args():
@@ -42,3 +56,325 @@ def test_annotated():
     with pytest.raises(TypeError) as e:
         my_func(5, 6)
     assert str(e.value) == "Output (value: 11) is not a valid Annotated[int, Constraints(le=10)]"
+
+
+@pytest.fixture
+def global_policy():
+    yield
+    set_check_policy(CheckPolicy.full())
+
+
+def test_policy_off(global_policy):
+    @func_check(policy=CheckPolicy.off())
+    def my_func(a: int) -> int:
+        return a
+
+    assert my_func("x") == "x"
+    assert get_check_stats(my_func) == {"validated": 0, "skipped": 1}
+
+    set_check_policy(None, my_func)
+    with pytest.raises(TypeError):
+        my_func("x")
+
+    set_check_policy("off")
+    assert my_func("x") == "x"
+    assert get_check_stats(my_func) == {"validated": 1, "skipped": 2}
+
+
+def test_policy_first(global_policy):
+    @func_check(policy="first:2")
+    def my_func(a: int) -> int:
+        return a
+
+    assert my_func(1) == 1
+    with pytest.raises(TypeError):
+        my_func("x")
+    assert my_func("x") == "x"
+    assert my_func("x") == "x"
+    assert get_check_stats(my_func) == {"validated": 2, "skipped": 2}
+
+
+def test_policy_first_threads(global_policy):
+    """It should count the calls made by many threads at once"""
+
+    @func_check(policy="first:100")
+    def my_func(a: int) -> int:
+        return a
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(my_func, range(1000)))
+    assert get_check_stats(my_func) == {"validated": 100, "skipped": 900}
+
+
+def test_policy_sample(global_policy):
+    @func_check
+    def my_func(a: int) -> int:
+        return a
+
+    set_check_policy(CheckPolicy.sample(0.5), my_func)
+    random.seed(0)
+    for _ in range(1000):
+        my_func(1)
+    stats = get_check_stats(my_func)
+    assert stats["validated"] + stats["skipped"] == 1000
+    assert 400 < stats["validated"] < 600
+
+    set_check_policy(CheckPolicy.sample(0))
+    set_check_policy(None, my_func)
+    assert my_func("x") == "x"
+
+
+@pytest.mark.parametrize(
+    "s,policy",
+    [
+        ("full", CheckPolicy.full()),
+        (" OFF ", CheckPolicy.off()),
+        ("sample:0.01", CheckPolicy.sample(0.01)),
+        ("first:100", CheckPolicy.first(100)),
+    ],
+)
+def test_parse_policy(s, policy):
+    assert CheckPolicy.parse(s) == policy
+    assert eval(repr(policy)) == policy
+
+
+@pytest.mark.parametrize("s", ["", "full:1", "sample", "sample:2", "first:-1", "pika"])
+def test_parse_invalid_policy(s):
+    with pytest.raises(ValueError):
+        CheckPolicy.parse(s)
+
+
+@pytest.mark.parametrize(
+    "env,policy",
+    [(None, CheckPolicy.full()), ("sample:0.01", CheckPolicy.sample(0.01))],
+)
+def test_env_policy(monkeypatch, env, policy):
+    if env is None:
+        monkeypatch.delenv(POLICY_ENV_VAR, raising=False)
+    else:
+        monkeypatch.setenv(POLICY_ENV_VAR, env)
+    assert _get_env_policy() == policy
+
+
+def test_invalid_env_policy(monkeypatch):
+    monkeypatch.setenv(POLICY_ENV_VAR, "pika")
+    with pytest.warns(UserWarning, match="Invalid check policy 'pika' in TYPINGX_FUNC_CHECK"):
+        assert _get_env_policy() == CheckPolicy.full()
+
+
+def test_policy_errors():
+    with pytest.raises(TypeError):
+        set_check_policy(None)
+
+    with pytest.raises(TypeError):
+        get_check_stats(lambda: None)
+
+
+def test_generator_output():
+    @func_check
+    def gen(n: int) -> Generator[int, int, None]:
+        for i in range(n):
+            received = yield i
+            if received is not None:
+                yield str(received)
+
+    g = gen(3)
+    assert isinstance(g, Generator)
+    assert next(g) == 0
+    assert g.send(None) == 1
+    with pytest.raises(TypeError) as e:
+        g.send(7)
+    assert str(e.value) == "Output item 2 (value: '7') is not a valid int"
+
+    assert list(gen(3)) == [0, 1, 2]
+
+    g = gen(3)
+    next(g)
+    g.close()
+    assert list(g) == []
+
+
+def test_iterator_output_is_lazy():
+    consumed = []
+
+    @func_check
+    def rows(n: int) -> Iterator[int]:
+        for i in range(n):
+            consumed.append(i)
+            yield i if i < 2 else "x"
+
+    it = rows(1_000_000)
+    assert consumed == []
+    assert next(it) == 0
+    assert next(it) == 1
+    assert consumed == [0, 1]
+    with pytest.raises(TypeError) as e:
+        next(it)
+    assert str(e.value) == "Output item 2 (value: 'x') is not a valid int"
+
+
+def test_iterable_output():
+    @func_check
+    def f(x: Any) -> Iterable[int]:
+        return x
+
+    assert f([1, 2]) == [1, 2]
+    assert list(f(iter([1, 2]))) == [1, 2]
+    with pytest.raises(TypeError) as e:
+        f([1, "2"])
+    assert str(e.value) == "Output item 1 (value: '2') is not a valid int"
+    with pytest.raises(TypeError) as e:
+        f(1)
+    assert str(e.value) == "Output (value: 1) is not a valid Iterable[int]"
+
+
+def test_iterable_input():
+    @func_check
+    def total(a: int, values: Iterable[int], *, b: Iterator[int] = iter(())) -> int:
+        return a + sum(values) + sum(b)
+
+    assert total(1, [2, 3]) == 6
+    assert total(1, (i for i in range(3)), b=iter([4])) == 8
+    assert total(1, values=iter([2])) == 3
+
+    with pytest.raises(TypeError) as e:
+        total(1, [2, "3"])
+    assert str(e.value) == "Input values item 1 (value: '3') is not a valid int"
+
+    with pytest.raises(TypeError) as e:
+        total(1, iter([2, "3"]))
+    assert str(e.value) == "Input values item 1 (value: '3') is not a valid int"
+
+    with pytest.raises(TypeError) as e:
+        total(1, [2], b=iter(["4"]))
+    assert str(e.value) == "Input b item 0 (value: '4') is not a valid int"
+
+
+def test_var_args():
+    @func_check
+    def f(a: int, *args: str, b: int = 0, **kwargs: float) -> int:
+        return a + b
+
+    assert f(1, "a", "b", b=2, c=1.5) == 3
+    assert f.__name__ == "f"
+    assert f.__wrapped__.__name__ == "f"
+
+    with pytest.raises(TypeError) as e:
+        f(1, "a", 2)
+    assert str(e.value) == "Input args (value: 2) is not a valid str"
+
+    with pytest.raises(TypeError) as e:
+        f(1, b=2, c="1.5")
+    assert str(e.value) == "Input c (value: '1.5') is not a valid float"
+
+    with pytest.raises(TypeError) as e:
+        f(1, b="2")
+    assert str(e.value) == "Input b (value: '2') is not a valid int"
+
+
+def test_missing_arg():
+    @func_check
+    def f(a: int, b: int) -> int:
+        return a + b
+
+    with pytest.raises(TypeError) as e:
+        f(1)
+    assert "missing 1 required positional argument: 'b'" in str(e.value)
+
+
+@func_check_class
+class Repository:
+    """Stores users"""
+
+    def __init__(self, name):
+        self.name = name
+        self.users = []
+        self._size = 0
+
+    def add(self, user: str) -> "Repository":
+        self.users.append(user)
+        return self
+
+    def _private(self, user: str) -> str:
+        return user
+
+    @classmethod
+    def create(cls, name: str) -> "Repository":
+        return cls(name)
+
+    @staticmethod
+    def normalize(user: str) -> str:
+        return user.lower()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @size.setter
+    def size(self, value: int) -> None:
+        self._size = value
+
+
+@func_check
+def double(x: int) -> int:
+    return x * 2
+
+
+def test_func_check_pickle():
+    """It should pickle the decorated functions by reference, like the functions themselves"""
+    for func in (double, Repository.add, Repository.normalize):
+        assert pickle.loads(pickle.dumps(func)) is func
+
+    with ProcessPoolExecutor(1) as pool:
+        assert list(pool.map(double, [1, 2])) == [2, 4]
+    with pytest.raises(TypeError, match="Input x"):
+        pickle.loads(pickle.dumps(double))("1")
+
+
+def test_func_check_class():
+    repo = Repository.create("users")
+    assert repo.add("pika") is repo
+    assert Repository.normalize("PIKA") == repo.normalize("PIKA") == "pika"
+    repo.size = 3
+    assert repo.size == 3
+    assert repo._private(1) == 1
+    assert Repository.add.__name__ == "add"
+    assert Repository.__doc__ == "Stores users"
+
+    for call, error in (
+        (lambda: repo.add(1), "Input user (value: 1) is not a valid str"),
+        (lambda: Repository.create(1), "Input name (value: 1) is not a valid str"),
+        (lambda: Repository.normalize(1), "Input user (value: 1) is not a valid str"),
+        (lambda: setattr(repo, "size", "3"), "Input value (value: '3') is not a valid int"),
+    ):
+        with pytest.raises(TypeError) as e:
+            call()
+        assert str(e.value) == error
+
+    assert get_check_stats(repo.add)["validated"] == 2
+    assert get_check_stats(Repository.create) == {"validated": 2, "skipped": 0}
+
+
+def test_func_check_class_policy(global_policy):
+    @func_check_class(policy="off")
+    class Service:
+        def run(self, x: int) -> "Later":
+            return x
+
+    class Later:
+        ...
+
+    assert Service().run("x") == "x"
+    assert get_check_stats(Service().run) == {"validated": 0, "skipped": 1}
+
+
+def test_func_check_cache():
+    from typingx.main import _VERIFIED_OBJECTS
+
+    @func_check(cache=True)
+    def my_func(hosts: Tuple[str, ...]) -> int:
+        return len(hosts)
+
+    hosts = ("a", "b")
+    assert my_func(hosts) == 2
+    assert _VERIFIED_OBJECTS[(id(hosts), Tuple[str, ...], None)] == (hosts, True)
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from typingx import Any, Dict, List, Listx, Mapping, Sequence, TypedDict, Union, loads
+
+
+class Movie(TypedDict):
+    name: str
+    year: int
+
+
+@pytest.mark.parametrize(
+    "s,tp",
+    [
+        ("[]", List[int]),
+        (" [ 1 , 2,3 ] ", List[int]),
+        (b"[1, 2, 3]", List[int]),
+        ('[1, "2", null]', Sequence[Union[int, str, None]]),
+        ("[[1], [2, 3]]", List[List[int]]),
+        ("[1, 2]", Listx[int, ...]),
+        ("[1, 2]", List),
+        ('{"a": 1, "b": 2}', Dict[str, int]),
+        ("{ }", Mapping[str, int]),
+        ('{"name": "The Matrix", "year": 1999}', Movie),
+        ('[{"name": "The Matrix", "year": 1999}]', List[Movie]),
+        ('{"a": 1, "b": "x"}', {"a": int, ...: str}),
+        ("3", int),
+        ('"pika"', Any),
+    ],
+)
+def test_loads(s, tp):
+    assert loads(s, tp) == json.loads(s)
+
+
+@pytest.mark.parametrize(
+    "s,tp,error",
+    [
+        ('[1, "2", 3]', List[int], "Item 1 (value: '2') is not a valid int"),
+        (
+            '[{"a": 1}, {"a": "1"}]',
+            List[Dict[str, int]],
+            "Item 1 (value: {'a': '1'}) is not a valid Dict[str, int]",
+        ),
+        ('{"a": 1, "b": "2"}', Dict[str, int], "Value of key 'b' (value: '2') is not a valid int"),
+        ('{"name": 1, "year": 1999}', Movie, "Field 'name' (value: 1) is not a valid str"),
+        ('{"name": "Alien", "foo": 1}', Movie, "Field 'foo' is not allowed in a valid Movie"),
+        ('{"name": "Alien"}', Movie, "Missing keys ['year'] for a valid Movie"),
+        ("[1, 2]", Listx[int], "Value (value: [1, 2]) is not a valid Listx[int]"),
+        ("[1, 2]", Dict[str, int], "Value (value: [1, 2]) is not a valid Dict[str, int]"),
+    ],
+)
+def test_loads_invalid(s, tp, error):
+    with pytest.raises(TypeError) as e:
+        loads(s, tp)
+    assert str(e.value) == error
+
+
+def test_loads_rejects_early():
+    """It should not decode the items after the first invalid one"""
+    with pytest.raises(TypeError):
+        loads('["a", this is not even JSON', List[int])
+
+
+@pytest.mark.parametrize(
+    "s,tp",
+    [
+        ("", List[int]),
+        ("[1, 2", List[int]),
+        ("[1 2]", List[int]),
+        ("[1, 2,]", List[int]),
+        ("[1, 2] 3", List[int]),
+        ('{"a" 1}', Dict[str, int]),
+        ('{"a": 1,}', Dict[str, int]),
+        ("{a: 1}", Dict[str, int]),
+        ('{"a": 1} x', Dict[str, int]),
+        ("3 3", int),
+    ],
+)
+def test_loads_invalid_json(s, tp):
+    with pytest.raises(json.JSONDecodeError):
+        loads(s, tp)
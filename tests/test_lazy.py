@@ -0,0 +1,121 @@
+from collections.abc import Mapping
+
+import pytest
+
+from typingx import (
+    Annotated,
+    Any,
+    Constraints,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeCheckError,
+    TypedDict,
+    isinstancex,
+    lazy,
+)
+from typingx.lazy import _get_lazy_plan
+
+
+class Movie(TypedDict):
+    name: str
+    year: Annotated[int, Constraints(ge=1900)]
+    tags: List[str]
+
+
+DOCUMENT = {
+    "movies": [
+        {"name": "The Matrix", "year": 1999, "tags": ["sf"]},
+        {"name": "Metropolis", "year": "1927", "tags": ["sf", 3]},
+    ],
+    "count": 2,
+}
+Document = TypedDict("Document", {"movies": List[Movie], "count": int})
+
+
+def test_lazy():
+    """It should only check the values that are accessed"""
+    document = lazy(DOCUMENT, Document)
+    assert isinstance(document, Mapping)
+    assert document["count"] == 2
+    assert len(document) == 2 and list(document) == ["movies", "count"]
+
+    movies = document["movies"]
+    assert isinstance(movies, Sequence) and len(movies) == 2
+    assert movies[0]["name"] == "The Matrix"
+    assert movies[-1]["name"] == "Metropolis"
+    assert movies[0]["tags"][:] == ["sf"]
+    assert movies[1]["tags"][0] == "sf"
+
+    with pytest.raises(TypeCheckError) as exc_info:
+        movies[1]["year"]
+    assert str(exc_info.value) == (
+        "Value['movies'][1]['year'] (value: '1927') is not a valid "
+        "Annotated[int, Constraints(ge=1900)]"
+    )
+    with pytest.raises(TypeCheckError, match=r"Value\['movies'\]\[1\]\['tags'\]\[1\]"):
+        movies[1]["tags"][1]
+    with pytest.raises(IndexError):
+        movies[2]
+    with pytest.raises(KeyError):
+        document["title"]
+
+
+def test_lazy_cached():
+    """It should check each value only once"""
+    obj = {"a": [1, 2]}
+    document = lazy(obj, Dict[str, List[int]])
+    items = document["a"]
+    assert document["a"] is items
+    assert items[1] == 2
+
+    # the verdicts are kept even if the object is mutated
+    obj["a"][1] = "2"
+    assert items[1] == 2
+    assert items[-2] == 1
+
+
+def test_lazy_container():
+    """It should check the container itself right away"""
+    with pytest.raises(TypeCheckError, match="is not a valid Movie"):
+        lazy({"name": "The Matrix", "year": 1999}, Movie)
+    with pytest.raises(TypeCheckError, match="is not a valid Movie"):
+        lazy({"name": "The Matrix", "year": 1999, "tags": [], "rating": 5}, Movie)
+    with pytest.raises(TypeCheckError):
+        lazy("abc", List[str])
+    with pytest.raises(TypeCheckError):
+        lazy([1, 2, 3], Annotated[List[int], Constraints(max_length=2)])
+
+    with pytest.raises(TypeCheckError, match="Key of Value"):
+        list(lazy({1: "a"}, Dict[str, str]))
+
+
+def test_lazy_str_sequence():
+    """It should accept strings as sequences, like `isinstancex`"""
+    assert isinstancex("abc", Sequence[str])
+    assert list(lazy("abc", Sequence[str])) == ["a", "b", "c"]
+    with pytest.raises(TypeCheckError, match=r"Value\[0\]"):
+        lazy("abc", Sequence[int])[0]
+
+
+@pytest.mark.parametrize(
+    "obj,tp,expected",
+    [
+        (None, Optional[List[int]], None),
+        ((1, "a"), Tuple[int, str], (1, "a")),
+        (3, int, 3),
+    ],
+)
+def test_lazy_not_container(obj, tp, expected):
+    """It should check right away the values that cannot be checked lazily"""
+    assert lazy(obj, tp) == expected
+
+
+def test_lazy_plan():
+    assert _get_lazy_plan(List[int]).values_type is int
+    assert _get_lazy_plan(Tuple[int, ...]).container is tuple
+    assert _get_lazy_plan(Dict[str, Any]).keys_type is str
+    assert _get_lazy_plan(Tuple[int, str]) is None
+    assert _get_lazy_plan(int) is None
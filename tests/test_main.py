@@ -1,15 +1,34 @@
+import gc
 import sys
-from collections import ChainMap, Counter
+import typing
+from collections import ChainMap, Counter, OrderedDict, defaultdict, deque
+from types import MappingProxyType
+from typing import (
+    AbstractSet,
+    ClassVar,
+    DefaultDict,
+    Deque,
+    Generator,
+    Iterable,
+    Iterator,
+    MutableMapping,
+    MutableSequence,
+    MutableSet,
+)
 
 import pytest
 
 from typingx import (
     Annotated,
     Any,
+    Budget,
+    BudgetExceeded,
     Callable,
     Collection,
     Constraints,
     Dict,
+    FrozenSet,
+    Generic,
     List,
     Listx,
     Literal,
@@ -23,10 +42,24 @@ from typingx import (
     Tuplex,
     Type,
     TypedDict,
+    TypeVar,
     Union,
+    get_args,
     isinstancex,
+    isinstancex_many,
     issubclassx,
+    register_handler,
+    validate_update,
+)
+from typingx.main import (
+    _CLASS_HANDLERS,
+    _DYNAMIC_CLASS_HANDLERS,
+    _ORIGIN_HANDLERS,
+    _TYPE_HANDLERS,
+    _check_instance,
+    _check_typeddict,
 )
+from typingx.typing_compat import _ARGS_CACHE, _ORIGIN_CACHE
 
 try:
     import typing_extensions
@@ -34,6 +67,10 @@ except ImportError:  # pragma: no cover
     typing_extensions = None
 
 
+T = TypeVar("T")
+U = TypeVar("U")
+
+
 class Pokemon:
     ...
 
@@ -283,6 +320,46 @@ def test_isinstancex_typeddict(obj, tp, expected):
     assert isinstancex(obj, tp) is expected
 
 
+class PartialStrExtra(TypedDict, total=False):
+    a: int
+    __extra__: str
+
+
+class ConstrainedMovie(TypedDict):
+    name: Annotated[str, Constraints(min_length=1)]
+    year: Optional[int]
+
+
+@pytest.mark.parametrize(
+    "obj,tp,expected",
+    [
+        ([], List[FullMovie], True),
+        ([{"name": "The Matrix", "year": 1999}] * 3, List[FullMovie], True),
+        ([{"name": "The Matrix", "year": 1999}, {"name": "Alien"}], List[FullMovie], False),
+        ([{"name": "The Matrix", "year": 1999}, {"name": 1, "year": 1}], List[FullMovie], False),
+        ([{"name": "The Matrix", "year": 1999}, ("name", "year")], List[FullMovie], False),
+        ([MappingProxyType({"name": "The Matrix", "year": 1999})], List[FullMovie], True),
+        ([{"name": "The Matrix", "year": 1999, "extra": "qwe"}], List[FullMovie], False),
+        ([{"name": "The Matrix"}, {"year": 1999}, {}], List[PartialMovie], True),
+        ([{"name": "The Matrix"}, {"year": "1999"}], List[PartialMovie], False),
+        ([{"a": 1, "b": 0.1, "c": "pika"}, {"a": 2, "b": 0.2}], List[StrExtra], True),
+        ([{"a": 1, "b": 0.1, "c": "pika"}, {"a": 2, "b": 0.2, "c": 3}], List[StrExtra], False),
+        ([{"a": 1}, {"c": "pika"}], List[PartialStrExtra], True),
+        ([{"a": "1"}, {"c": "pika"}], List[PartialStrExtra], False),
+        ([{"name": "Alien", "year": None}], List[ConstrainedMovie], True),
+        ([{"name": "Alien", "year": None}, {"name": "", "year": 1}], List[ConstrainedMovie], False),
+        # shortcut
+        ([{"a": 1, "b": "pika"}, {"a": 2}], List[{"a": int, ...: str}], True),
+        ([{"a": 1, "b": "pika"}, {"a": 2, "c": 3}], List[{"a": int, ...: str}], False),
+        ([{"a": 1}, {"a": 2}], [{"a": int}, ...], True),
+        ([{"a": 1}, {"a": 2}], [{"a": int}], False),
+    ],
+)
+def test_isinstancex_typeddict_list(obj, tp, expected):
+    """It should support lists of `TypedDict` checked column by column"""
+    assert isinstancex(obj, tp) is expected
+
+
 @pytest.mark.parametrize(
     "obj,tp,expected",
     [
@@ -422,6 +499,79 @@ def test_isinstancex_mapping(obj, tp, expected):
     assert isinstancex(obj, tp) is expected
 
 
+@pytest.mark.parametrize(
+    "obj,tp,expected",
+    [
+        ({}, Mapping, True),
+        (defaultdict(list, {"a": [1]}), DefaultDict[str, List[int]], True),
+        (defaultdict(list, {"a": ["1"]}), DefaultDict[str, List[int]], False),
+        ({"a": [1]}, DefaultDict[str, List[int]], False),
+        (defaultdict(int), DefaultDict, True),
+        (OrderedDict(a=1), typing.OrderedDict[str, int], True),
+        (OrderedDict(a="1"), typing.OrderedDict[str, int], False),
+        ({"a": 1}, MutableMapping[str, int], True),
+        (ChainMap({"a": 1}), MutableMapping[str, int], True),
+        (MappingProxyType({"a": 1}), MutableMapping[str, int], False),
+        (Counter("pika"), typing.Counter[str], True),
+        (Counter([1, 2]), typing.Counter[str], False),
+        ({"a": 1}, typing.Counter[str], False),
+        (Counter(), typing.Counter, True),
+    ],
+)
+def test_isinstancex_other_mappings(obj, tp, expected):
+    """It should support mappings of the `collections` module"""
+    assert isinstancex(obj, tp) is expected
+
+
+@pytest.mark.parametrize(
+    "obj,tp,expected",
+    [
+        (frozenset({1, 2}), FrozenSet[int], True),
+        (frozenset({1, "2"}), FrozenSet[int], False),
+        ({1, 2}, FrozenSet[int], False),
+        (frozenset(), FrozenSet, True),
+        ({1, 2}, AbstractSet[int], True),
+        (frozenset({1, 2}), AbstractSet[int], True),
+        ({"a": 1}.keys(), AbstractSet[str], True),
+        ({"a": 1}.keys(), AbstractSet[int], False),
+        ([1, 2], AbstractSet[int], False),
+        ({1, 2}, MutableSet[int], True),
+        (frozenset({1, 2}), MutableSet[int], False),
+        (deque([1, 2]), Deque[int], True),
+        (deque([1, "2"]), Deque[int], False),
+        ([1, 2], Deque[int], False),
+        (deque(), Deque, True),
+        ([1, 2], MutableSequence[int], True),
+        ((1, 2), MutableSequence[int], False),
+        ([1, 2], Iterable[int], True),
+        ({"a": 1}, Iterable[str], True),
+        ({"a": 1}, Iterable[int], False),
+        (1, Iterable[int], False),
+        (iter(["a"]), Iterable[int], True),
+        (iter(["a"]), Iterator[str], True),
+        ([1, 2], Iterator[int], False),
+        ((i for i in range(3)), Generator[int, None, None], True),
+    ],
+)
+def test_isinstancex_other_collections(obj, tp, expected):
+    """It should support other collections without converting them"""
+    assert isinstancex(obj, tp) is expected
+
+
+def test_isinstancex_iterator_not_consumed():
+    it = iter([1, 2, 3])
+    assert isinstancex(it, Iterable[int]) is True
+    assert list(it) == [1, 2, 3]
+
+
+def test_isinstancex_collections_constraints():
+    assert isinstancex(deque([1, 2]), Annotated[Deque[int], Constraints(min_length=2)]) is True
+    assert isinstancex(deque([1]), Annotated[Deque[int], Constraints(min_length=2)]) is False
+    assert (
+        isinstancex(frozenset({1}), Annotated[FrozenSet[int], Constraints(min_length=2)]) is False
+    )
+
+
 def test_isinstancex_newtype():
     """It should support `NewType`"""
     UserId = NewType("UserId", int)
@@ -496,6 +646,159 @@ def test_isinstancex_constraints(obj, tp, expected):
     assert isinstancex(obj, tp) is expected
 
 
+@pytest.mark.parametrize(
+    "objs,tp,expected",
+    [
+        ([], int, []),
+        ([1, "2", 3], int, [True, False, True]),
+        (iter([[1, 2], [1, "2"]]), List[int], [True, False]),
+        ([[1, "a"], [1, 2], ["a"]], [int, str], [True, False, False]),
+        ([(1, "a", "b"), (1,)], (int, str, ...), [True, False]),
+        ([3, 1, "3"], Annotated[int, Constraints(ge=2)], [True, False, False]),
+        ([f, 1], Callable[[int], str], [True, False]),
+        ([1, "a"], Any, [True, True]),
+        ([None, 1], None, [True, False]),
+        ([1, None, "a"], Optional[int], [True, True, False]),
+        ([1, "a"], NewType("UserId", int), [True, False]),
+        # objects that make the check raise are invalid and the next ones are still checked
+        ([{"a": 1}, 3, {"a": "1"}, {"a": 2}], {"a": int}, [True, False, False, True]),
+        (["a", 1], Union[Annotated[int, Constraints(min_length=1)], str], [True, False]),
+    ],
+)
+def test_isinstancex_many(objs, tp, expected):
+    """It should check many objects against the same type at once"""
+    assert isinstancex_many(objs, tp) == expected
+
+
+def test_isinstancex_many_constraints():
+    assert isinstancex_many([1, 2, "2"], int, constraints=Constraints(ge=2)) == [
+        False,
+        True,
+        False,
+    ]
+
+
+def test_isinstancex_budget():
+    """It should stop the check when it exceeds its budget"""
+    obj = {"a": [1, 2, 3], "b": [4, 5, {"c": 6}]}
+    tp = Dict[str, List[Union[int, Dict[str, int]]]]
+
+    assert isinstancex(obj, tp, budget=Budget(max_elements=20, max_depth=3)) is True
+    assert isinstancex(obj, Dict[str, List[str]], budget=Budget(max_elements=1000)) is False
+
+    with pytest.raises(BudgetExceeded) as e:
+        isinstancex(obj, tp, budget=Budget(max_elements=5))
+    assert not isinstance(e.value, TypeError)
+    assert str(e.value) == (
+        "Check stopped: more than 5 elements "
+        "(Budget(timeout=None, max_elements=5, max_depth=None))"
+    )
+
+    with pytest.raises(BudgetExceeded, match="deeper than 2 levels"):
+        isinstancex(obj, tp, budget=Budget(max_depth=2))
+
+    with pytest.raises(BudgetExceeded, match="longer than 0s"):
+        isinstancex(list(range(1000)), List[int], budget=Budget(timeout=0))
+    # an iterator is not consumed so only the iterator itself is checked
+    assert isinstancex(iter(range(100)), Iterable[int], budget=Budget(max_elements=1)) is True
+
+
+def test_isinstancex_many_budget():
+    """It should share the budget between all the objects"""
+    assert isinstancex_many([[1], ["a"]], List[int], budget=Budget(max_elements=4)) == [
+        True,
+        False,
+    ]
+    with pytest.raises(BudgetExceeded):
+        isinstancex_many([[1], [2]], List[int], budget=Budget(max_elements=3))
+
+
+class Movie(TypedDict):
+    name: str
+    year: int
+
+
+@pytest.mark.parametrize(
+    "obj,tp,expected",
+    [
+        (list(range(1000)), List[int], True),
+        ([*range(999), "x"], List[int], False),
+        ({str(i): i for i in range(100)}, Dict[str, int], True),
+        ({str(i): str(i) for i in range(100)}, Dict[str, int], False),
+        ([{"name": "Matrix", "year": 1999}] * 100, List[Movie], True),
+        ([{"name": "Matrix", "year": 1999}] * 100 + [{}], List[Movie], False),
+        (list(range(100)), Annotated[List[OneDigitUInt], Constraints(max_length=200)], False),
+        (list(range(10)), [int, ...], True),
+        (1, int, True),
+        ([], List[int], True),
+    ],
+)
+def test_isinstancex_workers(obj, tp, expected):
+    """It should split the items of a container between threads"""
+    assert isinstancex(obj, tp, workers=4) is expected
+
+
+def test_isinstancex_many_workers():
+    objs = [[i] if i % 3 else [str(i)] for i in range(100)]
+    assert isinstancex_many(objs, List[int], workers=4) == isinstancex_many(objs, List[int])
+
+    with pytest.raises(ValueError):
+        isinstancex_many(objs, List[int], workers=2, budget=Budget(max_elements=10))
+    with pytest.raises(ValueError):
+        isinstancex(objs, List[int], workers=0)
+
+
+@pytest.mark.parametrize(
+    "obj,tp,expected",
+    [
+        ([[3, 4], ["q", "w"]], List[Union[List[int], List[str]]], True),
+        ([[3, 4, "q"], ["q", "w"]], List[Union[List[int], List[str]]], False),
+        ({"a": [1, 2], "b": (1, "x")}, Dict[str, Union[List[int], Tuple[int, str]]], True),
+        ({"a": [1, 2], "b": (1, "x", 2)}, Dict[str, Union[List[int], Tuple[int, str]]], False),
+        ((), Tuple[int, str], True),
+        ([1, "a", "b", 2.0], Listx[int, str, ..., float], True),
+        ([1], Listx[int], True),
+        ([1, 2], Listx[int], False),
+        ([{"name": "Matrix", "year": 1999}], List[Movie], True),
+        ([{"name": "Matrix", "year": "1999"}], List[Movie], False),
+        ({"a": {1, 2}}, {"a": FrozenSet[int]}, False),
+        (deque([{"a": 1}]), Deque[Mapping[str, int]], True),
+        (Counter("aab"), typing.Counter[str], True),
+        ([3, 3, 3], Annotated[List[Between2And5], Len3_5], True),
+        ({"a": 1, "bc": 2}, Dict[OneLowerStr, OneDigitUInt], False),
+        ([3, "a"], Collection[int], False),
+        (iter([1]), Collection[int], False),
+        (None, Optional[List[int]], True),
+    ],
+)
+def test_isinstancex_iterative(obj, tp, expected):
+    """It should give the same result with the iterative engine"""
+    assert isinstancex(obj, tp) is expected
+    assert isinstancex(obj, tp, iterative=True) is expected
+
+
+def test_isinstancex_iterative_deep():
+    """It should check deeply nested objects with the iterative engine"""
+    tp, obj = int, 1
+    for depth in range(400):
+        tp, obj = (List[tp], [obj]) if depth % 2 else (Dict[str, tp], {"a": obj})
+
+    assert isinstancex(obj, tp, iterative=True) is True
+    assert isinstancex([obj, obj], List[tp], iterative=True) is True
+    assert isinstancex([obj, [[]], [{"a": 1}]], List[tp], iterative=True) is False
+    assert isinstancex_many([obj, {"a": obj}], tp, iterative=True) == [True, False]
+
+    # union members are tried on the same stack
+    tp, obj = int, 1
+    for _ in range(300):
+        tp, obj = List[Optional[tp]], [obj, None]
+    assert isinstancex(obj, tp, iterative=True) is True
+    assert isinstancex([obj, None, [["1"]]], List[tp], iterative=True) is False
+    assert isinstancex(obj, Union[int, tp], budget=Budget(max_depth=600)) is True
+    with pytest.raises(BudgetExceeded):
+        isinstancex(obj, tp, budget=Budget(max_depth=299))
+
+
 @pytest.mark.parametrize(
     "obj,tp,expected",
     [
@@ -529,6 +832,336 @@ def test_issubclassx(obj, tp, expected):
     assert issubclassx(obj, tp) is expected
 
 
+class Temperature:
+    def __init__(self, celsius):
+        self.celsius = celsius
+
+
+class Box(Generic[T]):
+    def __init__(self, item):
+        self.item = item
+
+
+@pytest.fixture
+def custom_handlers():
+    yield
+    for registry in (_ORIGIN_HANDLERS, _TYPE_HANDLERS):
+        registry.pop(Temperature, None)
+        registry.pop(Box, None)
+
+
+def test_register_handler(custom_handlers):
+    """It should be possible to check custom types"""
+
+    def check_temperature(obj, tp, constraints):
+        return isinstance(obj, Temperature) and obj.celsius >= -273.15
+
+    def check_box(obj, tp, constraints):
+        (item_type,) = get_args(tp) or (Any,)
+        return isinstance(obj, Box) and isinstancex(obj.item, item_type, constraints=constraints)
+
+    assert isinstancex(Temperature(-300), Temperature) is True
+    # no annotation to know where `T` is used: only the class is checked
+    assert isinstancex(Box("1"), Box[int]) is True
+
+    register_handler(Temperature, check_temperature)
+    register_handler(Box, check_box)
+
+    assert isinstancex(Temperature(20), Temperature) is True
+    assert isinstancex(Temperature(-300), Temperature) is False
+    assert isinstancex([Temperature(20), Temperature(-300)], List[Temperature]) is False
+    assert isinstancex(Box(1), Box[int]) is True
+    assert isinstancex(Box("1"), Box[int]) is False
+    assert isinstancex(Box("1"), Box) is True
+    assert isinstancex(Box(1), Annotated[Box[int], Constraints(ge=2)]) is False
+
+
+def test_handler_of_class_is_cached(custom_handlers):
+    """It should only run the predicates once per class"""
+
+    class Point(TypedDict):
+        x: int
+
+    assert isinstancex(Temperature(20), Temperature) is True
+    assert isinstancex({"x": 1}, Point) is True
+    assert _CLASS_HANDLERS[Temperature] is _check_instance
+    assert _DYNAMIC_CLASS_HANDLERS[Point] is _check_typeddict
+    assert isinstancex(Temperature(20), Annotated[Temperature, Constraints(min_length=1)]) is False
+
+
+def test_handler_of_shorthand_is_not_kept():
+    """It should not keep the classes built from shorthands alive"""
+
+    def sizes():
+        # the caches of `get_args` and `get_origin` also keep the last classes (up to a bound)
+        _ARGS_CACHE.clear()
+        _ORIGIN_CACHE.clear()
+        gc.collect()
+        return len(_TYPE_HANDLERS), len(_CLASS_HANDLERS), len(_DYNAMIC_CLASS_HANDLERS)
+
+    before = sizes()
+    for _ in range(100):
+        assert isinstancex({"a": 1}, {"a": int}) is True
+        assert isinstancex([{"a": 1}], [{"a": int}]) is True
+    assert sizes() == before
+
+
+class AnnotatedBox(Generic[T]):
+    item: T
+    history: List[T]
+    label: ClassVar[str] = "box"
+
+    def __init__(self, item, history=()):
+        self.item = item
+        self.history = list(history)
+
+
+class Repository(Iterable[T]):
+    def __init__(self, *items):
+        self.items = items
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+class Pair(Generic[T, U]):
+    first: T
+    second: Optional[U]
+
+    def __init__(self, first, second):
+        self.first, self.second = first, second
+
+
+@pytest.mark.parametrize(
+    "obj,tp,expected",
+    [
+        (AnnotatedBox(1, [2]), AnnotatedBox[int], True),
+        (AnnotatedBox(1, [2]), AnnotatedBox, True),
+        (AnnotatedBox("1"), AnnotatedBox[int], False),
+        (AnnotatedBox(1, [2, "3"]), AnnotatedBox[int], False),
+        (AnnotatedBox(1, [2, "3"]), AnnotatedBox[Union[int, str]], True),
+        (AnnotatedBox(AnnotatedBox(1)), AnnotatedBox[AnnotatedBox[int]], True),
+        (AnnotatedBox(AnnotatedBox("1")), AnnotatedBox[AnnotatedBox[int]], False),
+        (1, AnnotatedBox[int], False),
+        (Repository(1, 2), Repository[int], True),
+        (Repository(1, "2"), Repository[int], False),
+        (Pair(1, None), Pair[int, str], True),
+        (Pair(1, 2), Pair[int, str], False),
+        ([Pair(1, "a"), Pair(2, None)], List[Pair[int, str]], True),
+        (AnnotatedBox(5), Annotated[AnnotatedBox[int], Constraints(ge=2)], False),
+    ],
+)
+def test_isinstancex_user_generic(obj, tp, expected):
+    """It should check the content of user generic classes based on their annotations"""
+    assert isinstancex(obj, tp) is expected
+
+
+class SupportsClose(typing.Protocol):
+    def close(self, force: bool) -> None:
+        ...
+
+
+class SupportsGet(typing.Protocol[T]):
+    name: str
+
+    def get(self, index: int) -> T:
+        ...
+
+
+class Resource:
+    def close(self, force: bool, timeout: float = 1.0) -> None:
+        ...
+
+
+class BadResource:
+    def close(self, force: str) -> None:
+        ...
+
+
+class UnannotatedResource:
+    def close(self, force):
+        ...
+
+
+class Store:
+    def __init__(self, name):
+        self.name = name
+
+    def get(self, index: int) -> int:
+        return index
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason="typing.Protocol needs python 3.8")
+@pytest.mark.parametrize(
+    "obj,tp,expected",
+    [
+        (Resource(), SupportsClose, True),
+        (BadResource(), SupportsClose, False),
+        (UnannotatedResource(), SupportsClose, True),
+        (Store("a"), SupportsClose, False),
+        ([Resource(), Resource()], List[SupportsClose], True),
+        (Store("a"), SupportsGet[int], True),
+        (Store("a"), SupportsGet[str], False),
+        (Store("a"), SupportsGet, True),
+        (Store(1), SupportsGet[int], False),
+        (3, typing.SupportsInt, True),
+        ("3", typing.SupportsInt, False),
+    ],
+)
+def test_isinstancex_protocol(obj, tp, expected):
+    """It should check protocols structurally, with the signatures of their methods"""
+    assert isinstancex(obj, tp) is expected
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason="typing.Protocol needs python 3.8")
+def test_isinstancex_protocol_cached():
+    """It should check the methods of a class only once per protocol"""
+    from typingx.main import _get_protocol_plan
+
+    class MyResource(Resource):
+        pass
+
+    assert isinstancex(MyResource(), SupportsClose) is True
+    assert _get_protocol_plan(SupportsClose)._verdicts[MyResource] is True
+    MyResource.close = None  # not checked again
+    assert isinstancex(MyResource(), SupportsClose) is True
+
+
+@pytest.mark.parametrize(
+    "obj,tp",
+    [
+        (range(100), Iterable[int]),
+        ([*range(100), "a"], Listx[int, ..., str]),
+        (AnnotatedBox(1, range(100)), AnnotatedBox[int]),
+        (Repository(*range(100)), Repository[int]),
+        pytest.param(
+            Store("a"),
+            SupportsGet[int],
+            marks=pytest.mark.skipif(sys.version_info < (3, 8), reason="needs python 3.8"),
+        ),
+    ],
+)
+def test_isinstancex_budget_without_expander(obj, tp):
+    """It should account the elements checked by handlers that do not push items on the stack"""
+    assert isinstancex(obj, tp, budget=Budget(max_elements=1000)) is isinstancex(obj, tp)
+    with pytest.raises(BudgetExceeded, match="more than 1 elements"):
+        isinstancex(obj, tp, budget=Budget(max_elements=1))
+    with pytest.raises(BudgetExceeded, match="deeper than 0 levels"):
+        isinstancex(obj, tp, budget=Budget(max_depth=0))
+
+
+def test_isinstancex_budget_custom_handler(custom_handlers):
+    """It should account the elements checked by custom handlers"""
+
+    def check_box(obj, tp, constraints):
+        (item_type,) = get_args(tp)
+        return isinstance(obj, Box) and isinstancex(obj.item, item_type)
+
+    register_handler(Box, check_box)
+    box = Box([Box([1, 2])])
+    assert isinstancex(box, Box[List[Box[List[int]]]], budget=Budget(max_depth=4)) is True
+    with pytest.raises(BudgetExceeded, match="deeper than 3 levels"):
+        isinstancex(box, Box[List[Box[List[int]]]], budget=Budget(max_depth=3))
+    with pytest.raises(BudgetExceeded, match="more than 5 elements"):
+        isinstancex(box, Box[List[Box[List[int]]]], budget=Budget(max_elements=5))
+
+
+@pytest.mark.skipif(not typing_extensions, reason="typing_extensions not installed")
+def test_validate_update():
+    """It should only check the patch of a valid TypedDict"""
+    from typing_extensions import NotRequired, Required
+
+    class Movie(TypedDict, total=False):
+        name: Required[str]
+        year: Annotated[int, Constraints(ge=1900)]
+        rating: NotRequired[float]
+
+    movie = {"name": "The Matrix", "year": 1999}
+    assert validate_update(movie, {"year": 2000, "rating": 8.7}, Movie) is True
+    assert validate_update(movie, {"year": 1800}, Movie) is False
+    assert validate_update(movie, {"rating": "8.7"}, Movie) is False
+    assert validate_update(movie, {"director": "Wachowski"}, Movie) is False
+    assert validate_update(movie, {}, Movie, deleted=["year"]) is True
+    assert validate_update(movie, {}, Movie, deleted=["name"]) is False
+    assert validate_update(movie, {"name": "Matrix"}, Movie, deleted=["name"]) is True
+
+    assert validate_update({"a": 1}, {"b": "x"}, {"a": int, ...: str}) is True
+    assert validate_update({"a": 1}, {"b": 2}, {"a": int, ...: str}) is False
+    assert validate_update({"a": 1}, {"a": 2}, int) is False
+
+
+def test_isinstancex_cache():
+    """It should cache the results of the checks of deeply immutable objects"""
+    from dataclasses import dataclass
+
+    from typingx.main import _VERIFIED_OBJECTS
+
+    @dataclass(frozen=True)
+    class Config:
+        hosts: Tuple[str, ...]
+
+    hosts = ("a", "b", "c")
+    config = Config(hosts)
+    for obj, tp, expected in [
+        (hosts, Tuple[str, ...], True),
+        (hosts, Tuple[int, ...], False),
+        (frozenset(hosts), FrozenSet[str], True),
+        (config, Config, True),
+    ]:
+        assert isinstancex(obj, tp, cache=True) is expected
+        assert _VERIFIED_OBJECTS[(id(obj), tp, None)] == (obj, expected)
+        # the cached result is used
+        _VERIFIED_OBJECTS[(id(obj), tp, None)] = (obj, not expected)
+        assert isinstancex(obj, tp, cache=True) is not expected
+        assert isinstancex(obj, tp) is expected
+
+    # mutable objects (or containing mutable objects) and scalars are not cached
+    for obj, tp in [(["a"], List[str]), ((["a"],), Tuple[List[str]]), ("a", str)]:
+        assert isinstancex(obj, tp, cache=True) is True
+        assert (id(obj), tp, None) not in _VERIFIED_OBJECTS
+
+
+Percent = Annotated[int, Constraints(ge=0, lt=100)]
+Code = Annotated[str, Constraints(min_length=2, max_length=3)]
+
+
+@pytest.mark.parametrize(
+    "obj,tp,expected",
+    [
+        ([0, 50, 99], List[Percent], True),
+        ([0, 50, 100], List[Percent], False),
+        ([-1, 50], List[Percent], False),
+        ((1, 2, 3), Tuple[Percent, ...], True),
+        ({5, 500}, Set[Percent], False),
+        (["fr", "eng"], List[Code], True),
+        (["fr", "e"], List[Code], False),
+        (["fr", "engl"], List[Code], False),
+        # items that are not all exact ints are checked one by one
+        ([True, 2], List[Percent], True),
+        ([1, "2"], List[Percent], False),
+        ([1, 2.0], List[Percent], False),
+        # `multiple_of` and `regex` are checked item by item
+        ([2, 4], List[Annotated[int, Constraints(ge=0, multiple_of=2)]], True),
+        ([2, 3], List[Annotated[int, Constraints(ge=0, multiple_of=2)]], False),
+        (["ab", "c"], List[Annotated[str, Constraints(max_length=2, regex="^[a-z]+$")]], True),
+        (["ab", "C"], List[Annotated[str, Constraints(max_length=2, regex="^[a-z]+$")]], False),
+    ],
+)
+def test_isinstancex_constrained_items(obj, tp, expected):
+    """It should check the constraints of all the items at once when possible"""
+    assert isinstancex(obj, tp) is expected
+
+
+def test_isinstancex_constrained_items_plan():
+    from typingx.main import _get_items_plan
+
+    assert _get_items_plan(Percent).constraints == Constraints(ge=0, lt=100)
+    assert _get_items_plan(Code).item_type is str
+    assert _get_items_plan(int) is None
+    assert _get_items_plan(Annotated[int, Constraints(multiple_of=2)]) is None
+    assert _get_items_plan(Annotated[int, Constraints(ge=0, max_length=2)]) is None
+
+
 def test_repr_constraints():
     assert repr(Constraints(ge=3, le=5)) == "Constraints(ge=3, le=5)"
 
@@ -0,0 +1,92 @@
+import sys
+
+import pytest
+
+from typingx import (
+    Annotated,
+    Any,
+    Callable,
+    Constraints,
+    Dict,
+    List,
+    Listx,
+    Literal,
+    NewType,
+    Optional,
+    Tuple,
+    Tuplex,
+    TypedDict,
+    Union,
+    func_check,
+    get_type_hints,
+    is_typeddict,
+    isinstancex,
+    normalize,
+)
+from typingx.main import _get_typeddict_plan
+
+UserId = NewType("UserId", int)
+AdminId = NewType("AdminId", UserId)
+Positive = Annotated[int, Constraints(gt=0)]
+
+
+@pytest.mark.parametrize(
+    "tp,expected",
+    [
+        (int, int),
+        (Union[int, Union[str, Optional[int]]], Union[int, str, None]),
+        (Union[int, UserId], int),
+        (Union[int, Any, str], Any),
+        (Optional[Union[Literal["a"], Literal["b", "a"]]], Optional[Literal["a", "b"]]),
+        (Union[Literal[1], Literal[True]], Literal[1, True]),
+        (AdminId, int),
+        (Annotated[int, "doc"], int),
+        (Annotated[UserId, Constraints(gt=0), "doc"], Positive),
+        (Annotated[Union[str, Any], Constraints(gt=0)], Any),
+        (List[Union[UserId, int]], List[int]),
+        (Dict[str, Tuple[AdminId, ...]], Dict[str, Tuple[int, ...]]),
+        ([UserId, ...], Listx[int, ...]),
+        ((UserId, str), Tuplex[int, str]),
+        # the args of `Callable` are not only types
+        (Callable[[UserId], int], Callable[[UserId], int]),
+    ],
+)
+def test_normalize(tp, expected):
+    assert normalize(tp) == expected
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="`X | Y` syntax requires python 3.10")
+def test_normalize_union_operator():
+    assert normalize(list[int | str | int]) == list[Union[int, str]]
+    assert normalize(int | None) == Optional[int]
+
+
+def test_normalize_shorthand():
+    tp = normalize({"id": UserId, ...: Optional[Union[str, str]]})
+    assert is_typeddict(tp)
+    assert get_type_hints(tp) == {"id": int, "__extra__": Optional[str]}
+
+
+def test_normalize_unchanged():
+    """It should keep the same type if there is nothing to normalize"""
+    tp = Dict[str, List[Positive]]
+    assert normalize(tp) is tp
+
+
+def test_normalized_plans():
+    """It should normalize the types when resolving the plans"""
+
+    class Movie(TypedDict):
+        id: Union[UserId, int]
+        tags: List[Annotated[str, "tag"]]
+
+    assert _get_typeddict_plan(Movie).field_types == {"id": int, "tags": List[str]}
+    assert isinstancex({"id": 1, "tags": ["a"]}, Movie) is True
+
+    @func_check
+    def f(x: Union[UserId, int, None]) -> Annotated[str, "doc"]:
+        return str(x)
+
+    plan = f.plan
+    assert plan.params[0][2] == Optional[int]
+    assert plan.return_type is str
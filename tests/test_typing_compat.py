@@ -31,6 +31,7 @@ from typingx import (
     is_literal,
     is_newtype,
     is_typeddict,
+    typing_compat,
 )
 from typingx.typing_compat import display_type
 
@@ -154,6 +155,22 @@ def test_get_origin(tp, expected_origin):
     assert get_origin(tp) == expected_origin
 
 
+def test_get_args_get_origin_cache(monkeypatch):
+    monkeypatch.setattr(typing_compat, "CACHE_MAX_SIZE", 3)
+    typing_compat._ARGS_CACHE.clear()
+    typing_compat._ORIGIN_CACHE.clear()
+
+    tps = [List[int], Dict[str, int], Union[int, str], Literal["a", Literal["b"]]]
+    for _ in range(3):
+        assert [get_args(tp) for tp in tps] == [(int,), (str, int), (int, str), ("a", "b")]
+        assert [get_origin(tp) for tp in tps] == [list, dict, Union, Literal]
+
+    assert len(typing_compat._ARGS_CACHE) <= 3
+    assert len(typing_compat._ORIGIN_CACHE) <= 3
+    # the cached types are kept so their id cannot be reused by other objects
+    assert all(typing_compat._ARGS_CACHE[id(tp)][0] is tp for tp in tps[-1:])
+
+
 def test_is_literal():
     assert is_literal(Literal["pika"]) is True
     assert is_literal(int) is False
@@ -174,3 +191,4 @@ def test_display_type():
     assert display_type(int) == "int"
     assert display_type(List[Dict[str, str]]) == "List[Dict[str, str]]"
     assert display_type(Annotated[int, 3]) == "Annotated[int, 3]"
+    assert display_type(FullMovie) == "FullMovie"
@@ -0,0 +1,113 @@
+import gc
+import sys
+import textwrap
+
+from typingx import Annotated, Constraints, Dict, List, Optional, TypedDict, warmup
+from typingx.main import (
+    _GENERIC_PLANS,
+    _ITEMS_PLANS,
+    _ORIGIN_HANDLERS,
+    _PROTOCOL_PLANS,
+    _TYPE_HANDLERS,
+    _TYPEDDICT_PLANS,
+)
+
+MODELS = """
+from dataclasses import dataclass
+from typing import Generic, List, Protocol, TypeVar
+
+from typingx import TypedDict, fields_check, func_check, func_check_class
+
+T = TypeVar("T")
+
+
+class Movie(TypedDict):
+    name: str
+    sequel: "Sequel"
+
+
+class Sequel(TypedDict):
+    name: str
+
+
+class SupportsClose(Protocol):
+    def close(self) -> None:
+        ...
+
+
+class Box(Generic[T]):
+    item: T
+
+
+@fields_check
+@dataclass
+class Point:
+    x: "Coordinate"
+
+
+Coordinate = int
+
+
+@func_check
+def rate(movie: Movie, rating: int) -> List[Movie]:
+    return [movie]
+
+
+@func_check_class
+class Catalog:
+    def add(self, movie: Movie) -> None:
+        pass
+
+    @classmethod
+    def create(cls, *boxes: Box[int]) -> "Catalog":
+        return cls()
+"""
+
+
+def test_warmup_modules(tmp_path, monkeypatch):
+    """It should resolve the plans of the types and functions defined in the modules"""
+    (tmp_path / "warmup_models.py").write_text(textwrap.dedent(MODELS))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import warmup_models as m
+
+    try:
+        warmup([m])
+
+        assert m.Movie in _TYPEDDICT_PLANS
+        assert m.Sequel in _TYPEDDICT_PLANS
+        assert m.SupportsClose in _PROTOCOL_PLANS
+        assert m.Box in _GENERIC_PLANS
+        assert m.rate._plan is not None
+        assert m.Catalog.add._plan is not None
+        assert m.Catalog.__dict__["create"].__func__._plan is not None
+        # `Coordinate` could not be resolved when decorating `Point`
+        assert _TYPE_HANDLERS[m.Point]._plan is not None
+    finally:
+        del sys.modules["warmup_models"]
+        _ORIGIN_HANDLERS.pop(m.Point)
+        _TYPE_HANDLERS.pop(m.Point)
+
+
+def test_warmup_types():
+    """It should resolve the plans of the types and of all the types they contain"""
+
+    class Review(TypedDict):
+        score: Annotated[int, Constraints(ge=0, le=5)]
+
+    class Movie(TypedDict):
+        reviews: List[Review]
+
+    Score = Annotated[int, Constraints(ge=0)]
+    warmup([Dict[str, Optional[Movie]], List[Score]])
+
+    assert Movie in _TYPEDDICT_PLANS
+    assert Review in _TYPEDDICT_PLANS
+    assert Score in _ITEMS_PLANS
+
+
+def test_warmup_freeze():
+    try:
+        warmup([], freeze=True)
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
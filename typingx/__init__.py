@@ -19,8 +19,23 @@ from typing import (
     Union,
 )
 
-from .func_check import func_check
-from .main import Constraints, isinstancex, issubclassx
+from .checked import CheckedDict, CheckedList, CheckedTypedDict
+from .errors import BudgetExceeded, TypeCheckError
+from .fields_check import fields_check
+from .frame import validate_frame
+from .func_check import CheckPolicy, func_check, func_check_class, get_check_stats, set_check_policy
+from .json_check import loads
+from .lazy import lazy
+from .main import (
+    Budget,
+    Constraints,
+    isinstancex,
+    isinstancex_many,
+    issubclassx,
+    register_handler,
+    validate_update,
+)
+from .normalize import normalize
 from .types import Listx, Tuplex
 from .typing_compat import (
     Annotated,
@@ -35,14 +50,42 @@ from .typing_compat import (
     is_newtype,
     is_typeddict,
 )
+from .warmup import warmup
 
 __all__ = (
     # main
+    "Budget",
     "Constraints",
     "isinstancex",
+    "isinstancex_many",
     "issubclassx",
+    "register_handler",
+    "validate_update",
+    # checked
+    "CheckedDict",
+    "CheckedList",
+    "CheckedTypedDict",
+    # errors
+    "BudgetExceeded",
+    "TypeCheckError",
+    # fields_check
+    "fields_check",
+    # frame
+    "validate_frame",
     # func_check
+    "CheckPolicy",
     "func_check",
+    "func_check_class",
+    "get_check_stats",
+    "set_check_policy",
+    # json_check
+    "loads",
+    # lazy
+    "lazy",
+    # normalize
+    "normalize",
+    # warmup
+    "warmup",
     # typing, typing_extensions or own backport
     "Annotated",
     "Any",
@@ -0,0 +1,297 @@
+"""
+Command line interface of typingx
+
+    $ python -m typingx validate my_module:Movie movies.jsonl --workers 4
+"""
+import argparse
+import importlib
+import json
+import mmap
+import os
+import re
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+from .main import _convert_shorthand, _get_typeddict_plan, _resolve_check, isinstancex
+from .typing_compat import TypedDict, TypeLike, display_type, is_typeddict
+
+# number of records sent at once to a worker
+CHUNK_SIZE = 1000
+# number of chunks sent to the workers and not processed yet, per worker
+PENDING_CHUNKS_PER_WORKER = 2
+# name used in the failures histogram when the whole record is invalid
+RECORD = "<record>"
+INVALID_JSON = "<invalid JSON>"
+
+# strings (skipped as a whole so their content is ignored) and structural characters of JSON
+JSON_TOKEN_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{},]')
+OPENING, CLOSING, COMMA = frozenset(b"[{"), frozenset(b"]}"), ord(",")
+# start of a JSON array, after an optional UTF-8 byte order mark
+ARRAY_START_RE = re.compile(rb"(?:\xef\xbb\xbf)?\s*\[")
+TRAILING_SPACE_RE = re.compile(rb"\s*\Z")
+
+# (offset of the record, raw JSON line or byte range of the item of a JSON array)
+Record = Tuple[int, Union[bytes, Tuple[int, int]]]
+# (offset of the record, fields that made it invalid)
+Failure = Tuple[int, List[str]]
+
+# type checked by the current process and how it is checked, resolved once per process
+_target_type: TypeLike = None
+_target_check: Optional[Callable[[Any], bool]] = None
+# content of the checked file, mapped in memory by each process to read the items of an array
+_source: Optional[mmap.mmap] = None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m typingx", description=__doc__.split("\n")[1])
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    validate_parser = subparsers.add_parser(
+        "validate", help="check all the records of a JSON lines or JSON array file"
+    )
+    validate_parser.add_argument("type", help="type of the records, like `my_module:Movie`")
+    validate_parser.add_argument("path", help="path of the JSON lines or JSON array file")
+    validate_parser.add_argument(
+        "--workers", type=int, default=1, help="number of processes (default: 1)"
+    )
+    validate_parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=20,
+        help="maximum number of invalid records listed in the report (default: 20)",
+    )
+
+    args = parser.parse_args(argv)
+    return validate(args.type, args.path, workers=args.workers, max_errors=args.max_errors)
+
+
+def validate(type_path: str, path: str, *, workers: int = 1, max_errors: int = 20) -> int:
+    """
+    Check all the records of a file against the type `type_path` (e.g. `my_module:Movie`),
+    print a report and return the exit code (1 if at least one record is invalid).
+    The file (encoded in UTF-8) is streamed: the parent process only splits it into raw records
+    (lines or byte ranges of the items of an array) that are decoded and checked by the workers
+    """
+    _init_worker(type_path, path)
+    tp, source = _target_type, _source
+
+    start = time.perf_counter()
+    try:
+        with open(path, "rb") as f:
+            nb_bytes = os.fstat(f.fileno()).st_size
+            # `re` scans the mapped file in place like `bytes`
+            if source is not None and ARRAY_START_RE.match(cast(bytes, source)):
+                records = _iter_array_items(source)
+            else:
+                records = _iter_lines(f)
+            nb_records, failures = _validate_records(records, type_path, path, workers)
+    finally:
+        if source is not None:
+            source.close()
+    duration = time.perf_counter() - start
+
+    _print_report(tp, nb_records, nb_bytes, duration, failures, max_errors)
+    return 1 if failures else 0
+
+
+def _validate_records(
+    records: Iterator[Record], type_path: str, path: str, workers: int
+) -> Tuple[int, List[Failure]]:
+    """Check the records in chunks, in the current process or in `workers` processes"""
+    chunks = _chunks(records)
+    if workers > 1:
+        with ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(type_path, path)
+        ) as pool:
+            return _collect(_map_bounded(pool, chunks, workers * PENDING_CHUNKS_PER_WORKER))
+    return _collect(map(_validate_chunk, chunks))
+
+
+def _collect(results: Iterable[Tuple[int, List[Failure]]]) -> Tuple[int, List[Failure]]:
+    nb_records = 0
+    failures: List[Failure] = []
+    for chunk_size, chunk_failures in results:
+        nb_records += chunk_size
+        failures += chunk_failures
+    return nb_records, failures
+
+
+def _map_bounded(
+    pool: Executor, chunks: Iterator[List[Record]], max_pending: int
+) -> Iterator[Tuple[int, List[Failure]]]:
+    """
+    Results of `_validate_chunk` for each chunk, in order, with at most `max_pending` chunks
+    sent to the workers at once (unlike `pool.map`, which consumes all the chunks first)
+    """
+    pending: Deque["Future[Tuple[int, List[Failure]]]"] = deque()
+    for chunk in chunks:
+        if len(pending) == max_pending:
+            yield pending.popleft().result()
+        pending.append(pool.submit(_validate_chunk, chunk))
+    while pending:
+        yield pending.popleft().result()
+
+
+def _print_report(
+    tp: TypeLike,
+    nb_records: int,
+    nb_bytes: int,
+    duration: float,
+    failures: List[Failure],
+    max_errors: int,
+) -> None:
+    duration = max(duration, 1e-9)
+    print(f"{nb_records} records checked against {display_type(tp)}: {len(failures)} invalid")
+    print(
+        f"{duration:.3f}s, {nb_records / duration:.0f} records/s, "
+        f"{nb_bytes / duration / 1e6:.2f} MB/s"
+    )
+
+    if not failures:
+        return
+
+    print("invalid records:")
+    for offset, fields in failures[:max_errors]:
+        print(f"  record {offset}: {', '.join(fields)}")
+    if len(failures) > max_errors:
+        print(f"  ... and {len(failures) - max_errors} more")
+
+    print("failures by field:")
+    histogram = Counter(field for _, fields in failures for field in fields)
+    for field, count in histogram.most_common():
+        print(f"  {field}: {count}")
+
+
+def _init_worker(type_path: str, path: str) -> None:
+    """Import the type to check and map the checked file in memory, once per process"""
+    global _target_type, _target_check, _source
+
+    module_name, _, qualname = type_path.partition(":")
+    if not qualname:
+        raise SystemExit(f"Invalid type {type_path!r}: expected `module:Type`")
+
+    tp: Any = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        tp = getattr(tp, name)
+    _target_type = _convert_shorthand(tp)
+    _target_check = _resolve_check(_target_type, None)
+
+    with open(path, "rb") as f:
+        # an empty file cannot be mapped (and has no record anyway)
+        is_empty = os.fstat(f.fileno()).st_size == 0
+        _source = None if is_empty else mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _iter_lines(f: IO[bytes]) -> Iterator[Record]:
+    """Raw JSON lines, with their line number as offset, read one by one"""
+    for line_number, line in enumerate(f, 1):
+        if not line.isspace():
+            yield line_number, line
+
+
+def _iter_array_items(source: mmap.mmap) -> Iterator[Record]:
+    """
+    Byte ranges of the items of the top-level array of a JSON document, with their index
+    as offset, found by scanning its strings and structural characters without decoding it
+    """
+    depth = 0
+    index = 0
+    item_start = 0
+    for match in JSON_TOKEN_RE.finditer(cast(bytes, source)):
+        position = match.start()
+        char = source[position]
+        if char in OPENING:
+            depth += 1
+            if depth == 1:
+                item_start = position + 1
+        elif char in CLOSING:
+            depth -= 1
+            if depth == 0:
+                # e.g. `[]`
+                if index or source[item_start:position].strip():
+                    yield index, (item_start, position)
+                    index += 1
+                # anything but whitespace after the array is reported as invalid, with the
+                # closing bracket so it cannot be decoded as a valid record
+                if not TRAILING_SPACE_RE.match(cast(bytes, source), position + 1):
+                    yield index, (position, len(source))
+                return
+        elif char == COMMA and depth == 1:
+            yield index, (item_start, position)
+            index += 1
+            item_start = position + 1
+
+    # unterminated array: its last item is reported as invalid
+    yield index, (item_start, len(source))
+
+
+def _chunks(records: Iterator[Record]) -> Iterator[List[Record]]:
+    chunk: List[Record] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _validate_chunk(chunk: List[Record]) -> Tuple[int, List[Failure]]:
+    check = cast(Callable[[Any], bool], _target_check)
+    failures: List[Failure] = []
+    for offset, raw in chunk:
+        if isinstance(raw, tuple):
+            start, end = raw
+            raw = cast(mmap.mmap, _source)[start:end]
+        try:
+            record = json.loads(raw)
+        except ValueError:  # invalid JSON or UTF-8
+            failures.append((offset, [INVALID_JSON]))
+            continue
+
+        try:
+            is_valid = check(record)
+        except (AttributeError, TypeError):  # like `isinstancex`
+            is_valid = False
+        if not is_valid:
+            failures.append((offset, _get_failed_fields(record, _target_type)))
+    return len(chunk), failures
+
+
+def _get_failed_fields(record: Any, tp: TypeLike) -> List[str]:
+    """Fields of an invalid record that make it invalid (missing, not allowed or invalid)"""
+    if not is_typeddict(tp) or not isinstance(record, dict):
+        return [RECORD]
+
+    plan = _get_typeddict_plan(cast(TypedDict, tp))
+    failed_fields = [f"{key} (missing)" for key in sorted(plan.required_keys - record.keys())]
+    for key, value in record.items():
+        if key in plan.field_types:
+            if not isinstancex(value, plan.field_types[key]):
+                failed_fields.append(key)
+        elif plan.rest_type is None:
+            failed_fields.append(f"{key} (not allowed)")
+        elif not isinstancex(value, plan.rest_type):
+            failed_fields.append(key)
+    return failed_fields or [RECORD]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,269 @@
+"""
+Containers that check their content once when they are created and then only check the items
+added by each mutation, instead of having to check the whole container again
+"""
+import copyreg
+import operator
+import typing as T
+
+from .errors import TypeCheckError
+from .main import _convert_shorthand, _get_typeddict_plan, isinstancex
+from .typing_compat import TypedDict, TypeLike, display_type, is_typeddict
+
+if T.TYPE_CHECKING:
+    from typing import SupportsIndex
+
+__all__ = (
+    "CheckedDict",
+    "CheckedList",
+    "CheckedTypedDict",
+)
+
+_MISSING = object()
+
+
+class CheckedMeta(type):
+    __args__: T.Tuple[TypeLike, ...]
+    __nb_args__: int
+    __parameterized__: T.Dict[T.Tuple[TypeLike, ...], "CheckedMeta"]
+
+    def __getitem__(self, params: T.Any) -> "CheckedMeta":
+        if not isinstance(params, tuple):
+            params = (params,)
+
+        if len(params) != self.__nb_args__:
+            raise TypeError(
+                f"{self.__name__} expects {self.__nb_args__} type(s) but got {len(params)}"
+            )
+
+        try:
+            return self.__parameterized__[params]
+        except KeyError:
+            pass
+        except TypeError:  # e.g. shortcut `{'a': int}` cannot be hashed
+            return self._parameterize(params)
+
+        # if another thread parameterized the class meanwhile, its class is kept
+        return self.__parameterized__.setdefault(params, self._parameterize(params))
+
+    def _parameterize(self, params: T.Tuple[TypeLike, ...]) -> "CheckedMeta":
+        args = tuple(_convert_shorthand(p) for p in params)
+        name = f"{self.__name__}[{', '.join(display_type(arg) for arg in args)}]"
+        namespace = {"__args__": args, "__parameterized__": {}, "__unparameterized__": self}
+        return type(self)(name, (self,), namespace)
+
+
+def _reduce_checked_class(cls: T.Any) -> T.Any:
+    # e.g. `CheckedList[int]` is not defined in a module so it is pickled as `CheckedList`
+    # parameterized again (with its instances, e.g. to be sent to other processes)
+    base = vars(cls).get("__unparameterized__")
+    if base is None:
+        return cls.__qualname__
+    return operator.getitem, (base, cls.__args__)
+
+
+copyreg.pickle(CheckedMeta, _reduce_checked_class)
+
+
+def _check(value: T.Any, tp: TypeLike, name: str, *name_args: T.Any) -> None:
+    # the name is only formatted with its args (e.g. a key) on failure
+    if not isinstancex(value, tp):
+        raise TypeCheckError(name.format(*name_args), value, tp)
+
+
+#######################################
+# CheckedList
+#######################################
+class CheckedList(list, metaclass=CheckedMeta):  # type: ignore[type-arg]
+    """
+    A `list` that only accepts items of a given type
+
+        >>> CheckedList[int]([1, 2]).append('3')
+        TypeError: Item (value: '3') is not a valid int
+    """
+
+    __args__ = (T.Any,)
+    __nb_args__ = 1
+    __parameterized__: T.Dict[T.Tuple[TypeLike, ...], CheckedMeta] = {}
+
+    def __init__(self, iterable: T.Iterable[T.Any] = ()) -> None:
+        super().__init__(self._checked(iterable))
+
+    def _check(self, item: T.Any) -> T.Any:
+        _check(item, self.__args__[0], "Item")
+        return item
+
+    def _checked(self, items: T.Iterable[T.Any]) -> T.List[T.Any]:
+        items = list(items)
+        for item in items:
+            self._check(item)
+        return items
+
+    def append(self, item: T.Any) -> None:
+        super().append(self._check(item))
+
+    def insert(self, index: "SupportsIndex", item: T.Any) -> None:
+        super().insert(index, self._check(item))
+
+    def extend(self, items: T.Iterable[T.Any]) -> None:
+        super().extend(self._checked(items))
+
+    def __iadd__(self, items: T.Iterable[T.Any]) -> "CheckedList":
+        return super().__iadd__(self._checked(items))
+
+    def __setitem__(self, index: T.Any, value: T.Any) -> None:
+        if isinstance(index, slice):
+            super().__setitem__(index, self._checked(value))
+        else:
+            super().__setitem__(index, self._check(value))
+
+
+#######################################
+# CheckedDict
+#######################################
+class CheckedDict(dict, metaclass=CheckedMeta):  # type: ignore[type-arg]
+    """
+    A `dict` that only accepts keys and values of given types
+
+        >>> CheckedDict[str, int](a=1)['b'] = '2'
+        TypeError: Value of key 'b' (value: '2') is not a valid int
+    """
+
+    __args__ = (T.Any, T.Any)
+    __nb_args__ = 2
+    __parameterized__: T.Dict[T.Tuple[TypeLike, ...], CheckedMeta] = {}
+
+    def __init__(self, *args: T.Any, **kwargs: T.Any) -> None:
+        super().__init__(self._checked(dict(*args, **kwargs)))
+
+    def _check(self, key: T.Any, value: T.Any) -> None:
+        keys_type, values_type = self.__args__
+        _check(key, keys_type, "Key")
+        _check(value, values_type, "Value of key {!r}", key)
+
+    def _checked(self, items: T.Dict[T.Any, T.Any]) -> T.Dict[T.Any, T.Any]:
+        for key, value in items.items():
+            self._check(key, value)
+        return items
+
+    def __setitem__(self, key: T.Any, value: T.Any) -> None:
+        self._check(key, value)
+        super().__setitem__(key, value)
+
+    def setdefault(self, key: T.Any, default: T.Any = None) -> T.Any:
+        if key not in self:
+            self._check(key, default)
+        return super().setdefault(key, default)
+
+    def update(self, *args: T.Any, **kwargs: T.Any) -> None:
+        super().update(self._checked(dict(*args, **kwargs)))
+
+    def __ior__(self, other: T.Any) -> "CheckedDict":  # type: ignore[misc]
+        self.update(other)
+        return self
+
+
+#######################################
+# CheckedTypedDict
+#######################################
+class CheckedTypedDictMeta(CheckedMeta):
+    def _parameterize(self, params: T.Tuple[TypeLike, ...]) -> CheckedMeta:
+        tp = _convert_shorthand(params[0])
+        if not is_typeddict(tp):
+            raise TypeError(f"{self.__name__} expects a TypedDict but got {display_type(tp)}")
+        return super()._parameterize(params)
+
+
+copyreg.pickle(CheckedTypedDictMeta, _reduce_checked_class)
+
+
+class CheckedTypedDict(dict, metaclass=CheckedTypedDictMeta):  # type: ignore[type-arg]
+    """
+    A `dict` that stays a valid `TypedDict`
+
+        >>> class Movie(TypedDict):
+        ...     name: str
+        ...     year: int
+        >>> movie = CheckedTypedDict[Movie](name='The Matrix', year=1999)
+        >>> del movie['year']
+        TypeError: Field 'year' is required in a valid Movie
+    """
+
+    __args__: T.Tuple[TypeLike, ...] = ()
+    __nb_args__ = 1
+    __parameterized__: T.Dict[T.Tuple[TypeLike, ...], CheckedMeta] = {}
+
+    def __init__(self, *args: T.Any, **kwargs: T.Any) -> None:
+        if not self.__args__:
+            raise TypeError("CheckedTypedDict needs a TypedDict e.g. `CheckedTypedDict[Movie]`")
+
+        items = dict(*args, **kwargs)
+        missing_keys = self._plan().required_keys - items.keys()
+        if missing_keys:
+            raise TypeError(f"Missing keys {sorted(missing_keys)} for a valid {self._type_name()}")
+        super().__init__(self._checked(items))
+
+    def _plan(self) -> T.Any:
+        return _get_typeddict_plan(T.cast(TypedDict, self.__args__[0]))
+
+    def _type_name(self) -> str:
+        return display_type(self.__args__[0])
+
+    def _check(self, key: T.Any, value: T.Any) -> None:
+        plan = self._plan()
+        if key in plan.field_types:
+            _check(value, plan.field_types[key], "Field {!r}", key)
+        elif plan.rest_type is not None:
+            _check(value, plan.rest_type, "Field {!r}", key)
+        else:
+            raise TypeError(f"Field {key!r} is not allowed in a valid {self._type_name()}")
+
+    def _check_removable(self, key: T.Any) -> None:
+        if key in self._plan().required_keys:
+            raise TypeError(f"Field {key!r} is required in a valid {self._type_name()}")
+
+    def _checked(self, items: T.Dict[T.Any, T.Any]) -> T.Dict[T.Any, T.Any]:
+        for key, value in items.items():
+            self._check(key, value)
+        return items
+
+    def __setitem__(self, key: T.Any, value: T.Any) -> None:
+        self._check(key, value)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: T.Any) -> None:
+        self._check_removable(key)
+        super().__delitem__(key)
+
+    def setdefault(self, key: T.Any, default: T.Any = None) -> T.Any:
+        if key not in self:
+            self._check(key, default)
+        return super().setdefault(key, default)
+
+    def update(self, *args: T.Any, **kwargs: T.Any) -> None:
+        super().update(self._checked(dict(*args, **kwargs)))
+
+    def __ior__(self, other: T.Any) -> "CheckedTypedDict":  # type: ignore[misc]
+        self.update(other)
+        return self
+
+    def pop(self, key: T.Any, default: T.Any = _MISSING) -> T.Any:
+        if key in self:
+            self._check_removable(key)
+        if default is _MISSING:
+            return super().pop(key)
+        return super().pop(key, default)
+
+    def popitem(self) -> T.Tuple[str, T.Any]:
+        key, value = super().popitem()
+        try:
+            self._check_removable(key)
+        except TypeError:
+            super().__setitem__(key, value)
+            raise
+        return key, value
+
+    def clear(self) -> None:
+        for key in self:
+            self._check_removable(key)
+        super().clear()
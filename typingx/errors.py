@@ -0,0 +1,58 @@
+import reprlib
+from typing import Any
+
+from .typing_compat import TypeLike, display_type
+
+__all__ = ("BudgetExceeded", "TypeCheckError")
+
+
+class ValueRepr(reprlib.Repr):
+    """`repr` of the values in error messages, truncated to avoid huge messages"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.maxstring = 80
+        self.maxother = 80
+        self.maxlist = self.maxtuple = self.maxset = self.maxfrozenset = self.maxdeque = 10
+        self.maxdict = 10
+
+
+class TypeCheckError(TypeError):
+    """
+    Raised when a value is not valid.
+    It keeps the value and the expected type, and the message is only built when the error
+    is converted to a string, with a truncated `repr` of the value.
+    The limits can be changed with `TypeCheckError.value_repr` (e.g. `.maxlist = 100`)
+    """
+
+    value_repr = ValueRepr()
+
+    def __init__(self, name: str, value: Any, tp: TypeLike) -> None:
+        super().__init__(name, value, tp)
+        self.name = name
+        self.value = value
+        self.tp = tp
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name} (value: {self.value_repr.repr(self.value)}) "
+            f"is not a valid {display_type(self.tp)}"
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({str(self)!r})"
+
+
+class BudgetExceeded(Exception):
+    """
+    Raised when a check exceeds its `Budget`.
+    It is not a `TypeError` since the checked value is neither valid nor invalid
+    """
+
+    def __init__(self, budget: Any, reason: str) -> None:
+        super().__init__(budget, reason)
+        self.budget = budget
+        self.reason = reason
+
+    def __str__(self) -> str:
+        return f"Check stopped: {self.reason} ({self.budget})"
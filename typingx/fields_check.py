@@ -0,0 +1,182 @@
+"""
+Check the fields of dataclasses and `NamedTuple`s against their annotations
+"""
+import dataclasses
+import weakref
+from functools import wraps
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+
+from .errors import TypeCheckError
+from .main import Constraints, _substitute_type_vars, isinstancex, register_handler
+from .typing_compat import TypeLike, get_args, get_origin, get_type_hints
+
+__all__ = ("fields_check",)
+
+C = TypeVar("C", bound=Type[Any])
+
+# ids of the instances of frozen dataclasses that have been checked when created, with a weak
+# reference to the instance so an id that is reused by another object is not trusted
+_VALIDATED_INSTANCES: "Dict[int, weakref.ref[Any]]" = {}
+
+
+class _FieldsPlan:
+    """Annotations of the fields of a class, resolved once"""
+
+    def __init__(self, cls: Type[Any], args: Tuple[Any, ...] = ()) -> None:
+        # the class can refer to itself even if it is not defined at module level
+        hints = get_type_hints(cls, localns={cls.__name__: cls}, include_extras=True)
+
+        if dataclasses.is_dataclass(cls):
+            names = [f.name for f in dataclasses.fields(cls)]
+        else:
+            names = list(cls._fields)
+
+        # e.g. `item: T` of a generic class is checked as `int` for `Box[int]` and ignored for `Box`
+        type_vars = dict(zip(getattr(cls, "__parameters__", ()), args))
+        field_types = [
+            (name, _substitute_type_vars(hints.get(name, Any), type_vars)) for name in names
+        ]
+
+        # (name, type) of the fields that need to be checked
+        self.fields: List[Tuple[str, TypeLike]] = [
+            (name, tp) for name, tp in field_types if tp is not Any
+        ]
+
+    def first_invalid_field(self, obj: Any) -> Optional[Tuple[str, Any, TypeLike]]:
+        for name, tp in self.fields:
+            value = getattr(obj, name)
+            if not isinstancex(value, tp):
+                return name, value, tp
+        return None
+
+
+class _FieldsChecker:
+    """Handler of a class decorated with `fields_check`"""
+
+    def __init__(self, cls: Type[Any]) -> None:
+        self.cls = cls
+        self._plan: Optional[_FieldsPlan] = None
+        # plans of the subclasses, which can have more fields, and of the parameterized classes
+        self._other_plans: Dict[TypeLike, _FieldsPlan] = {}
+
+    @property
+    def plan(self) -> _FieldsPlan:
+        # resolved on first use if the annotations could not be resolved when decorating
+        if self._plan is None:
+            self._plan = _FieldsPlan(self.cls)
+        return self._plan
+
+    def get_plan(self, tp: TypeLike) -> _FieldsPlan:
+        """Plan of the decorated class, of one of its subclasses or of `Box[int]` for `Box`"""
+        if tp is self.cls:
+            return self.plan
+        try:
+            return self._other_plans[tp]
+        except KeyError:
+            plan = _FieldsPlan(get_origin(tp) or tp, get_args(tp))
+            return self._other_plans.setdefault(tp, plan)
+
+    def __call__(self, obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
+        if not isinstance(obj, self.cls):
+            return False
+        if constraints is not None and not constraints.is_valid(obj):
+            return False
+        if _is_validated(obj):
+            return True
+        return self.get_plan(tp).first_invalid_field(obj) is None
+
+
+def fields_check(cls: Optional[C] = None, *, check_init: bool = False) -> Any:
+    """
+    Make `isinstancex` check the fields of a dataclass or a `NamedTuple` against their annotations
+    and not only the class of the object.
+    Annotations are resolved once, when decorating (or on first check for forward references).
+    The fields of the subclasses are checked too.
+    With `check_init=True`, the fields are also checked when an instance is created and
+    instances of frozen dataclasses are then not checked again by `isinstancex`
+    (the fields themselves, e.g. lists, are not watched)
+
+        >>> @fields_check
+        ... @dataclass
+        ... class Movie:
+        ...     name: str
+        ...     year: int
+        >>> isinstancex(Movie('The Matrix', '1999'), Movie)
+        False
+    """
+    if cls is None:
+        return lambda c: fields_check(c, check_init=check_init)
+
+    if not dataclasses.is_dataclass(cls) and not _is_namedtuple(cls):
+        raise TypeError(f"`fields_check` expects a dataclass or a NamedTuple but got {cls!r}")
+
+    checker = _FieldsChecker(cls)
+    try:
+        checker.plan
+    except NameError:
+        # reference to something not defined yet: it will be resolved on first check
+        pass
+
+    if check_init:
+        _check_init(cls, checker)
+
+    register_handler(cls, checker)
+    return cls
+
+
+def _is_namedtuple(cls: Any) -> bool:
+    return isinstance(cls, type) and issubclass(cls, tuple) and hasattr(cls, "_fields")
+
+
+def _is_validated(obj: Any) -> bool:
+    ref = _VALIDATED_INSTANCES.get(id(obj))
+    return ref is not None and ref() is obj
+
+
+def _mark_validated(obj: Any) -> None:
+    key = id(obj)
+    try:
+        _VALIDATED_INSTANCES[key] = weakref.ref(obj, lambda _: _VALIDATED_INSTANCES.pop(key, None))
+    except TypeError:  # e.g. dataclass with `__slots__` but no `__weakref__`: checked each time
+        pass
+
+
+def _check_init(cls: Type[Any], checker: _FieldsChecker) -> None:
+    mark_validated = dataclasses.is_dataclass(cls) and cls.__dataclass_params__.frozen
+
+    def check(obj: Any) -> None:
+        invalid_field = checker.get_plan(type(obj)).first_invalid_field(obj)
+        if invalid_field is not None:
+            name, value, tp = invalid_field
+            raise TypeCheckError(f"Field {name!r}", value, tp)
+        if mark_validated:
+            _mark_validated(obj)
+
+    if _is_namedtuple(cls):
+        original_new = cls.__new__
+        # `_make` (also used by `_replace`) creates the instance without `__new__`
+        original_make = cls._make.__func__
+
+        @wraps(original_new)
+        def __new__(new_cls: Type[Any], *args: Any, **kwargs: Any) -> Any:
+            obj = original_new(new_cls, *args, **kwargs)
+            check(obj)
+            return obj
+
+        @wraps(original_make)
+        def _make(make_cls: Type[Any], iterable: Any) -> Any:
+            obj = original_make(make_cls, iterable)
+            check(obj)
+            return obj
+
+        setattr(cls, "__new__", staticmethod(__new__))
+        setattr(cls, "_make", classmethod(_make))
+    else:
+        original_init = cls.__init__
+
+        @wraps(original_init)
+        def __init__(self: Any, *args: Any, **kwargs: Any) -> None:
+            original_init(self, *args, **kwargs)
+            check(self)
+
+        cls.__init__ = __init__
@@ -0,0 +1,273 @@
+"""
+Check pandas `DataFrame`s and pyarrow `Table`s against a `TypedDict` column by column.
+
+Rows are never converted to dicts: the column names are compared with the keys of the `TypedDict`
+and the type of each column is checked with its dtype, with vectorized operations for the
+constraints. pandas and pyarrow are optional and only imported when one of their frames is checked
+"""
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Union, cast
+
+from .main import (
+    NONE_TYPES,
+    UNION_TYPES,
+    Constraints,
+    _convert_shorthand,
+    _get_typeddict_plan,
+    _has_bounds,
+    _has_string_constraints,
+    _is_valid_bounds,
+    _is_valid_lengths,
+    isinstancex,
+)
+from .typing_compat import (
+    Annotated,
+    NoneType,
+    TypedDict,
+    TypeLike,
+    get_args,
+    get_origin,
+    is_typeddict,
+)
+
+try:
+    import typing_extensions
+except ImportError:  # pragma: no cover
+    typing_extensions = None  # type: ignore[assignment]
+
+__all__ = ("validate_frame",)
+
+# kinds of values that can be checked with the dtype of a column
+KINDS = {bool: "boolean", int: "integer", float: "floating", str: "string"}
+
+
+@dataclass(frozen=True)
+class _ColumnPlan:
+    """How a column is checked, resolved once per field of a `TypedDict`"""
+
+    # type of the non null values, without its constraints
+    tp: TypeLike
+    constraints: Optional[Constraints]
+    # kind of `tp` if it can be checked with the dtype of the column (e.g. "integer" for `int`)
+    kind: Optional[str]
+    # whether null values are valid, which is the case for fields that are not required
+    # (a null value is then a missing key) or that can be `None`
+    nullable: bool
+
+
+@dataclass(frozen=True)
+class _FramePlan:
+    required_columns: List[str]
+    columns: Dict[str, _ColumnPlan]
+    # plan of the columns that are not declared (`__extra__`) or `None` if they are forbidden
+    rest: Optional[_ColumnPlan]
+
+
+_FRAME_PLANS: "weakref.WeakKeyDictionary[Any, _FramePlan]" = weakref.WeakKeyDictionary()
+_FRAME_PLANS_LOCK = threading.Lock()
+
+
+def validate_frame(frame: Any, tp: TypeLike) -> bool:
+    """
+    Check that all the rows of a pandas `DataFrame` or a pyarrow `Table` (or `RecordBatch`)
+    are valid `tp`, a `TypedDict`.
+    Null values (None, NaN, NaT, ...) are considered as missing keys
+
+        >>> class Row(TypedDict):
+        ...     name: str
+        ...     year: Annotated[int, Constraints(ge=1900)]
+        >>> validate_frame(pd.DataFrame({'name': ['Matrix'], 'year': [1999]}), Row)
+        True
+    """
+    tp = _convert_shorthand(tp)
+    if not is_typeddict(tp):
+        raise TypeError(f"`validate_frame` expects a TypedDict but got {tp!r}")
+
+    library = type(frame).__module__.partition(".")[0]
+    if library == "pandas":
+        column_names = list(frame.columns)
+        validate_column = _validate_pandas_column
+    elif library == "pyarrow":
+        column_names = list(frame.column_names)
+        validate_column = _validate_arrow_column
+    else:
+        raise TypeError("`validate_frame` expects a pandas DataFrame or a pyarrow Table")
+
+    plan = _get_frame_plan(cast(TypedDict, tp))
+
+    if not set(column_names) >= set(plan.required_columns):
+        return False
+
+    for name in column_names:
+        column_plan = plan.columns.get(name, plan.rest)
+        if column_plan is None:
+            return False
+        if not validate_column(frame[name], column_plan):
+            return False
+
+    return True
+
+
+def _get_frame_plan(tp: TypedDict) -> _FramePlan:
+    try:
+        return _FRAME_PLANS[tp]
+    except KeyError:
+        pass
+
+    typeddict_plan = _get_typeddict_plan(tp)
+    columns = {
+        name: _get_column_plan(field_type, name in typeddict_plan.required_keys)
+        for name, field_type in typeddict_plan.field_types.items()
+    }
+    rest_type = typeddict_plan.rest_type
+    plan = _FramePlan(
+        required_columns=sorted(typeddict_plan.required_keys),
+        columns=columns,
+        rest=None if rest_type is None else _get_column_plan(rest_type, False),
+    )
+    with _FRAME_PLANS_LOCK:
+        return _FRAME_PLANS.setdefault(tp, plan)
+
+
+def _get_column_plan(tp: TypeLike, required: bool) -> _ColumnPlan:
+    # `Required` and `NotRequired` type qualifiers
+    if typing_extensions and get_origin(tp) in (
+        typing_extensions.Required,
+        typing_extensions.NotRequired,
+    ):
+        (tp,) = get_args(tp)
+
+    constraints = None
+    if get_origin(tp) is Annotated:
+        tp, constraints = get_args(tp)
+
+    nullable = not required
+    if get_origin(tp) in UNION_TYPES:
+        members = [arg for arg in get_args(tp) if arg not in NONE_TYPES]
+        nullable = nullable or len(members) < len(get_args(tp))
+        if len(members) == 1:
+            tp = members[0]
+        elif members:
+            tp = Union[tuple(members)]
+        else:
+            tp = NoneType
+
+    if tp in NONE_TYPES:
+        # e.g. `Union[None, Literal[None]]`: only null values are valid
+        return _ColumnPlan(NoneType, constraints, None, True)
+
+    return _ColumnPlan(tp, constraints, KINDS.get(tp), nullable)
+
+
+def _is_valid_values(values: Iterable[Any], plan: _ColumnPlan) -> bool:
+    """Check the values of a column one by one when it cannot be done with its dtype"""
+    return all(isinstancex(v, plan.tp, constraints=plan.constraints) for v in values)
+
+
+#######################################
+# pandas
+#######################################
+def _validate_pandas_column(column: Any, plan: _ColumnPlan) -> bool:
+    from pandas.api.types import infer_dtype
+
+    nulls = column.isna()
+    has_nulls = bool(nulls.any())
+    if has_nulls:
+        if not plan.nullable:
+            return False
+        column = column[~nulls]
+
+    if len(column) == 0:
+        return True
+
+    if plan.kind is None:
+        return _is_valid_values(column.tolist(), plan)
+
+    # inferred from the dtype or, for `object` columns, by scanning the values in C
+    kind = infer_dtype(column, skipna=False)
+    if kind != plan.kind:
+        # integers of a column with null values are converted to floats by pandas
+        is_int_with_nulls = (
+            has_nulls
+            and plan.kind == "integer"
+            and kind == "floating"
+            and bool((column % 1 == 0).all())
+        )
+        if not is_int_with_nulls:
+            return False
+
+    constraints = plan.constraints
+    if constraints is None:
+        return True
+
+    if plan.kind == "string" and not _has_bounds(constraints):
+        lengths = column.str.len()
+        return _is_valid_lengths(lengths.min(), lengths.max(), constraints) and (
+            constraints.regex is None or bool(column.str.contains(constraints.regex).all())
+        )
+
+    if plan.kind != "string" and not _has_string_constraints(constraints):
+        return _is_valid_bounds(column.min(), column.max(), constraints) and (
+            constraints.multiple_of is None or bool((column % constraints.multiple_of == 0).all())
+        )
+
+    return _is_valid_values(column.tolist(), plan)
+
+
+#######################################
+# pyarrow
+#######################################
+def _validate_arrow_column(column: Any, plan: _ColumnPlan) -> bool:
+    import pyarrow.compute as pc
+
+    if column.null_count:
+        if not plan.nullable:
+            return False
+        column = pc.drop_null(column)
+
+    if len(column) == 0:
+        return True
+
+    if plan.kind is None:
+        return _is_valid_values(column.to_pylist(), plan)
+
+    if _get_arrow_kind(column.type) != plan.kind:
+        return False
+
+    constraints = plan.constraints
+    if constraints is None:
+        return True
+
+    if plan.kind == "string" and not _has_bounds(constraints):
+        lengths = pc.min_max(pc.utf8_length(column))
+        return _is_valid_lengths(lengths["min"].as_py(), lengths["max"].as_py(), constraints) and (
+            constraints.regex is None
+            or pc.all(pc.match_substring_regex(column, constraints.regex)).as_py()
+        )
+
+    # there is no modulo in `pyarrow.compute` so `multiple_of` is checked value by value
+    if (
+        plan.kind != "string"
+        and not _has_string_constraints(constraints)
+        and constraints.multiple_of is None
+    ):
+        bounds = pc.min_max(column)
+        return _is_valid_bounds(bounds["min"].as_py(), bounds["max"].as_py(), constraints)
+
+    return _is_valid_values(column.to_pylist(), plan)
+
+
+def _get_arrow_kind(arrow_type: Any) -> Optional[str]:
+    import pyarrow as pa
+
+    if pa.types.is_boolean(arrow_type):
+        return "boolean"
+    elif pa.types.is_integer(arrow_type):
+        return "integer"
+    elif pa.types.is_floating(arrow_type):
+        return "floating"
+    elif pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return "string"
+    return None
@@ -1,46 +1,450 @@
-from functools import wraps
-from inspect import signature
-from typing import Any
+import collections.abc
+import os
+import random
+import sys
+import threading
+import warnings
+from dataclasses import dataclass
+from functools import update_wrapper
+from inspect import Parameter, signature
+from types import FunctionType, MethodType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
-from .main import isinstancex
-from .typing_compat import display_type, get_type_hints
+from .errors import TypeCheckError
+from .main import ITERATOR_ORIGINS, isinstancex
+from .normalize import normalize
+from .typing_compat import TypeLike, get_args, get_origin, get_type_hints
 
+__all__ = (
+    "CheckPolicy",
+    "func_check",
+    "func_check_class",
+    "get_check_stats",
+    "set_check_policy",
+)
 
-def func_check(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        sig = signature(func)
+POLICY_ENV_VAR = "TYPINGX_FUNC_CHECK"
+
+
+@dataclass(frozen=True, repr=False)
+class CheckPolicy:
+    """
+    Which calls of a function decorated with `func_check` are checked:
+    - `CheckPolicy.full()`: all of them
+    - `CheckPolicy.off()`: none of them
+    - `CheckPolicy.sample(p)`: a random fraction `p` of them
+    - `CheckPolicy.first(n)`: the `n` first ones
+    """
+
+    mode: str = "full"
+    value: float = 0
+
+    @classmethod
+    def full(cls) -> "CheckPolicy":
+        return cls("full")
+
+    @classmethod
+    def off(cls) -> "CheckPolicy":
+        return cls("off")
+
+    @classmethod
+    def sample(cls, p: float) -> "CheckPolicy":
+        if not 0 <= p <= 1:
+            raise ValueError(f"Sample rate should be between 0 and 1 (got {p})")
+        return cls("sample", p)
+
+    @classmethod
+    def first(cls, n: int) -> "CheckPolicy":
+        if n < 0:
+            raise ValueError(f"Number of checked calls should be positive (got {n})")
+        return cls("first", n)
+
+    @classmethod
+    def parse(cls, s: str) -> "CheckPolicy":
+        """Parse a policy written like `full`, `off`, `sample:0.01` or `first:100`"""
+        mode, _, value = s.strip().lower().partition(":")
+        if mode in {"full", "off"} and not value:
+            return cls(mode)
+        elif mode == "sample" and value:
+            return cls.sample(float(value))
+        elif mode == "first" and value:
+            return cls.first(int(value))
+        raise ValueError(f"Invalid check policy {s!r}")
+
+    def __repr__(self) -> str:
+        if self.mode in {"full", "off"}:
+            return f"CheckPolicy.{self.mode}()"
+        elif self.mode == "first":
+            return f"CheckPolicy.first({int(self.value)})"
+        else:
+            return f"CheckPolicy.sample({self.value})"
 
-        # Default annotations types
-        p_types = {
-            p.name: Any if p.annotation is p.empty else p.annotation
-            for p in sig.parameters.values()
-        }
-        p_types["return"] = Any
+
+def _get_env_policy() -> CheckPolicy:
+    """Policy set with the `TYPINGX_FUNC_CHECK` environment variable (`full` by default)"""
+    try:
+        return CheckPolicy.parse(os.environ.get(POLICY_ENV_VAR, "full"))
+    except ValueError as e:
+        # an invalid value should not prevent the application from starting
+        warnings.warn(f"{e} in {POLICY_ENV_VAR}, falling back to the `full` policy")
+        return CheckPolicy.full()
+
+
+_global_policy = _get_env_policy()
+
+
+class _FuncPlan:
+    """Annotations and default values of the parameters of a function, resolved once"""
+
+    def __init__(self, func: Callable[..., Any], localns: Optional[Dict[str, Any]] = None) -> None:
+        sig = signature(func)
         # Add right annotations if set like `Annotated` or actual return type
-        p_types.update(get_type_hints(func, include_extras=True))
+        hints = get_type_hints(func, localns=localns, include_extras=True)
+
+        self.names: List[str] = list(sig.parameters)
+        # (index, name, type, default value, type of items checked lazily) of the parameters
+        # that need to be checked (e.g. not `self` or `cls` that have no annotation)
+        self.params: List[Tuple[int, str, TypeLike, Any, Optional[TypeLike]]] = []
+        self.var_args: Optional[Tuple[int, TypeLike]] = None
+        self.var_kwargs: Optional[TypeLike] = None
+
+        for index, p in enumerate(sig.parameters.values()):
+            tp = normalize(hints.get(p.name, Any))
+            if tp is Any:
+                continue
 
-        # Default set values
-        p_values = {p.name: p.default for p in sig.parameters.values()}
-        # Add set values
-        p_values.update(dict(zip(p_values, args)))
-        p_values.update(kwargs)
+            if p.kind is p.VAR_POSITIONAL:
+                self.var_args = (index, tp)
+            elif p.kind is p.VAR_KEYWORD:
+                self.var_kwargs = tp
+            else:
+                if p.kind is p.KEYWORD_ONLY:
+                    index = sys.maxsize
+                self.params.append((index, p.name, tp, p.default, _get_lazy_item_type(tp)))
 
-        for p_name, value in p_values.items():
-            if not isinstancex(value, p_types[p_name]):
-                raise TypeError(
-                    f"Input {p_name} (value: {value!r}) is not "
-                    f"a valid {display_type(p_types[p_name])}"
-                )
+        self.return_type: TypeLike = normalize(hints.get("return", Any))
+        self.return_item_type = _get_lazy_item_type(self.return_type)
 
-        res = func(*args, **kwargs)
+
+class _CheckedFunction:
+    """
+    Function decorated with `func_check`, with its own policy and counters.
+    It also works as method, classmethod or staticmethod
+    """
+
+    __slots__ = (
+        "func",
+        "policy",
+        "cache",
+        "validated",
+        "skipped",
+        "_lock",
+        "_localns",
+        "_plan",
+        # attributes copied from the function by `update_wrapper` (`__name__`, `__wrapped__`...)
+        "__dict__",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        policy: Optional[CheckPolicy],
+        localns: Optional[Dict[str, Any]] = None,
+        cache: bool = False,
+    ) -> None:
+        update_wrapper(self, func)
+        self.func = func
+        self.policy = policy
+        # whether the results of the checks of deeply immutable values are cached
+        self.cache = cache
+        self.validated = 0
+        self.skipped = 0
+        # the counters of `first(n)` are updated by all the threads calling the function
+        self._lock = threading.Lock()
+        self._localns = localns
+        self._plan: Optional[_FuncPlan] = None
+
+    @property
+    def plan(self) -> _FuncPlan:
+        # resolved on first use by default so forward references can be resolved
+        # (threads racing on the first call may each resolve it but they all get a valid plan)
+        if self._plan is None:
+            self._plan = _FuncPlan(self.func, self._localns)
+        return self._plan
+
+    def __get__(self, instance: Any, owner: Any = None) -> Any:
+        if instance is None:
+            return self
+        return MethodType(self, instance)
+
+    def __reduce__(self) -> str:
+        # pickled by reference like the function it decorates (e.g. to be sent to other processes)
+        return self.func.__qualname__
+
+    def count_call(self) -> bool:
+        """Decide if a call is checked and count it"""
+        policy = self.policy or _global_policy
+        # only `first(n)` needs the lock to never check more than `n` calls, the counters of
+        # the other policies are statistics that are not worth serializing all the calls for
+        if policy.mode == "full":
+            self.validated += 1
+            return True
+        elif policy.mode == "off":
+            self.skipped += 1
+            return False
+        elif policy.mode == "sample":
+            if random.random() < policy.value:
+                self.validated += 1
+                return True
+            self.skipped += 1
+            return False
+
+        with self._lock:
+            if self.validated < policy.value:
+                self.validated += 1
+                return True
+            self.skipped += 1
+            return False
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if not self.count_call():
+            return self.func(*args, **kwargs)
+
+        plan = self.plan
+
+        for index, p_name, tp, default, item_type in plan.params:
+            if index < len(args):
+                value = args[index]
+            elif p_name in kwargs:
+                value = kwargs[p_name]
+            elif default is Parameter.empty:
+                # missing argument: let the function call fail
+                continue
+            else:
+                value = default
+
+            if item_type is not None:
+                checked_value = _wrap_iterable(value, tp, item_type, f"Input {p_name}")
+                if checked_value is not value:
+                    args, kwargs = _replace_arg(args, kwargs, index, p_name, checked_value)
+            elif not isinstancex(value, tp, cache=self.cache):
+                raise TypeCheckError(f"Input {p_name}", value, tp)
+
+        if plan.var_args is not None:
+            index, tp = plan.var_args
+            for value in args[index:]:
+                if not isinstancex(value, tp, cache=self.cache):
+                    raise TypeCheckError(f"Input {plan.names[index]}", value, tp)
+
+        if plan.var_kwargs is not None:
+            tp = plan.var_kwargs
+            for p_name, value in kwargs.items():
+                if p_name not in plan.names and not isinstancex(value, tp, cache=self.cache):
+                    raise TypeCheckError(f"Input {p_name}", value, tp)
+
+        res = self.func(*args, **kwargs)
 
         # validate output
-        if not isinstancex(res, p_types["return"]):
-            raise TypeError(
-                f"Output (value: {res!r}) is not a valid {display_type(p_types['return'])}"
-            )
+        if plan.return_item_type is not None:
+            return _wrap_iterable(res, plan.return_type, plan.return_item_type, "Output")
+        elif not isinstancex(res, plan.return_type, cache=self.cache):
+            raise TypeCheckError("Output", res, plan.return_type)
 
         return res
 
-    return wrapper
+
+def func_check(
+    func: Optional[Callable[..., Any]] = None,
+    *,
+    policy: Union[CheckPolicy, str, None] = None,
+    cache: bool = False,
+) -> Any:
+    """
+    Check inputs and output of a function based on its annotations.
+    Can be used as `@func_check` or `@func_check(policy=CheckPolicy.sample(0.01))`.
+    Without explicit policy, the global one is used (see `set_check_policy`).
+    With `cache=True`, deeply immutable values (e.g. tuples of strings) that have already been
+    checked against the same type are not checked again (see `isinstancex`)
+    """
+    if func is None:
+        return lambda f: func_check(f, policy=policy, cache=cache)
+
+    if isinstance(policy, str):
+        policy = CheckPolicy.parse(policy)
+
+    return _CheckedFunction(func, policy, cache=cache)
+
+
+def func_check_class(
+    cls: Optional[Type[Any]] = None,
+    *,
+    policy: Union[CheckPolicy, str, None] = None,
+    cache: bool = False,
+) -> Any:
+    """
+    Decorate all the public methods, classmethods, staticmethods and property setters
+    of a class with `func_check`.
+    Annotations are resolved once, when decorating, with the class namespace so they can
+    refer to the class itself
+    """
+    if cls is None:
+        return lambda c: func_check_class(c, policy=policy, cache=cache)
+
+    checked_policy = CheckPolicy.parse(policy) if isinstance(policy, str) else policy
+    localns = {**vars(cls), cls.__name__: cls}
+
+    def checked(func: Callable[..., Any]) -> _CheckedFunction:
+        checked_func = _CheckedFunction(func, checked_policy, localns, cache)
+        try:
+            checked_func.plan
+        except NameError:
+            # reference to something not defined yet: it will be resolved on first call
+            pass
+        return checked_func
+
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or isinstance(attr, _CheckedFunction):
+            continue
+
+        if isinstance(attr, staticmethod):
+            setattr(cls, name, staticmethod(checked(attr.__func__)))
+        elif isinstance(attr, classmethod):
+            setattr(cls, name, classmethod(checked(attr.__func__)))
+        elif isinstance(attr, property):
+            if attr.fset is not None and not isinstance(attr.fset, _CheckedFunction):
+                setattr(cls, name, attr.setter(checked(attr.fset)))
+        elif isinstance(attr, FunctionType):
+            setattr(cls, name, checked(attr))
+
+    return cls
+
+
+def _get_lazy_item_type(tp: TypeLike) -> Optional[TypeLike]:
+    """Type of the items checked lazily for `Iterable[...]`, `Iterator[...]` or `Generator[...]`"""
+    if get_origin(tp) in ITERATOR_ORIGINS and get_args(tp):
+        return get_args(tp)[0]
+    return None
+
+
+def _replace_arg(
+    args: Tuple[Any, ...], kwargs: Dict[str, Any], index: int, p_name: str, value: Any
+) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+    if index < len(args):
+        replaced_args = list(args)
+        replaced_args[index] = value
+        args = tuple(replaced_args)
+    else:
+        # set in `kwargs` or default value
+        kwargs = {**kwargs, p_name: value}
+    return args, kwargs
+
+
+def _wrap_iterable(value: Any, tp: TypeLike, item_type: TypeLike, name: str) -> Any:
+    """
+    Check an iterable annotated with `Iterable[...]`, `Iterator[...]` or `Generator[...]`.
+    Iterators are not consumed: a proxy that checks each item when it is pulled is returned instead
+    """
+    # `tp` has an item type so its origin is one of `ITERATOR_ORIGINS`
+    origin = cast(Type[Iterable[Any]], get_origin(tp))
+    if not isinstance(value, origin):
+        raise TypeCheckError(name, value, tp)
+
+    if isinstance(value, collections.abc.Generator):
+        return _CheckedGenerator(value, item_type, name)
+    elif isinstance(value, collections.abc.Iterator):
+        return _CheckedIterator(value, item_type, name)
+
+    # a collection (e.g. a list) can be iterated many times and hence checked right away
+    for index, item in enumerate(value):
+        _check_item(item, index, item_type, name)
+    return value
+
+
+def _check_item(item: Any, index: int, item_type: TypeLike, name: str) -> None:
+    if not isinstancex(item, item_type):
+        raise TypeCheckError(f"{name} item {index}", item, item_type)
+
+
+class _CheckedIterator(collections.abc.Iterator):  # type: ignore[type-arg]
+    """Iterator that checks each item of the wrapped iterator when it is pulled"""
+
+    __slots__ = ("_it", "_item_type", "_name", "_index")
+
+    def __init__(self, it: Iterator[Any], item_type: TypeLike, name: str) -> None:
+        self._it = it
+        self._item_type = item_type
+        self._name = name
+        self._index = 0
+
+    def _checked(self, item: Any) -> Any:
+        _check_item(item, self._index, self._item_type, self._name)
+        self._index += 1
+        return item
+
+    def __next__(self) -> Any:
+        return self._checked(next(self._it))
+
+
+class _CheckedGenerator(_CheckedIterator, Generator[Any, Any, Any]):
+    """Generator that checks each item of the wrapped generator when it is pulled"""
+
+    __slots__ = ()
+
+    def send(self, value: Any) -> Any:
+        return self._checked(self._it.send(value))  # type: ignore[attr-defined]
+
+    def throw(self, *args: Any) -> Any:
+        return self._checked(self._it.throw(*args))  # type: ignore[attr-defined]
+
+    def close(self) -> None:
+        self._it.close()  # type: ignore[attr-defined]
+
+
+def _get_checked_function(func: Callable[..., Any]) -> _CheckedFunction:
+    # methods are bound to their instance or class
+    checked_func = getattr(func, "__func__", func)
+    if not isinstance(checked_func, _CheckedFunction):
+        raise TypeError(f"{func!r} is not decorated with `func_check`")
+    return checked_func
+
+
+def set_check_policy(
+    policy: Union[CheckPolicy, str, None], func: Optional[Callable[..., Any]] = None
+) -> None:
+    """
+    Set the policy of all the functions decorated with `func_check` or only of `func`.
+    The global policy can also be set with the `TYPINGX_FUNC_CHECK` environment variable
+    (e.g. `TYPINGX_FUNC_CHECK=sample:0.01`).
+    Setting `None` as policy of a function makes it use the global one again
+    """
+    global _global_policy
+
+    if isinstance(policy, str):
+        policy = CheckPolicy.parse(policy)
+
+    if func is not None:
+        _get_checked_function(func).policy = policy
+    elif policy is None:
+        raise TypeError("The global policy cannot be `None`")
+    else:
+        _global_policy = policy
+
+
+def get_check_stats(func: Callable[..., Any]) -> Dict[str, int]:
+    """Return the number of checked and skipped calls of a function decorated with `func_check`"""
+    checked_func = _get_checked_function(func)
+    return {"validated": checked_func.validated, "skipped": checked_func.skipped}
@@ -0,0 +1,167 @@
+"""
+Check JSON documents while they are decoded.
+
+Top-level arrays and objects are decoded item by item with the C scanner of the `json` module,
+so an invalid document is rejected as soon as its first invalid item is decoded and the
+decoded tree never needs to be walked again
+"""
+import collections.abc
+import json
+from json.decoder import WHITESPACE, JSONDecodeError, scanstring  # type: ignore[attr-defined]
+from typing import Any, Callable, Iterator, Optional, Tuple, Union, cast
+
+from .errors import TypeCheckError
+from .main import _convert_shorthand, _get_typeddict_plan, isinstancex
+from .typing_compat import TypedDict, TypeLike, display_type, get_args, get_origin, is_typeddict
+
+__all__ = ("loads",)
+
+# origins of types whose items can be checked one by one while decoding a JSON array
+ARRAY_ORIGINS = {list, collections.abc.Collection, collections.abc.Sequence}
+# origins of types whose items can be checked one by one while decoding a JSON object
+OBJECT_ORIGINS = {dict, collections.abc.Mapping}
+
+
+def loads(s: Union[str, bytes, bytearray], tp: TypeLike) -> Any:
+    """
+    Deserialize `s` (a `str`, `bytes` or `bytearray` instance containing a JSON document)
+    and check that the result is a valid `tp`.
+    A `json.JSONDecodeError` is raised if the document is not valid JSON
+    and a `TypeError` if the decoded value is not a valid `tp`
+    """
+    if isinstance(s, (bytes, bytearray)):
+        s = s.decode(json.detect_encoding(s), "surrogatepass")
+
+    tp = _convert_shorthand(tp)
+    scanner = _Scanner(s)
+    char = scanner.peek()
+
+    if char == "[" and get_origin(tp) in ARRAY_ORIGINS and _get_name(tp) != "Listx":
+        (item_type,) = get_args(tp) or (Any,)
+        obj: Any = []
+        for index, item in enumerate(scanner.iter_array()):
+            _check(item, item_type, "Item {}", index)
+            obj.append(item)
+
+    elif char == "{" and (is_typeddict(tp) or get_origin(tp) in OBJECT_ORIGINS):
+        check_item = _get_object_item_checker(tp)
+        obj = {}
+        for key, value in scanner.iter_object():
+            check_item(key, value)
+            obj[key] = value
+
+        if is_typeddict(tp):
+            missing_keys = _get_typeddict_plan(cast(TypedDict, tp)).required_keys - obj.keys()
+            if missing_keys:
+                raise TypeError(
+                    f"Missing keys {sorted(missing_keys)} for a valid {display_type(tp)}"
+                )
+
+    else:
+        obj = scanner.decode()
+        _check(obj, tp, "Value")
+
+    scanner.end()
+    return obj
+
+
+def _get_name(tp: TypeLike) -> Optional[str]:
+    return getattr(tp, "_name", None) or getattr(tp, "__name__", None)
+
+
+def _check(value: Any, tp: TypeLike, name: str, *name_args: Any) -> None:
+    # the name is only formatted with its args (e.g. the index of an item) on failure
+    if not isinstancex(value, tp):
+        raise TypeCheckError(name.format(*name_args), value, tp)
+
+
+def _get_object_item_checker(tp: TypeLike) -> Callable[[str, Any], None]:
+    if is_typeddict(tp):
+        plan = _get_typeddict_plan(cast(TypedDict, tp))
+
+        def check_field(key: str, value: Any) -> None:
+            if key in plan.field_types:
+                _check(value, plan.field_types[key], "Field {!r}", key)
+            elif plan.rest_type is not None:
+                _check(value, plan.rest_type, "Field {!r}", key)
+            else:
+                raise TypeError(f"Field {key!r} is not allowed in a valid {display_type(tp)}")
+
+        return check_field
+
+    keys_type, values_type = get_args(tp) or (Any, Any)
+
+    def check_key_value(key: str, value: Any) -> None:
+        _check(key, keys_type, "Key")
+        _check(value, values_type, "Value of key {!r}", key)
+
+    return check_key_value
+
+
+class _Scanner:
+    """Decode a JSON document, optionally item by item for its top-level array or object"""
+
+    def __init__(self, s: str) -> None:
+        self.s = s
+        self.idx = 0
+        self.decoder = json.JSONDecoder()
+        self._skip_whitespace()
+
+    def peek(self) -> str:
+        return self.s[self.idx] if self.idx < len(self.s) else ""
+
+    def decode(self) -> Any:
+        obj, self.idx = self.decoder.raw_decode(self.s, self.idx)
+        return obj
+
+    def iter_array(self) -> Iterator[Any]:
+        """Decode the items of the array starting at the current position one by one"""
+        self._consume("[")
+        if self._consume_closing("]"):
+            return
+
+        while True:
+            yield self.decode()
+            if self._consume_closing("]"):
+                return
+            self._consume(",", "Expecting ',' delimiter")
+
+    def iter_object(self) -> Iterator[Tuple[str, Any]]:
+        """Decode the pairs of the object starting at the current position one by one"""
+        self._consume("{")
+        if self._consume_closing("}"):
+            return
+
+        while True:
+            if self.peek() != '"':
+                raise JSONDecodeError(
+                    "Expecting property name enclosed in double quotes", self.s, self.idx
+                )
+            key, self.idx = scanstring(self.s, self.idx + 1)
+            self._skip_whitespace()
+            self._consume(":", "Expecting ':' delimiter")
+            yield key, self.decode()
+            if self._consume_closing("}"):
+                return
+            self._consume(",", "Expecting ',' delimiter")
+
+    def end(self) -> None:
+        self._skip_whitespace()
+        if self.idx != len(self.s):
+            raise JSONDecodeError("Extra data", self.s, self.idx)
+
+    def _skip_whitespace(self) -> None:
+        self.idx = WHITESPACE.match(self.s, self.idx).end()
+
+    def _consume(self, char: str, msg: str = "Expecting value") -> None:
+        if self.peek() != char:
+            raise JSONDecodeError(msg, self.s, self.idx)
+        self.idx += 1
+        self._skip_whitespace()
+
+    def _consume_closing(self, char: str) -> bool:
+        self._skip_whitespace()
+        if self.peek() == char:
+            self.idx += 1
+            return True
+        return False
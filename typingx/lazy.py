@@ -0,0 +1,225 @@
+"""
+Read-only proxies of dicts and lists that check their values only when they are accessed.
+
+Huge documents that are only partly read are not checked as a whole: the container itself is
+checked when the proxy is created (type, keys of a `TypedDict`, constraints) and each value
+is checked the first time it is accessed, with the verdict kept for the next accesses
+"""
+import collections.abc
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Union
+
+from .errors import TypeCheckError
+from .main import (
+    NONE_TYPES,
+    UNION_TYPES,
+    Constraints,
+    _get_typeddict_plan,
+    _TypedDictPlan,
+    isinstancex,
+)
+from .normalize import normalize
+from .typing_compat import Annotated, TypeLike, get_args, get_origin, is_typeddict
+
+__all__ = ("lazy",)
+
+# container checked when the proxy is created, by origin of the types checked lazily
+MAPPING_CONTAINERS: Dict[Any, type] = {
+    dict: dict,
+    collections.abc.Mapping: collections.abc.Mapping,
+}
+SEQUENCE_CONTAINERS: Dict[Any, type] = {
+    list: list,
+    tuple: tuple,
+    collections.abc.Sequence: collections.abc.Sequence,
+}
+
+
+@dataclass(frozen=True)
+class _LazyPlan:
+    """How a container is checked lazily, resolved once per type"""
+
+    tp: TypeLike
+    container: type
+    constraints: Optional[Constraints]
+    # type of the keys and values of a mapping or of the items of a sequence
+    keys_type: TypeLike
+    values_type: TypeLike
+    typeddict_plan: Optional[_TypedDictPlan]
+
+    def is_valid_container(self, obj: Any) -> bool:
+        return (
+            isinstance(obj, self.container)
+            and (self.constraints is None or self.constraints.is_valid(obj))
+            and (self.typeddict_plan is None or self.typeddict_plan.has_valid_keys(obj))
+        )
+
+    def value_type(self, key: Any) -> TypeLike:
+        if self.typeddict_plan is None:
+            return self.values_type
+        # keys that are not declared are only allowed when there is a `rest_type`
+        return self.typeddict_plan.field_types.get(key, self.typeddict_plan.rest_type)
+
+
+# plans by type, `None` for the types that are checked when the value is accessed
+_LAZY_PLANS: Dict[Any, Optional[_LazyPlan]] = {}
+
+
+def _get_lazy_plan(tp: TypeLike) -> Optional[_LazyPlan]:
+    try:
+        return _LAZY_PLANS[tp]
+    except KeyError:
+        pass
+    except TypeError:  # e.g. shortcut `{'a': int}` cannot be hashed
+        return _resolve_lazy_plan(tp)
+
+    # if another thread resolved the same plan meanwhile, its plan is kept
+    return _LAZY_PLANS.setdefault(tp, _resolve_lazy_plan(tp))
+
+
+def _resolve_lazy_plan(tp: TypeLike) -> Optional[_LazyPlan]:
+    original_tp = tp
+    tp = normalize(tp)
+
+    constraints = None
+    if get_origin(tp) is Annotated:
+        tp, constraints = get_args(tp)
+
+    if is_typeddict(tp):
+        return _LazyPlan(original_tp, dict, constraints, str, Any, _get_typeddict_plan(tp))
+
+    origin = get_origin(tp)
+    if origin in MAPPING_CONTAINERS:
+        keys_type, values_type = get_args(tp) or (Any, Any)
+        container = MAPPING_CONTAINERS[origin]
+        return _LazyPlan(original_tp, container, constraints, keys_type, values_type, None)
+
+    if origin in SEQUENCE_CONTAINERS:
+        args = get_args(tp) or (Any, ...)
+        # e.g. `Tuple[int, str]` or `Listx[int, str]` are checked when the value is accessed
+        if origin is tuple:
+            is_homogeneous = len(args) == 2 and args[1] is ...
+        else:
+            is_homogeneous = len(args) == 1 and getattr(tp, "_name", None) != "Listx"
+        if not is_homogeneous:
+            return None
+        return _LazyPlan(original_tp, SEQUENCE_CONTAINERS[origin], constraints, int, args[0], None)
+
+    return None
+
+
+def lazy(obj: Any, tp: TypeLike) -> Any:
+    """
+    Return a read-only proxy of `obj`, a dict or a list, that checks each value against its type
+    in `tp` only the first time it is accessed.
+    Dicts and lists in `obj` are themselves returned as lazy proxies.
+    The container itself is checked right away (e.g. the keys of a `TypedDict`) and
+    `TypeCheckError` is raised when an invalid value is accessed
+
+        >>> class Movie(TypedDict):
+        ...     name: str
+        ...     year: int
+        >>> movies = lazy([{'name': 'The Matrix', 'year': '1999'}], List[Movie])
+        >>> movies[0]['name']
+        'The Matrix'
+        >>> movies[0]['year']
+        TypeError: Value[0]['year'] (value: '1999') is not a valid int
+    """
+    return _lazy_value(obj, tp, "Value")
+
+
+def _lazy_value(value: Any, tp: TypeLike, path: str) -> Any:
+    # e.g. `Optional[Movie]`: only the type of the non null values can be checked lazily
+    if get_origin(tp) in UNION_TYPES:
+        members = [arg for arg in get_args(tp) if arg not in NONE_TYPES]
+        if value is None and len(members) < len(get_args(tp)):
+            return value
+        if len(members) == 1:
+            tp = members[0]
+
+    plan = _get_lazy_plan(tp)
+    if plan is None:
+        if not isinstancex(value, tp):
+            raise TypeCheckError(path, value, tp)
+        return value
+
+    if not plan.is_valid_container(value):
+        raise TypeCheckError(path, value, plan.tp)
+    if issubclass(plan.container, collections.abc.Mapping):
+        return _LazyMapping(value, plan, path)
+    return _LazySequence(value, plan, path)
+
+
+class _LazyMapping(collections.abc.Mapping):  # type: ignore[type-arg]
+    """Read-only mapping whose keys and values are checked when they are accessed"""
+
+    __slots__ = ("_obj", "_plan", "_path", "_values")
+
+    def __init__(self, obj: Any, plan: _LazyPlan, path: str) -> None:
+        self._obj = obj
+        self._plan = plan
+        self._path = path
+        # checked values (or proxies of the values) by key
+        self._values: Dict[Any, Any] = {}
+
+    def __getitem__(self, key: Any) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+
+        value = self._obj[key]
+        self._check_key(key)
+        checked_value = _lazy_value(value, self._plan.value_type(key), f"{self._path}[{key!r}]")
+        return self._values.setdefault(key, checked_value)
+
+    def __iter__(self) -> Iterator[Any]:
+        for key in self._obj:
+            self._check_key(key)
+            yield key
+
+    def __len__(self) -> int:
+        return len(self._obj)
+
+    def __repr__(self) -> str:
+        return f"lazy({self._obj!r}, {self._plan.tp!r})"
+
+    def _check_key(self, key: Any) -> None:
+        if not isinstancex(key, self._plan.keys_type):
+            raise TypeCheckError(f"Key of {self._path}", key, self._plan.keys_type)
+
+
+class _LazySequence(collections.abc.Sequence):  # type: ignore[type-arg]
+    """Read-only sequence whose items are checked when they are accessed"""
+
+    __slots__ = ("_obj", "_plan", "_path", "_values")
+
+    def __init__(self, obj: Any, plan: _LazyPlan, path: str) -> None:
+        self._obj = obj
+        self._plan = plan
+        self._path = path
+        # checked items (or proxies of the items) by positive index
+        self._values: Dict[int, Any] = {}
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._obj)))]
+
+        if not -len(self._obj) <= index < len(self._obj):
+            raise IndexError(f"{self._path} index out of range")
+        if index < 0:
+            index += len(self._obj)
+        try:
+            return self._values[index]
+        except KeyError:
+            pass
+
+        item = self._obj[index]
+        checked_item = _lazy_value(item, self._plan.values_type, f"{self._path}[{index}]")
+        return self._values.setdefault(index, checked_item)
+
+    def __len__(self) -> int:
+        return len(self._obj)
+
+    def __repr__(self) -> str:
+        return f"lazy({self._obj!r}, {self._plan.tp!r})"
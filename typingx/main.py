@@ -1,8 +1,32 @@
+import collections
 import collections.abc
 import sys
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union, cast
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields, is_dataclass
+from itertools import chain, islice, repeat
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 
+from .errors import BudgetExceeded
 from .types import Listx, Tuplex
 from .typing_compat import (
     Annotated,
@@ -23,7 +47,15 @@ try:
 except ImportError:  # pragma: no cover
     typing_extensions = None  # type: ignore[assignment]
 
-__all__ = ("Constraints", "isinstancex", "issubclassx")
+__all__ = (
+    "Budget",
+    "Constraints",
+    "isinstancex",
+    "isinstancex_many",
+    "issubclassx",
+    "register_handler",
+    "validate_update",
+)
 
 TYPED_DICT_EXTRA_KEY = "__extra__"
 NONE_TYPES = {None, NoneType, Literal[None]}
@@ -34,6 +66,48 @@ else:
 
     UNION_TYPES = {Union, types.UnionType}
 
+# origins of types checked like `Dict[..., ...]`
+MAPPING_ORIGINS = {
+    collections.OrderedDict,
+    collections.defaultdict,
+    collections.abc.MutableMapping,
+}
+# origins of types checked like `List[...]`
+SEQUENCE_ORIGINS = {collections.deque, collections.abc.MutableSequence}
+# origins of types checked like `Set[...]`
+SET_ORIGINS = {frozenset, collections.abc.Set, collections.abc.MutableSet}
+# modules of the generic classes that are not user generic classes
+NATIVE_GENERIC_MODULES = {"typing", "typing_extensions", "collections.abc", "builtins"}
+# attributes of a protocol class that are not members of the protocol
+NON_PROTOCOL_MEMBERS = {
+    "__abstractmethods__",
+    "__annotations__",
+    "__dict__",
+    "__doc__",
+    "__init__",
+    "__module__",
+    "__new__",
+    "__orig_bases__",
+    "__parameters__",
+    "__protocol_attrs__",
+    "__non_callable_proto_members__",
+    "__qualname__",
+    "__slots__",
+    "__firstlineno__",
+    "__static_attributes__",
+    "__subclasshook__",
+    "__type_params__",
+    "__weakref__",
+    "_is_protocol",
+    "_is_runtime_protocol",
+}
+# origins of types whose items are checked only if they can be iterated more than once
+ITERATOR_ORIGINS = {
+    collections.abc.Generator,
+    collections.abc.Iterable,
+    collections.abc.Iterator,
+}
+
 
 @dataclass(frozen=True, repr=False)
 class Constraints:
@@ -80,9 +154,224 @@ class Constraints:
         return f"Constraints({', '.join(defined_fields)})"
 
 
-def isinstancex(obj: Any, tp: TypeLike, *, constraints: Optional[Constraints] = None) -> bool:
+@dataclass(frozen=True)
+class Budget:
+    """
+    Limits of a check. `BudgetExceeded` is raised as soon as one of them is exceeded
+    - `timeout`: maximum duration of the check in seconds
+    - `max_elements`: maximum number of checked elements (the object itself and all its items)
+    - `max_depth`: maximum nesting depth of the checked elements (0 for the object itself)
+    """
+
+    timeout: Optional[float] = None
+    max_elements: Optional[int] = None
+    max_depth: Optional[int] = None
+
+
+def isinstancex(
+    obj: Any,
+    tp: TypeLike,
+    *,
+    constraints: Optional[Constraints] = None,
+    iterative: bool = False,
+    budget: Optional[Budget] = None,
+    workers: Optional[int] = None,
+    cache: bool = False,
+) -> bool:
+    """
+    Extend `isinstance` with `typing` types.
+    With `iterative=True`, containers are walked with an explicit stack instead of recursive calls
+    so deeply nested objects do not hit the recursion limit.
+    With a `budget`, the check is iterative and `BudgetExceeded` is raised if it exceeds the budget.
+    With `workers`, the items of a container are split between as many threads.
+    With `cache=True`, the result is cached for deeply immutable objects (e.g. tuples of
+    strings) so checking the same object against the same type again is a lookup
+    """
+    _check_workers(workers, budget)
+
+    if cache:
+        cached_valid = _get_verified(obj, tp, constraints)
+        if cached_valid is not None:
+            return cached_valid
+
     try:
-        return _isinstancex(obj, tp, constraints)
+        if workers is not None:
+            valid = _isinstancex_threaded(obj, tp, constraints, workers)
+        elif budget is not None:
+            valid = _isinstancex_iterative(obj, tp, constraints, _Meter(budget))
+        elif _running_check.meter is not None:
+            # called by a handler (e.g. of a protocol) during a check with a budget
+            valid = _isinstancex_iterative(
+                obj, tp, constraints, _running_check.meter, _running_check.depth
+            )
+        elif iterative:
+            valid = _isinstancex_iterative(obj, tp, constraints)
+        else:
+            valid = _isinstancex(obj, tp, constraints)
+    except (AttributeError, TypeError):
+        valid = False
+
+    if cache:
+        _set_verified(obj, tp, constraints, valid)
+    return valid
+
+
+def isinstancex_many(
+    objs: Iterable[Any],
+    tp: TypeLike,
+    *,
+    constraints: Optional[Constraints] = None,
+    iterative: bool = False,
+    budget: Optional[Budget] = None,
+    workers: Optional[int] = None,
+) -> List[bool]:
+    """
+    Check many objects against the same type.
+    `tp` is resolved once for the whole batch instead of once per object.
+    The `budget` is shared by the whole batch.
+    With `workers`, the objects are split between as many threads, which only pays off
+    on free-threaded builds of python (e.g. 3.13t): with the GIL, pure python checks
+    do not run in parallel
+    """
+    _check_workers(workers, budget)
+    tp = _convert_shorthand(tp)
+
+    if workers is not None:
+        chunks = _split(list(objs), workers)
+        with ThreadPoolExecutor(workers) as pool:
+            results = pool.map(
+                lambda chunk: isinstancex_many(
+                    chunk, tp, constraints=constraints, iterative=iterative
+                ),
+                chunks,
+            )
+            return [valid for chunk_res in results for valid in chunk_res]
+
+    check: Callable[[Any], bool]
+    if budget is not None or iterative:
+        meter = _Meter(budget) if budget is not None else None
+        check = lambda obj: _isinstancex_iterative(obj, tp, constraints, meter)  # noqa: E731
+    else:
+        check = _resolve_check(tp, constraints)
+
+    objs = objs if isinstance(objs, list) else list(objs)
+    res: List[bool] = []
+    # the whole batch is checked in one `try` and an object that makes the check raise
+    # is invalid, like with `isinstancex`, before checking the next objects
+    while len(res) < len(objs):
+        try:
+            for obj in islice(objs, len(res), None):
+                res.append(check(obj))
+        except (AttributeError, TypeError):
+            res.append(False)
+    return res
+
+
+def _resolve_check(
+    tp: TypeLike, constraints: Optional[Constraints], *, nested: bool = True
+) -> Callable[[Any], bool]:
+    """
+    Resolve once how objects are checked against `tp`, like `_isinstancex` does per object.
+    With `nested=True`, the members of a union and the fields of a `TypedDict` are resolved too
+    (only one level deep, so recursive types are not resolved forever)
+    """
+    origin = get_origin(tp)
+    if origin is Annotated:
+        tp, constraints = get_args(tp)
+        tp = _convert_shorthand(tp)
+        origin = get_origin(tp)
+
+    if tp is Any:
+        return lambda obj: True
+
+    while is_newtype(tp):
+        tp = tp.__supertype__
+        origin = get_origin(tp)
+
+    # https://www.python.org/dev/peps/pep-0484/#using-none
+    if tp is None:
+        tp = NoneType
+
+    handler = _get_handler(tp, origin)
+    if nested and handler is _check_union:
+        return _resolve_union_check(tp, constraints)
+    if nested and handler is _check_typeddict:
+        return _resolve_typeddict_check(tp, constraints)
+    if handler is not None and handler is not _check_instance:
+        resolved_handler = handler
+        return lambda obj: resolved_handler(obj, tp, constraints)
+    if constraints is None:
+        return lambda obj: isinstance(obj, tp)
+    resolved_constraints = constraints
+    return lambda obj: isinstance(obj, tp) and resolved_constraints.is_valid(obj)
+
+
+def _resolve_union_check(tp: TypeLike, constraints: Optional[Constraints]) -> Callable[[Any], bool]:
+    checks = [_resolve_check(arg, constraints, nested=False) for arg in get_args(tp)]
+
+    def check_union(obj: Any) -> bool:
+        for check in checks:
+            # like `isinstancex`, a member that makes the check raise is not valid
+            try:
+                if check(obj):
+                    return True
+            except (AttributeError, TypeError):
+                pass
+        return False
+
+    return check_union
+
+
+def _resolve_typeddict_check(
+    tp: TypeLike, constraints: Optional[Constraints]
+) -> Callable[[Any], bool]:
+    plan = _get_typeddict_plan(cast(TypedDict, tp))
+    checks = {
+        key: _resolve_check(field_type, constraints, nested=False)
+        for key, field_type in plan.field_types.items()
+    }
+    rest_check = None
+    if plan.rest_type is not None:
+        rest_check = _resolve_check(plan.rest_type, constraints, nested=False)
+
+    # a field that makes the check raise makes the whole object invalid
+    def check_typeddict(obj: Any) -> bool:
+        if not plan.has_valid_keys(obj):
+            return False
+        for key, value in obj.items():
+            check = checks.get(key, rest_check)
+            if check is None or not check(value):
+                return False
+        return True
+
+    return check_typeddict
+
+
+def validate_update(
+    current: Dict[str, Any], patch: Dict[str, Any], tp: TypeLike, *, deleted: Iterable[str] = ()
+) -> bool:
+    """
+    Check that `current`, a valid `tp` (a `TypedDict`), is still valid once updated with `patch`
+    and without the `deleted` keys.
+    Only the keys and values of `patch` are checked, `current` is not walked again
+    """
+    tp = _convert_shorthand(tp)
+    try:
+        plan = _get_typeddict_plan(cast(TypedDict, tp))
+        if any(key in plan.required_keys and key not in patch for key in deleted):
+            return False
+
+        field_types, rest_type = plan.field_types, plan.rest_type
+        for key, value in patch.items():
+            if key in field_types:
+                value_type = field_types[key]
+            elif rest_type is not None:
+                value_type = rest_type
+            else:
+                return False
+            if not _isinstancex(value, value_type):
+                return False
+        return True
     except (AttributeError, TypeError):
         return False
 
@@ -112,133 +401,817 @@ def _isinstancex(obj: Any, tp: TypeLike, constraints: Optional[Constraints] = No
     if obj is None and tp in NONE_TYPES:
         return True
 
-    # convert
-    # - a plain dictionary to Dict or TypedDict
-    # - a plain list to Listx[...]
-    # - a plain tuple to Tuplex[...]
-    if origin is None:
-        # tp is of form `{'a': TypeLike, ...}`, `{...: TypeLike}`
-        if isinstance(tp, dict):
-            tp = {(TYPED_DICT_EXTRA_KEY if k is ... else k): v for k, v in tp.items()}
-            td = TypedDict("_TypedDict", tp)  # type: ignore[call-overload]
-            return isinstancex(obj, td, constraints=constraints)
-        elif isinstance(tp, list):
-            return isinstancex(obj, Listx[tuple(tp)], constraints=constraints)
-        elif isinstance(tp, tuple):
-            return isinstancex(obj, Tuplex[tuple(tp)], constraints=constraints)
+    if origin is None and isinstance(tp, (dict, list, tuple)):
+        return isinstancex(obj, _convert_shorthand(tp), constraints=constraints)
+
+    # generic types are handled based on their origin (e.g. `list` for `List[int]`)
+    # and other types based on themselves (e.g. a custom class or plain `Listx`)
+    handler = _get_handler(tp, origin)
+    if handler is not None:
+        return handler(obj, tp, constraints)
+
+    return isinstance(obj, tp) and (constraints is None or constraints.is_valid(obj))
+
 
+#######################################
+# handlers
+#######################################
+Handler = Callable[[Any, Any, Optional[Constraints]], bool]
+
+
+def register_handler(origin: Any, handler: Handler) -> None:
+    """
+    Register how objects are checked against types with origin `origin` (e.g. `list` for
+    `List[int]`) and against `origin` itself (e.g. a custom class) and its subclasses.
+    `handler(obj, tp, constraints)` should return whether `obj` is a valid `tp`
+    """
+    _ORIGIN_HANDLERS[origin] = handler
+    _TYPE_HANDLERS[origin] = handler
+
+    if isinstance(origin, type):
+        # the subclasses that have already been checked now inherit `handler`
+        with _CLASS_HANDLERS_LOCK:
+            for registry in (_CLASS_HANDLERS, _DYNAMIC_CLASS_HANDLERS):
+                for cls, cls_handler in list(registry.items()):
+                    if (
+                        cls_handler is _check_instance or isinstance(cls_handler, _SubclassHandler)
+                    ) and issubclass(cls, origin):
+                        registry.pop(cls, None)
+
+
+def _check_union(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
     # e.g. Union[str, int] (or str|int in 3.10)
-    if origin in UNION_TYPES:
-        return any(isinstancex(obj, arg, constraints=constraints) for arg in get_args(tp))
+    return any(isinstancex(obj, arg, constraints=constraints) for arg in get_args(tp))
+
 
+def _check_callable(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
     # e.g. Callable[[int], str]
-    elif origin is collections.abc.Callable:
-        if not callable(obj):
-            return False
+    if not callable(obj):
+        return False
 
-        expected_args_types, expected_return_type = get_args(tp) or (..., Any)
+    expected_args_types, expected_return_type = get_args(tp) or (..., Any)
 
-        if expected_args_types is ... and expected_return_type is Any:
-            return True
+    if expected_args_types is ... and expected_return_type is Any:
+        return True
 
-        args_types, return_type = _get_function_type_hints(obj)
+    args_types, return_type = _get_function_type_hints(obj)
 
-        if not issubclassx(return_type, expected_return_type):
-            return False
+    if not issubclassx(return_type, expected_return_type):
+        return False
 
-        if expected_args_types is ...:
-            return True
+    if expected_args_types is ...:
+        return True
 
-        return len(args_types) == len(expected_args_types) and all(
-            issubclassx(a_tp, e_tp) for (a_tp, e_tp) in zip(args_types, expected_args_types)
-        )
+    return len(args_types) == len(expected_args_types) and all(
+        issubclassx(a_tp, e_tp) for (a_tp, e_tp) in zip(args_types, expected_args_types)
+    )
 
+
+def _check_dict(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
     # e.g. Dict[str, int]
-    elif origin is dict:
-        if tp is Dict:
-            tp = Dict[Any, Any]
-        return isinstancex(obj, dict, constraints=constraints) and _is_valid_mapping(
-            obj, tp, constraints
-        )
+    if tp is Dict:
+        tp = Dict[Any, Any]
+    return isinstancex(obj, dict, constraints=constraints) and _is_valid_mapping(
+        obj, tp, constraints
+    )
 
+
+def _check_list(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
     # e.g. List[str] or Listx[int, str, ...]
-    elif origin is list:
-        # With recent python versions, `get_args` returns `(~T,)`, which we want to handle easily
-        if tp is List:
-            tp = List[Any]
+    # With recent python versions, `get_args` returns `(~T,)`, which we want to handle easily
+    if tp is List:
+        tp = List[Any]
+
+    name = getattr(tp, "_name", None) or getattr(tp, "__name__", None)
+
+    # e.g. List[Movie] or List[{'a': int, ...: str}]
+    if name != "Listx":
+        (item_type,) = get_args(tp)
+        if isinstance(item_type, dict):
+            item_type = _convert_shorthand(item_type)
+        if is_typeddict(item_type):
+            return isinstancex(obj, list, constraints=constraints) and _is_valid_typeddict_list(
+                obj, item_type
+            )
 
-        name = getattr(tp, "_name", None) or getattr(tp, "__name__", None)
+    # We consider Listx[int] to check if a list as ONLY ONE item
+    return isinstancex(obj, list, constraints=constraints) and _is_valid_sequence(
+        obj, tp, is_list=name != "Listx"
+    )
 
-        # We consider Listx[int] to check if a list as ONLY ONE item
-        return isinstancex(obj, list, constraints=constraints) and _is_valid_sequence(
-            obj, tp, is_list=name != "Listx"
-        )
 
-    # e.g. Set[str]
-    elif origin is set:
-        # With recent python versions, `get_args` returns `(~T,)`, which we want to handle easily
-        if tp is Set:
-            tp = Set[Any]
+def _check_set(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
+    # e.g. Set[str], FrozenSet[str] or AbstractSet[str]
+    # With recent python versions, `get_args` returns `(~T,)`, which we want to handle easily
+    if tp is Set:
+        tp = Set[Any]
 
-        return isinstancex(obj, set, constraints=constraints) and all(
-            isinstancex(x, Union[get_args(tp)]) for x in obj
-        )
+    items_type: TypeLike = Union[get_args(tp) or (Any,)]
+    return isinstancex(obj, get_origin(tp), constraints=constraints) and _is_valid_items(
+        obj, items_type
+    )
+
+
+def _check_mutable_sequence(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
+    # e.g. Deque[str]
+    return isinstancex(obj, get_origin(tp), constraints=constraints) and _is_valid_sequence(
+        obj, tp, is_list=True
+    )
+
+
+def _check_mutable_mapping(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
+    # e.g. DefaultDict[str, int] or OrderedDict[str, int]
+    return isinstancex(obj, get_origin(tp), constraints=constraints) and _is_valid_mapping(
+        obj, tp, constraints
+    )
+
+
+def _check_counter(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
+    # e.g. Counter[str]
+    return isinstancex(obj, collections.Counter, constraints=constraints) and _is_valid_mapping(
+        obj, tp, constraints
+    )
 
+
+def _check_iterable(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
+    # e.g. Iterable[str]
+    if not isinstancex(obj, get_origin(tp), constraints=constraints):
+        return False
+
+    # an iterator would be consumed by the check (see `func_check` to check it lazily)
+    if iter(obj) is obj:
+        return True
+
+    items_type = get_args(tp)[0] if get_args(tp) else Any
+    return all(isinstancex(x, items_type) for x in obj)
+
+
+def _check_tuple(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
     # e.g. Tuple[int, ...] or Tuplex[int, str, ...]
-    elif origin is tuple:
-        return isinstancex(obj, tuple, constraints=constraints) and _is_valid_sequence(
-            obj, tp, is_list=False
-        )
+    return isinstancex(obj, tuple, constraints=constraints) and _is_valid_sequence(
+        obj, tp, is_list=False
+    )
+
 
+def _check_type(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
     # e.g. Type[int]
-    elif origin is type:
-        return issubclassx(obj, Union[get_args(tp)])
+    return issubclassx(obj, Union[get_args(tp)])
+
+
+def _check_instance(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
+    # e.g. `int` or a custom class, kept in `_CLASS_HANDLERS` once the predicates are run
+    return isinstance(obj, tp) and (constraints is None or constraints.is_valid(obj))
 
+
+class _SubclassHandler:
+    """Handler of a subclass of a class with a registered handler (see `register_handler`)"""
+
+    __slots__ = ("handler",)
+
+    def __init__(self, handler: Handler) -> None:
+        self.handler = handler
+
+    def __call__(self, obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
+        # the handler of the base class may only check that `obj` is an instance of the base class
+        return isinstance(obj, tp) and self.handler(obj, tp, constraints)
+
+
+def _get_subclass_handler(cls: type) -> Optional[Handler]:
+    # only the handlers registered with `register_handler` are inherited (e.g. a subclass of
+    # `dict` is not a `Dict`)
+    for base in cls.__mro__[1:]:
+        if base in _ORIGIN_HANDLERS and base not in NATIVE_ORIGINS:
+            return _SubclassHandler(_ORIGIN_HANDLERS[base])
+    return None
+
+
+def _check_typeddict(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
     # e.g. TypedDict('Movie', {'name': str, 'year': int})
-    elif is_typeddict(tp):
-        tp = cast(TypedDict, tp)
-        return _is_valid_typeddict(obj, tp, constraints)
+    return _is_valid_typeddict(obj, cast(TypedDict, tp), constraints)
+
 
+def _check_typeddict_qualifier(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
     # `TypedDict` type qualifiers `Required` and `NotRequired`
     # (see https://www.python.org/dev/peps/pep-0655/)
-    elif typing_extensions and origin in {
-        typing_extensions.NotRequired,
-        typing_extensions.Required,
-    }:
-        return any(isinstancex(obj, t) for t in get_args(tp))
+    return any(isinstancex(obj, t) for t in get_args(tp))
 
+
+def _check_literal(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
     # e.g. Literal['Pika']
-    elif is_literal(tp):
-        values_to_check = get_args(obj) if is_literal(obj) else (obj,)
-        return all(v in get_args(tp) for v in values_to_check)
-
-    # e.g. Collection[int]
-    elif origin is collections.abc.Collection:
-        return _is_valid_sequence(obj, tp, is_list=True) and (
-            constraints is None or constraints.is_valid(obj)
-        )
+    values_to_check = get_args(obj) if is_literal(obj) else (obj,)
+    return all(v in get_args(tp) for v in values_to_check)
 
-    # e.g. Sequence[int]
-    elif origin is collections.abc.Sequence:
-        return _is_valid_sequence(obj, tp, is_list=True) and (
-            constraints is None or constraints.is_valid(obj)
-        )
 
-    # e.g. Maping[str, int]
-    elif origin is collections.abc.Mapping:
-        return _is_valid_mapping(obj, tp, constraints)
+def _check_collection(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
+    # e.g. Collection[int] or Sequence[int]
+    return _is_valid_sequence(obj, tp, is_list=True) and (
+        constraints is None or constraints.is_valid(obj)
+    )
+
+
+def _check_mapping(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
+    # e.g. Mapping[str, int]
+    return _is_valid_mapping(obj, tp, constraints)
+
+
+def _check_plain_listx(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
+    return _isinstancex(obj, list, constraints)
+
+
+def _check_plain_tuplex(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
+    return _isinstancex(obj, tuple, constraints)
 
-    # plain `Listx`
-    elif tp is Listx:
-        tp = list
 
-    # plain `Tuplex`
-    elif tp is Tuplex:
-        tp = tuple
+def _is_protocol(tp: TypeLike) -> bool:
+    """Check if `tp` is a protocol, runtime checkable or not, parameterized or not"""
+    cls = get_origin(tp) or tp
+    return (
+        isinstance(cls, type) and getattr(cls, "_is_protocol", False) and cls.__name__ != "Protocol"
+    )
+
+
+def _check_protocol(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
+    # e.g. `SupportsClose` with `class SupportsClose(Protocol)`
+    plan = _get_protocol_plan(tp)
+    if not plan.has_compatible_methods(type(obj)):
+        return False
+    if constraints is not None and not constraints.is_valid(obj):
+        return False
+    # data members are attributes of the instance that have to be checked each time
+    return all(isinstancex(getattr(obj, name), t) for name, t in plan.attributes)
+
 
+def _is_user_generic(tp: TypeLike) -> bool:
+    """Check if `tp` is a parameterized generic class that is not defined by python (e.g. `List`)"""
+    cls = get_origin(tp)
+    return (
+        isinstance(cls, type)
+        and issubclass(cls, Generic)  # type: ignore[arg-type]
+        and cls.__module__ not in NATIVE_GENERIC_MODULES
+    )
+
+
+def _check_user_generic(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
+    # e.g. Box[int] with `class Box(Generic[T])`
+    origin = get_origin(tp)
+    if not _is_valid_container(obj, origin, constraints):
+        return False
+
+    attribute_types, items_type = _get_generic_plan(origin).resolve(tp)
+    if not all(isinstancex(getattr(obj, name), t) for name, t in attribute_types):
+        return False
+
+    # an iterator would be consumed by the check
+    if items_type is not None and iter(obj) is not obj:
+        return all(isinstancex(x, items_type) for x in obj)
+    return True
+
+
+# handlers of generic types by origin
+_ORIGIN_HANDLERS: Dict[Any, Handler] = {
+    **{union_type: _check_union for union_type in UNION_TYPES},
+    collections.abc.Callable: _check_callable,
+    dict: _check_dict,
+    list: _check_list,
+    **{set_origin: _check_set for set_origin in {set, *SET_ORIGINS}},
+    **{seq_origin: _check_mutable_sequence for seq_origin in SEQUENCE_ORIGINS},
+    **{mapping_origin: _check_mutable_mapping for mapping_origin in MAPPING_ORIGINS},
+    collections.Counter: _check_counter,
+    **{iterator_origin: _check_iterable for iterator_origin in ITERATOR_ORIGINS},
+    tuple: _check_tuple,
+    type: _check_type,
+    Literal: _check_literal,
+    collections.abc.Collection: _check_collection,
+    collections.abc.Sequence: _check_collection,
+    collections.abc.Mapping: _check_mapping,
+}
+if typing_extensions:
+    _ORIGIN_HANDLERS[typing_extensions.NotRequired] = _check_typeddict_qualifier
+    _ORIGIN_HANDLERS[typing_extensions.Required] = _check_typeddict_qualifier
+
+# origins handled by `typingx` itself, whose handlers are not inherited by subclasses
+NATIVE_ORIGINS = frozenset(_ORIGIN_HANDLERS)
+
+# handlers of non generic types
+_TYPE_HANDLERS: Dict[Any, Handler] = {
+    Listx: _check_plain_listx,
+    Tuplex: _check_plain_tuplex,
+}
+
+# handlers found for the other classes once the predicates are run (e.g. `int` or a `TypedDict`)
+# if they live as long as their module...
+_CLASS_HANDLERS: Dict[type, Handler] = {}
+# ...or else kept weakly since they can be created on the fly (e.g. by `_convert_shorthand`)
+_DYNAMIC_CLASS_HANDLERS: "weakref.WeakKeyDictionary[type, Handler]" = weakref.WeakKeyDictionary()
+# handlers are read without lock but a `WeakKeyDictionary` cannot be updated by many threads at once
+_CLASS_HANDLERS_LOCK = threading.Lock()
+
+# handlers of types that cannot be found by origin
+_PREDICATE_HANDLERS: List[Tuple[Callable[[Any], bool], Handler]] = [
+    (is_typeddict, _check_typeddict),
+    # before user generic classes since protocols can also be generic
+    (_is_protocol, _check_protocol),
+    (_is_user_generic, _check_user_generic),
+]
+
+
+#######################################
+# iterative engine
+#######################################
+# An object to check against a type with some constraints
+Task = Tuple[Any, Any, Optional[Constraints]]
+# `expander(obj, tp, constraints)` returns `None` if `obj` itself is not a valid `tp`
+# or else the items of `obj` that still need to be checked
+Expander = Callable[[Any, Any, Optional[Constraints]], Optional[Iterable[Task]]]
+
+# a `Union` being checked: index in the stack of the iterator of the member being checked,
+# object, constraints and members left to try if this one is not valid
+_Choice = Tuple[int, Any, Optional[Constraints], Iterator[TypeLike]]
+
+
+class _Meter:
+    """What has been spent of a `Budget` so far"""
+
+    __slots__ = ("budget", "deadline", "elements")
+
+    # the clock is only read every `DEADLINE_CHECK_INTERVAL` elements
+    DEADLINE_CHECK_INTERVAL = 64
+
+    def __init__(self, budget: Budget) -> None:
+        self.budget = budget
+        self.deadline = None if budget.timeout is None else time.monotonic() + budget.timeout
+        self.elements = 0
+
+    def visit(self, depth: int) -> None:
+        budget = self.budget
+        self.elements += 1
+
+        if budget.max_elements is not None and self.elements > budget.max_elements:
+            raise BudgetExceeded(budget, f"more than {budget.max_elements} elements")
+        if budget.max_depth is not None and depth > budget.max_depth:
+            raise BudgetExceeded(budget, f"deeper than {budget.max_depth} levels")
+        if (
+            self.deadline is not None
+            and self.elements % self.DEADLINE_CHECK_INTERVAL == 0
+            and time.monotonic() > self.deadline
+        ):
+            raise BudgetExceeded(budget, f"longer than {budget.timeout}s")
+
+
+def _isinstancex_iterative(
+    obj: Any,
+    tp: TypeLike,
+    constraints: Optional[Constraints] = None,
+    meter: Optional[_Meter] = None,
+    depth: int = 0,
+) -> bool:
+    """
+    Same as `_isinstancex` but the items of the containers are pushed on a stack instead of
+    being checked with recursive calls: the python stack stays the same whatever the depth of
+    `obj` and the stack only keeps one iterator of items per level.
+    The members of a `Union` are pushed on the same stack one at a time: when the member being
+    checked turns out invalid, its part of the stack is dropped and the next member is tried.
+    Each element is accounted in the `meter` if any, including the ones checked by handlers
+    without expander (e.g. custom handlers), whose `isinstancex` calls then use the same meter
+    """
+    stack: List[Iterator[Task]] = [iter(((obj, tp, constraints),))]
+    choices: List[_Choice] = []
+
+    while stack:
+        try:
+            task = next(stack[-1], None)
+            if task is None:
+                stack.pop()
+                if choices and choices[-1][0] == len(stack):
+                    # all the items of the member have been checked: the union is valid
+                    choices.pop()
+                continue
+
+            if meter is not None:
+                # the iterators of the union members are not levels of `obj`
+                meter.visit(depth + len(stack) - len(choices) - 1)
+
+            obj, tp, constraints = task
+            origin = get_origin(tp)
+
+            if origin is Annotated:
+                tp, constraints = get_args(tp)
+                origin = get_origin(tp)
+
+            if tp is Any:
+                continue
+
+            while is_newtype(tp):
+                tp = tp.__supertype__
+
+            if obj is None and tp in NONE_TYPES:
+                continue
+
+            if origin is None and isinstance(tp, (dict, list, tuple)):
+                tp = _convert_shorthand(tp)
+                origin = get_origin(tp)
+
+            handler = _get_handler(tp, origin)
+            if handler is None:
+                valid = isinstance(obj, tp) and (constraints is None or constraints.is_valid(obj))
+            elif handler is _check_union or handler is _check_typeddict_qualifier:
+                # e.g. Union[str, int], whose first member is checked right away
+                # (`Required` and `NotRequired` do not forward the constraints)
+                if handler is _check_typeddict_qualifier:
+                    constraints = None
+                members = iter(get_args(tp))
+                choices.append((len(stack), obj, constraints, members))
+                stack.append(iter(((obj, next(members), constraints),)))
+                continue
+            else:
+                expander = _EXPANDERS.get(handler)
+                if meter is not None:
+                    # the checks made by the handler or the expander themselves (e.g. of a
+                    # protocol or of `Listx[int, ..., str]`) are accounted one level deeper
+                    item_depth = depth + len(stack) - len(choices)
+                if expander is None:
+                    # no container to walk (e.g. `Literal`, `Callable`) or custom handler
+                    if meter is None:
+                        valid = handler(obj, tp, constraints)
+                    else:
+                        valid = _call_metered(handler, obj, tp, constraints, meter, item_depth)
+                else:
+                    if meter is None:
+                        items = expander(obj, tp, constraints)
+                    else:
+                        items = _call_metered(expander, obj, tp, constraints, meter, item_depth)
+                    valid = items is not None
+                    if items is not None:
+                        stack.append(iter(items))
+        except (AttributeError, TypeError):
+            # like with `isinstancex`, a union member that makes the check raise is not valid
+            if not choices:
+                raise
+            valid = False
+
+        if not valid and not _backtrack(stack, choices):
+            return False
+
+    return True
+
+
+def _backtrack(stack: List[Iterator[Task]], choices: List[_Choice]) -> bool:
+    """Replace the invalid union member on the stack by the next one if there is any left"""
+    while choices:
+        index, obj, constraints, members = choices[-1]
+        del stack[index:]
+        for member in members:
+            stack.append(iter(((obj, member, constraints),)))
+            return True
+        # no member left: the union itself is invalid
+        choices.pop()
+    return False
+
+
+R = TypeVar("R")
+
+
+class _RunningCheck(threading.local):
+    """Meter of the check with a budget running in the current thread, if any"""
+
+    meter: Optional[_Meter] = None
+    depth = 0
+
+
+_running_check = _RunningCheck()
+
+
+def _call_metered(
+    func: Callable[[Any, Any, Optional[Constraints]], R],
+    obj: Any,
+    tp: TypeLike,
+    constraints: Optional[Constraints],
+    meter: _Meter,
+    depth: int,
+) -> R:
+    """Call a handler or an expander so the `isinstancex` calls it makes use the `meter`"""
+    previous = _running_check.meter, _running_check.depth
+    _running_check.meter, _running_check.depth = meter, depth
+    try:
+        return func(obj, tp, constraints)
+    finally:
+        _running_check.meter, _running_check.depth = previous
+
+
+def _get_handler(tp: TypeLike, origin: Any) -> Optional[Handler]:
+    if origin is not None:
+        handler = _ORIGIN_HANDLERS.get(origin)
+    else:
+        handler = _TYPE_HANDLERS.get(tp) or _CLASS_HANDLERS.get(tp)
+        if handler is None and isinstance(tp, type):
+            handler = _DYNAMIC_CLASS_HANDLERS.get(tp)
+    if handler is not None:
+        return handler
+
+    handler = next((h for predicate, h in _PREDICATE_HANDLERS if predicate(tp)), None)
+    if origin is None and isinstance(tp, type):
+        # the predicates only run once per class (e.g. `int` or a `TypedDict`)
+        handler = handler or _get_subclass_handler(tp) or _check_instance
+        registry = _CLASS_HANDLERS if _is_module_level(tp) else _DYNAMIC_CLASS_HANDLERS
+        with _CLASS_HANDLERS_LOCK:
+            handler = registry.setdefault(tp, handler)
+    return handler
+
+
+def _is_module_level(cls: type) -> bool:
+    # e.g. `int` or a class defined at the top level of a module
+    return getattr(sys.modules.get(cls.__module__), cls.__qualname__, None) is cls
+
+
+def _is_valid_container(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
     return isinstance(obj, tp) and (constraints is None or constraints.is_valid(obj))
 
 
+def _items(
+    values: Iterable[Any], tp: TypeLike, constraints: Optional[Constraints] = None
+) -> Iterable[Task]:
+    return zip(values, repeat(tp), repeat(constraints))
+
+
+def _expand_sequence(
+    obj: Any,
+    tp: TypeLike,
+    constraints: Optional[Constraints],
+    container: Optional[type],
+    *,
+    is_list: bool,
+) -> Optional[Iterable[Task]]:
+    if container is not None and not _is_valid_container(obj, container, constraints):
+        return None
+
+    if len(obj) == 0:
+        return ()
+
+    expected_types = get_args(tp) or (Any, ...)
+    if is_list and len(expected_types) == 1:
+        expected_types += (...,)
+
+    # e.g. List[int] or Tuple[int, ...]
+    if len(expected_types) == 2 and expected_types[1] is ...:
+        return _items(obj, expected_types[0])
+
+    # e.g. Tuple[int, str]
+    if ... not in expected_types:
+        return zip(obj, expected_types, repeat(None)) if len(obj) == len(expected_types) else None
+
+    # e.g. Listx[int, ..., str]: the type of an item depends on the previous ones
+    return () if _is_valid_sequence(obj, tp, is_list=is_list) else None
+
+
+def _expand_list(
+    obj: Any, tp: TypeLike, constraints: Optional[Constraints]
+) -> Optional[Iterable[Task]]:
+    if tp is List:
+        tp = List[Any]
+    # We consider Listx[int] to check if a list as ONLY ONE item
+    is_list = (getattr(tp, "_name", None) or getattr(tp, "__name__", None)) != "Listx"
+    return _expand_sequence(obj, tp, constraints, list, is_list=is_list)
+
+
+def _expand_tuple(
+    obj: Any, tp: TypeLike, constraints: Optional[Constraints]
+) -> Optional[Iterable[Task]]:
+    return _expand_sequence(obj, tp, constraints, tuple, is_list=False)
+
+
+def _expand_mutable_sequence(
+    obj: Any, tp: TypeLike, constraints: Optional[Constraints]
+) -> Optional[Iterable[Task]]:
+    return _expand_sequence(obj, tp, constraints, get_origin(tp), is_list=True)
+
+
+def _expand_collection(
+    obj: Any, tp: TypeLike, constraints: Optional[Constraints]
+) -> Optional[Iterable[Task]]:
+    if constraints is not None and not constraints.is_valid(obj):
+        return None
+    return _expand_sequence(obj, tp, None, None, is_list=True)
+
+
+def _expand_set(
+    obj: Any, tp: TypeLike, constraints: Optional[Constraints]
+) -> Optional[Iterable[Task]]:
+    if tp is Set:
+        tp = Set[Any]
+    if not _is_valid_container(obj, get_origin(tp), constraints):
+        return None
+    return _items(obj, Union[get_args(tp) or (Any,)])
+
+
+def _expand_mapping(
+    obj: Any, tp: TypeLike, constraints: Optional[Constraints], container: Optional[type]
+) -> Optional[Iterable[Task]]:
+    if container is not None and not _is_valid_container(obj, container, constraints):
+        return None
+    keys_type, values_type = _get_mapping_args(tp)
+    return chain(
+        _items(obj.keys(), keys_type, constraints),
+        _items(obj.values(), values_type, constraints),
+    )
+
+
+def _expand_dict(
+    obj: Any, tp: TypeLike, constraints: Optional[Constraints]
+) -> Optional[Iterable[Task]]:
+    return _expand_mapping(obj, tp, constraints, dict)
+
+
+def _expand_mutable_mapping(
+    obj: Any, tp: TypeLike, constraints: Optional[Constraints]
+) -> Optional[Iterable[Task]]:
+    return _expand_mapping(obj, tp, constraints, get_origin(tp))
+
+
+def _expand_abstract_mapping(
+    obj: Any, tp: TypeLike, constraints: Optional[Constraints]
+) -> Optional[Iterable[Task]]:
+    return _expand_mapping(obj, tp, constraints, None)
+
+
+def _expand_counter(
+    obj: Any, tp: TypeLike, constraints: Optional[Constraints]
+) -> Optional[Iterable[Task]]:
+    return _expand_mapping(obj, tp, constraints, collections.Counter)
+
+
+def _expand_iterable(
+    obj: Any, tp: TypeLike, constraints: Optional[Constraints]
+) -> Optional[Iterable[Task]]:
+    if not _is_valid_container(obj, get_origin(tp), constraints):
+        return None
+    # an iterator would be consumed by the check (see `func_check` to check it lazily)
+    if iter(obj) is obj:
+        return ()
+    return _items(obj, get_args(tp)[0] if get_args(tp) else Any)
+
+
+def _expand_typeddict(
+    obj: Any, tp: TypeLike, constraints: Optional[Constraints]
+) -> Optional[Iterable[Task]]:
+    plan = _get_typeddict_plan(cast(TypedDict, tp))
+    if not plan.has_valid_keys(obj):
+        return None
+
+    field_types, rest_type = plan.field_types, plan.rest_type
+    return (
+        (v, field_types[k] if k in field_types else rest_type, constraints) for k, v in obj.items()
+    )
+
+
+# how the items of the containers are pushed on the stack, by handler of their type
+_EXPANDERS: Dict[Handler, Expander] = {
+    _check_dict: _expand_dict,
+    _check_list: _expand_list,
+    _check_tuple: _expand_tuple,
+    _check_set: _expand_set,
+    _check_mutable_sequence: _expand_mutable_sequence,
+    _check_mutable_mapping: _expand_mutable_mapping,
+    _check_counter: _expand_counter,
+    _check_collection: _expand_collection,
+    _check_mapping: _expand_abstract_mapping,
+    _check_iterable: _expand_iterable,
+    _check_typeddict: _expand_typeddict,
+}
+
+
+#######################################
+# verified objects
+#######################################
+VERIFIED_CACHE_MAX_SIZE = 4096
+# exact types of the values that cannot be mutated
+IMMUTABLE_TYPES = {bool, bytes, complex, float, int, str, NoneType, type(...)}
+
+# results of the checks of deeply immutable objects by (id of the object, type, constraints).
+# The object is kept in the cache so its `id` cannot be reused by another object.
+# Entries are set and read with single dict operations so it can be shared by threads
+_VERIFIED_OBJECTS: Dict[Tuple[int, Any, Any], Tuple[Any, bool]] = {}
+
+
+def _get_verified(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> Optional[bool]:
+    try:
+        cached_obj, valid = _VERIFIED_OBJECTS[(id(obj), tp, constraints)]
+    except (KeyError, TypeError):  # not cached or type that cannot be hashed
+        return None
+    return valid if cached_obj is obj else None
+
+
+def _set_verified(obj: Any, tp: TypeLike, constraints: Optional[Constraints], valid: bool) -> None:
+    # scalars are checked faster than they are cached
+    if type(obj) in IMMUTABLE_TYPES or not _is_deeply_immutable(obj):
+        return
+
+    if len(_VERIFIED_OBJECTS) >= VERIFIED_CACHE_MAX_SIZE:
+        _VERIFIED_OBJECTS.clear()
+    try:
+        _VERIFIED_OBJECTS[(id(obj), tp, constraints)] = (obj, valid)
+    except TypeError:  # type that cannot be hashed
+        pass
+
+
+def _is_deeply_immutable(obj: Any) -> bool:
+    """
+    Check if `obj` and all its items can never be mutated (scalars, tuples, `NamedTuple`s,
+    frozensets and frozen dataclasses), which means that its check result can never change
+    """
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if type(obj) in IMMUTABLE_TYPES:
+            continue
+        elif type(obj) is frozenset or (isinstance(obj, tuple) and not hasattr(obj, "__dict__")):
+            stack.extend(obj)
+        elif is_dataclass(obj) and type(obj).__dataclass_params__.frozen:
+            stack.extend(getattr(obj, f.name) for f in fields(obj))
+        else:
+            return False
+    return True
+
+
+#######################################
+# threads
+#######################################
+# number of chunks per worker, so a thread that is done early can take another chunk
+CHUNKS_PER_WORKER = 4
+
+
+def _check_workers(workers: Optional[int], budget: Optional[Budget]) -> None:
+    if workers is not None and workers < 1:
+        raise ValueError(f"`workers` must be at least 1 but got {workers}")
+    if workers is not None and budget is not None:
+        raise ValueError("`workers` and `budget` cannot be used together")
+
+
+def _split(items: List[Any], workers: int) -> List[List[Any]]:
+    size = -(-len(items) // (workers * CHUNKS_PER_WORKER)) or 1
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _isinstancex_threaded(
+    obj: Any, tp: TypeLike, constraints: Optional[Constraints], workers: int
+) -> bool:
+    """
+    Check the items of a container in `workers` threads.
+    The resolved types and plans are shared by all the threads without any copy, which only
+    pays off on free-threaded builds of python (e.g. 3.13t) where threads run in parallel
+    """
+    origin = get_origin(tp)
+    if origin is Annotated:
+        tp, constraints = get_args(tp)
+        origin = get_origin(tp)
+
+    if origin is None and isinstance(tp, (dict, list, tuple)):
+        tp = _convert_shorthand(tp)
+        origin = get_origin(tp)
+
+    expander = _EXPANDERS.get(_get_handler(tp, origin))  # type: ignore[arg-type]
+    if expander is None:
+        # not a container
+        return _isinstancex(obj, tp, constraints)
+
+    items = expander(obj, tp, constraints)
+    if items is None:
+        return False
+
+    # stop all the threads as soon as an invalid item is found
+    failed = threading.Event()
+
+    def check_chunk(chunk: List[Task]) -> bool:
+        for item, item_tp, item_constraints in chunk:
+            if failed.is_set():
+                return False
+            if not isinstancex(item, item_tp, constraints=item_constraints):
+                failed.set()
+                return False
+        return True
+
+    with ThreadPoolExecutor(workers) as pool:
+        return all(pool.map(check_chunk, _split(list(items), workers)))
+
+
+def _convert_shorthand(tp: Any) -> TypeLike:
+    """
+    Convert
+    - a plain dictionary to Dict or TypedDict
+    - a plain list to Listx[...]
+    - a plain tuple to Tuplex[...]
+    """
+    # tp is of form `{'a': TypeLike, ...}`, `{...: TypeLike}`
+    if isinstance(tp, dict):
+        tp = {(TYPED_DICT_EXTRA_KEY if k is ... else k): v for k, v in tp.items()}
+        return TypedDict("_TypedDict", tp)  # type: ignore[call-overload]
+    elif isinstance(tp, list):
+        return Listx[tuple(tp)]
+    elif isinstance(tp, tuple):
+        return Tuplex[tuple(tp)]
+    else:
+        return tp
+
+
 def _issubclassx(obj: Any, tp: TypeLike) -> bool:
     if tp is Any:
         return True
@@ -277,8 +1250,16 @@ def _issubclassx(obj: Any, tp: TypeLike) -> bool:
 #######################################
 # get_args
 #######################################
+def _get_mapping_args(tp: TypeLike) -> Tuple[TypeLike, TypeLike]:
+    """Types of the keys and values of a mapping type (e.g. `(str, int)` for `Counter[str]`)"""
+    if get_origin(tp) is collections.Counter:
+        return (get_args(tp) or (Any,))[0], int
+    keys_type, values_type = get_args(tp) or (Any, Any)
+    return keys_type, values_type
+
+
 def _is_valid_mapping(obj: Any, tp: TypeLike, constraints: Optional[Constraints]) -> bool:
-    keys_type, values_type = get_args(tp)
+    keys_type, values_type = _get_mapping_args(tp)
     return all(isinstancex(key, keys_type, constraints=constraints) for key in obj.keys()) and all(
         isinstancex(value, values_type, constraints=constraints) for value in obj.values()
     )
@@ -298,6 +1279,10 @@ def _is_valid_sequence(obj: Any, tp: TypeLike, *, is_list: bool) -> bool:
     if is_list and len(expected_types) == 1:
         expected_types += (...,)
 
+    # e.g. List[int] or Tuple[int, ...]
+    if len(expected_types) == 2 and expected_types[1] is ...:
+        return _is_valid_items(obj, expected_types[0])
+
     current_index = 0
     for item in obj:
 
@@ -324,14 +1309,130 @@ def _is_valid_sequence(obj: Any, tp: TypeLike, *, is_list: bool) -> bool:
         return expected_types[current_index:] in ((), (...,))
 
 
-def _is_valid_typeddict(obj: Any, tp: TypedDict, constraints: Optional[Constraints]) -> bool:
-    # ensure it's a dict that contains all the required keys but extra values are allowed
-    resolved_annotations = get_type_hints(tp)
+def _is_valid_items(items: Iterable[Any], tp: TypeLike) -> bool:
+    """Check that all the items of a container are valid `tp`"""
+    plan = _get_items_plan(tp)
+    if plan is not None:
+        valid = plan.is_valid(items)
+        if valid is not None:
+            return valid
+    return all(isinstancex(x, tp) for x in items)
+
+
+def _has_bounds(constraints: Constraints) -> bool:
+    return any(
+        bound is not None
+        for bound in (constraints.ge, constraints.gt, constraints.le, constraints.lt)
+    )
+
+
+def _has_string_constraints(constraints: Constraints) -> bool:
+    return any(
+        constraint is not None
+        for constraint in (constraints.min_length, constraints.max_length, constraints.regex)
+    )
+
+
+def _is_valid_bounds(min_value: Any, max_value: Any, constraints: Constraints) -> bool:
+    """Check the bounds of many values with only their min and max"""
+    ge, gt, le, lt = constraints.ge, constraints.gt, constraints.le, constraints.lt
+    return not (
+        (ge is not None and min_value < ge)
+        or (gt is not None and min_value <= gt)
+        or (le is not None and max_value > le)
+        or (lt is not None and max_value >= lt)
+    )
+
+
+def _is_valid_lengths(min_length: int, max_length: int, constraints: Constraints) -> bool:
+    return not (
+        (constraints.min_length is not None and min_length < constraints.min_length)
+        or (constraints.max_length is not None and max_length > constraints.max_length)
+    )
+
+
+@dataclass(frozen=True)
+class _ItemsPlan:
+    """
+    How the items of a container of constrained scalars (e.g. `List[Annotated[int, ...]]`)
+    are checked all at once: a scan of their types and then their min and max
+    (or the min and max of their lengths) instead of checking the constraints item by item
+    """
+
+    item_type: type
+    constraints: Constraints
+
+    def is_valid(self, items: Iterable[Any]) -> Optional[bool]:
+        """Return `None` if the items cannot be checked all at once (e.g. a `bool` in ints)"""
+        if not _is_plain_class(self.item_type) or set(map(type, items)) != {self.item_type}:
+            return None
+
+        if self.item_type is str:
+            lengths = list(map(len, items))
+            return _is_valid_lengths(min(lengths), max(lengths), self.constraints)
+        return _is_valid_bounds(min(items), max(items), self.constraints)
+
+
+# plans by item type, `None` for the types whose items are checked one by one
+_ITEMS_PLANS: Dict[Any, Optional[_ItemsPlan]] = {}
+
+
+def _get_items_plan(tp: TypeLike) -> Optional[_ItemsPlan]:
+    try:
+        return _ITEMS_PLANS[tp]
+    except KeyError:
+        pass
+    except TypeError:  # e.g. shortcut `{'a': int}` cannot be hashed
+        return None
+
+    plan = None
+    item_type, constraints = get_args(tp) if get_origin(tp) is Annotated else (tp, None)
+    # `multiple_of` and `regex` can only be checked item by item
+    if isinstance(constraints, Constraints) and (
+        constraints.multiple_of is None and constraints.regex is None
+    ):
+        if item_type is int and not _has_string_constraints(constraints):
+            plan = _ItemsPlan(int, constraints)
+        elif item_type is str and not _has_bounds(constraints):
+            plan = _ItemsPlan(str, constraints)
+
+    # if another thread resolved the same plan meanwhile, its plan is kept
+    return _ITEMS_PLANS.setdefault(tp, plan)
+
+
+@dataclass(frozen=True)
+class _TypedDictPlan:
+    """Everything needed to check a `TypedDict`, resolved once per `TypedDict`"""
+
+    field_types: Dict[str, TypeLike]
+    required_keys: FrozenSet[str]
+    declared_keys: FrozenSet[str]
+    # type of the keys that are not declared (`__extra__`) or `None` if they are forbidden
+    rest_type: Optional[TypeLike]
+
+    def has_valid_keys(self, obj: Any) -> bool:
+        keys = obj.keys()
+        return keys >= self.required_keys and (
+            self.rest_type is not None or keys <= self.declared_keys
+        )
+
+
+_TYPEDDICT_PLANS: "weakref.WeakKeyDictionary[Any, _TypedDictPlan]" = weakref.WeakKeyDictionary()
+# plans are read without lock but a `WeakKeyDictionary` cannot be updated by many threads at once
+_TYPEDDICT_PLANS_LOCK = threading.Lock()
+
+
+def _get_typeddict_plan(tp: TypedDict) -> _TypedDictPlan:
+    try:
+        return _TYPEDDICT_PLANS[tp]
+    except KeyError:
+        pass
+
+    resolved_annotations = get_type_hints(tp, include_extras=True)
 
     # update required keys and optional keys with new PEP 655 type qualifiers
     # (see https://www.python.org/dev/peps/pep-0655/)
     required_keys = set(tp.__required_keys__)
-    optional_keys = set(tp.__optional_keys__)
     try:
         from typing_extensions import NotRequired, Required
     except ImportError:  # pragma: no cover
@@ -340,38 +1441,318 @@ def _is_valid_typeddict(obj: Any, tp: TypedDict, constraints: Optional[Constrain
         for key in tp.__required_keys__:
             if get_origin(resolved_annotations[key]) is NotRequired:
                 required_keys.discard(key)
-                optional_keys.add(key)
         for key in tp.__optional_keys__:
             if get_origin(resolved_annotations[key]) is Required:
-                optional_keys.discard(key)
                 required_keys.add(key)
 
-    if TYPED_DICT_EXTRA_KEY in resolved_annotations:
-        rest_type = resolved_annotations.pop(TYPED_DICT_EXTRA_KEY)
-        required_keys -= {TYPED_DICT_EXTRA_KEY}
-        if not set(obj).issuperset(required_keys):
-            return False
+    rest_type = resolved_annotations.pop(TYPED_DICT_EXTRA_KEY, None)
+    required_keys.discard(TYPED_DICT_EXTRA_KEY)
+
+    from .normalize import normalize
+
+    plan = _TypedDictPlan(
+        field_types={key: normalize(tp) for key, tp in resolved_annotations.items()},
+        required_keys=frozenset(required_keys),
+        declared_keys=frozenset(resolved_annotations),
+        rest_type=None if rest_type is None else normalize(rest_type),
+    )
+    with _TYPEDDICT_PLANS_LOCK:
+        # if another thread resolved the same plan meanwhile, its plan is kept
+        return _TYPEDDICT_PLANS.setdefault(tp, plan)
+
+
+def _is_valid_typeddict(obj: Any, tp: TypedDict, constraints: Optional[Constraints]) -> bool:
+    plan = _get_typeddict_plan(tp)
+
+    # ensure it's a dict that contains all the required keys
+    # and no extra key unless `__extra__` is set
+    if not plan.has_valid_keys(obj):
+        return False
+
+    field_types, rest_type = plan.field_types, plan.rest_type
+    return all(
+        isinstancex(v, field_types[k] if k in field_types else rest_type, constraints=constraints)
+        for k, v in obj.items()
+    )
+
+
+# (types of the parameters with whether they have a default value, return type) of a method
+MethodTypes = Tuple[List[Tuple[TypeLike, bool]], TypeLike]
+
+
+class _ProtocolPlan:
+    """
+    Members of a protocol, resolved once per protocol (e.g. `SupportsGet[int]`), with the
+    verdicts of the classes of the checked objects, so checking another instance of the same
+    class only checks the data members
+    """
+
+    def __init__(self, tp: TypeLike) -> None:
+        cls = get_origin(tp) or tp
+        type_vars = dict(zip(getattr(cls, "__parameters__", ()), get_args(tp)))
+        localns = {cls.__name__: cls}
+        hints = get_type_hints(cls, localns=localns, include_extras=True)
+
+        # (name, types of the method or `None` if it is not annotated)
+        self.methods: List[Tuple[str, Optional[MethodTypes]]] = []
+        # (name, type) of the data members
+        self.attributes: List[Tuple[str, TypeLike]] = []
+
+        for name, member in _get_protocol_members(cls).items():
+            if callable(member) or isinstance(member, (classmethod, staticmethod)):
+                method_types = _get_method_types(member, localns)
+                if method_types is not None:
+                    params, return_type = method_types
+                    method_types = (
+                        [(_substitute_type_vars(t, type_vars), d) for t, d in params],
+                        _substitute_type_vars(return_type, type_vars),
+                    )
+                self.methods.append((name, method_types))
+            else:
+                attribute_type = _substitute_type_vars(hints.get(name, Any), type_vars)
+                self.attributes.append((name, attribute_type))
+
+        self._verdicts: "weakref.WeakKeyDictionary[type, bool]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
 
-        are_required_keys_valid = all(
-            isinstancex(v, resolved_annotations[k], constraints=constraints)
-            for k, v in obj.items()
-            if k in required_keys
+    def has_compatible_methods(self, cls: type) -> bool:
+        try:
+            return self._verdicts[cls]
+        except KeyError:
+            pass
+
+        verdict = all(
+            _is_compatible_method(cls, name, method_types) for name, method_types in self.methods
         )
-        are_extra_keys_valid = all(
-            isinstancex(v, rest_type, constraints=constraints)
-            for k, v in obj.items()
-            if k not in required_keys
+        with self._lock:
+            self._verdicts[cls] = verdict
+        return verdict
+
+
+_PROTOCOL_PLANS: "weakref.WeakKeyDictionary[Any, _ProtocolPlan]" = weakref.WeakKeyDictionary()
+_PROTOCOL_PLANS_LOCK = threading.Lock()
+
+
+def _get_protocol_plan(tp: TypeLike) -> _ProtocolPlan:
+    try:
+        return _PROTOCOL_PLANS[tp]
+    except KeyError:
+        pass
+
+    plan = _ProtocolPlan(tp)
+    with _PROTOCOL_PLANS_LOCK:
+        return _PROTOCOL_PLANS.setdefault(tp, plan)
+
+
+def _get_protocol_members(cls: type) -> Dict[str, Any]:
+    """Members of a protocol and of its parent protocols (`None` for annotations without value)"""
+    members: Dict[str, Any] = {}
+    for base in reversed(cls.__mro__[:-1]):
+        if base.__name__ in ("Protocol", "Generic"):
+            continue
+        for name in base.__dict__.get("__annotations__", {}):
+            members.setdefault(name, None)
+        for name, value in base.__dict__.items():
+            if not name.startswith("_abc_") and name not in NON_PROTOCOL_MEMBERS:
+                members[name] = value
+    return members
+
+
+def _get_method_types(
+    member: Any, localns: Optional[Dict[str, Any]] = None
+) -> Optional[MethodTypes]:
+    """
+    Types of the parameters (without `self` or `cls`) and of the return of a method
+    or `None` if they cannot be known (e.g. `*args` or some builtin methods)
+    """
+    import inspect
+
+    func = getattr(member, "__func__", member)
+    try:
+        sig = inspect.signature(func)
+        hints = get_type_hints(func, localns=localns)
+    except (NameError, TypeError, ValueError):
+        return None
+
+    parameters = list(sig.parameters.values())
+    if not isinstance(member, staticmethod):
+        parameters = parameters[1:]
+    if any(p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in parameters):
+        return None
+
+    return (
+        [(hints.get(p.name, Any), p.default is not p.empty) for p in parameters],
+        hints.get("return", Any),
+    )
+
+
+def _is_compatible_method(cls: type, name: str, expected: Optional[MethodTypes]) -> bool:
+    """Check that `cls` has a method `name` that can be used like the one of a protocol"""
+    import inspect
+
+    try:
+        member = inspect.getattr_static(cls, name)
+    except AttributeError:
+        return False
+
+    if expected is None:
+        return True
+    actual = _get_method_types(member)
+    if actual is None:
+        return True
+
+    (expected_params, expected_return), (actual_params, actual_return) = expected, actual
+    # the method can have more parameters if they have a default value
+    if len(actual_params) < len(expected_params) or not all(
+        has_default for _, has_default in actual_params[len(expected_params) :]
+    ):
+        return False
+
+    # parameters are contravariant and the return type is covariant
+    return _is_compatible_type(actual_return, expected_return) and all(
+        _is_compatible_type(expected_tp, actual_tp)
+        for (expected_tp, _), (actual_tp, _) in zip(expected_params, actual_params)
+    )
+
+
+def _is_compatible_type(tp: TypeLike, expected: TypeLike) -> bool:
+    # missing annotations are compatible with everything
+    return tp is Any or expected is Any or issubclassx(tp, expected)
+
+
+class _GenericPlan:
+    """
+    Where the type parameters of a user generic class are used, resolved once per class:
+    the annotations of its attributes (e.g. `item: T`) and the type of its items if it is
+    an iterable (e.g. `class Repository(Iterable[T])`)
+    """
+
+    def __init__(self, cls: Any) -> None:
+        hints = get_type_hints(cls, localns={cls.__name__: cls}, include_extras=True)
+        self.params: Tuple[Any, ...] = cls.__parameters__
+        self.attribute_types: List[Tuple[str, TypeLike]] = [
+            (name, tp)
+            for name, tp in hints.items()
+            if get_origin(tp) is not ClassVar and _get_type_vars(tp)
+        ]
+
+        self.items_type: Optional[TypeLike] = None
+        for base in getattr(cls, "__orig_bases__", ()):
+            base_origin = get_origin(base)
+            if (
+                isinstance(base_origin, type)
+                and issubclass(base_origin, collections.abc.Iterable)
+                and get_args(base)
+            ):
+                self.items_type = get_args(base)[0]
+                break
+
+        # resolved types of the attributes and the items by parameterized class (e.g. Box[int])
+        self._resolved: Dict[Any, Tuple[List[Tuple[str, TypeLike]], Optional[TypeLike]]] = {}
+
+    def resolve(self, tp: TypeLike) -> Tuple[List[Tuple[str, TypeLike]], Optional[TypeLike]]:
+        """Types of the attributes and the items of a valid `tp` (e.g. `Box[int]`)"""
+        try:
+            return self._resolved[tp]
+        except KeyError:
+            pass
+
+        type_vars = dict(zip(self.params, get_args(tp)))
+        attribute_types = [
+            (name, _substitute_type_vars(t, type_vars)) for name, t in self.attribute_types
+        ]
+        items_type = (
+            None if self.items_type is None else _substitute_type_vars(self.items_type, type_vars)
         )
-        return are_required_keys_valid and are_extra_keys_valid
+        # a race between threads can only resolve the same types twice
+        return self._resolved.setdefault(tp, (attribute_types, items_type))
 
-    else:
-        # ensure it's a dict that contains all the required keys without extra key
-        if not (set(obj).issuperset(required_keys) and set(obj).issubset(tp.__annotations__)):
+
+_GENERIC_PLANS: "weakref.WeakKeyDictionary[Any, _GenericPlan]" = weakref.WeakKeyDictionary()
+_GENERIC_PLANS_LOCK = threading.Lock()
+
+
+def _get_generic_plan(cls: Any) -> _GenericPlan:
+    try:
+        return _GENERIC_PLANS[cls]
+    except KeyError:
+        pass
+
+    plan = _GenericPlan(cls)
+    with _GENERIC_PLANS_LOCK:
+        return _GENERIC_PLANS.setdefault(cls, plan)
+
+
+def _get_type_vars(tp: TypeLike) -> Tuple[Any, ...]:
+    if isinstance(tp, TypeVar):
+        return (tp,)
+    return getattr(tp, "__parameters__", ())
+
+
+def _substitute_type_vars(tp: TypeLike, type_vars: Dict[Any, TypeLike]) -> TypeLike:
+    """Replace the type variables of `tp` (e.g. `List[T]` -> `List[int]`)"""
+    if isinstance(tp, TypeVar):
+        return type_vars.get(tp, Any)
+    params = getattr(tp, "__parameters__", ())
+    if not params:
+        return tp
+    return tp[tuple(type_vars.get(p, Any) for p in params)]
+
+
+def _is_valid_typeddict_list(obj: List[Any], tp: TypedDict) -> bool:
+    """
+    Check a list of `TypedDict` column by column: the keys of all the rows are checked first
+    and then all the values of a field are checked at once with the same type
+    """
+    plan = _get_typeddict_plan(tp)
+
+    # like the check row by row, any mapping is accepted (e.g. a `MappingProxyType`)
+    if not all(
+        isinstance(row, collections.abc.Mapping) and plan.has_valid_keys(row) for row in obj
+    ):
+        return False
+
+    for key, field_type in plan.field_types.items():
+        if key in plan.required_keys:
+            column: Iterable[Any] = map(itemgetter(key), obj)
+        else:
+            column = (row[key] for row in obj if key in row)
+
+        if not _is_valid_column(column, field_type):
             return False
 
-        return all(
-            isinstancex(v, resolved_annotations[k], constraints=constraints) for k, v in obj.items()
-        )
+    if plan.rest_type is not None:
+        declared_keys = plan.declared_keys
+        rest_column = (v for row in obj for k, v in row.items() if k not in declared_keys)
+        return _is_valid_column(rest_column, plan.rest_type)
+
+    return True
+
+
+def _is_valid_column(values: Iterable[Any], tp: TypeLike) -> bool:
+    """Check that all the values respect the same type"""
+    if get_origin(tp) is Annotated:
+        tp, constraints = get_args(tp)
+        if _is_plain_class(tp):
+            values = list(values)
+            return all(map(isinstance, values, repeat(tp))) and all(
+                map(constraints.is_valid, values)
+            )
+        return all(isinstancex(v, tp, constraints=constraints) for v in values)
+
+    if _is_plain_class(tp):
+        return all(map(isinstance, values, repeat(tp)))
+
+    return all(isinstancex(v, tp) for v in values)
+
+
+def _is_plain_class(tp: TypeLike) -> bool:
+    """Check if `isinstancex(obj, tp)` is the same as `isinstance(obj, tp)`"""
+    return (
+        isinstance(tp, type)
+        and get_origin(tp) is None
+        and _get_handler(tp, None) is _check_instance
+    )
 
 
 def _get_function_type_hints(obj: Callable[..., Any]) -> Tuple[List[TypeLike], TypeLike]:
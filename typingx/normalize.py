@@ -0,0 +1,108 @@
+"""
+Simplify types before they are checked, so equivalent types are checked the same way
+and redundant members of unions are not checked many times
+"""
+import collections.abc
+import sys
+from typing import Any, List, Tuple, Union
+
+from .main import NONE_TYPES, UNION_TYPES, Constraints, _convert_shorthand
+from .typing_compat import (
+    Annotated,
+    Literal,
+    TypeLike,
+    _get_all_literal_values,
+    get_args,
+    get_origin,
+    is_literal,
+    is_newtype,
+)
+
+if sys.version_info >= (3, 9):
+    from types import GenericAlias
+else:  # pragma: no cover
+    GenericAlias = None
+
+__all__ = ("normalize",)
+
+# origins of generic types whose args are not only types (e.g. `[int]` in `Callable[[int], str]`)
+NOT_NORMALIZED_ORIGINS = {collections.abc.Callable}
+
+
+def normalize(tp: TypeLike) -> TypeLike:
+    """
+    Return a simpler type equivalent to `tp`:
+    - nested unions are flattened, their members deduplicated and any union with `Any` is `Any`
+    - literals of a union are merged into one `Literal`
+    - `NewType`s are replaced by their supertype
+    - `Annotated` without `Constraints` is replaced by its type
+    - shortcuts (e.g. `{'a': int}` or `[int, ...]`) are converted to their types
+    All the types in `tp` are normalized (e.g. the items type of `List[...]`)
+
+        >>> normalize(Union[int, Optional[Union[str, int]], Literal['a'], Literal['b']])
+        Union[int, str, NoneType, Literal['a', 'b']]
+    """
+    if isinstance(tp, dict):
+        return _convert_shorthand({k: normalize(v) for k, v in tp.items()})
+    if isinstance(tp, (list, tuple)):
+        return _convert_shorthand(type(tp)(normalize(arg) for arg in tp))
+
+    while is_newtype(tp):
+        tp = tp.__supertype__
+
+    origin = get_origin(tp)
+
+    if origin is Annotated:
+        tp, *metadata = get_args(tp)
+        tp = normalize(tp)
+        constraints = [m for m in metadata if isinstance(m, Constraints)]
+        if not constraints or tp is Any:
+            return tp
+        return Annotated[(tp, *constraints)]
+
+    if origin in UNION_TYPES:
+        return _normalize_union(get_args(tp))
+
+    if origin is None or is_literal(tp) or origin in NOT_NORMALIZED_ORIGINS:
+        return tp
+
+    args = getattr(tp, "__args__", ())
+    normalized_args = tuple(normalize(arg) for arg in args)
+    # the same type is kept when nothing changed, so plans cached by type are kept too
+    if all(a is b for a, b in zip(args, normalized_args)):
+        return tp
+
+    if GenericAlias is not None and isinstance(tp, GenericAlias):
+        return GenericAlias(origin, normalized_args)
+    if hasattr(tp, "copy_with"):
+        return tp.copy_with(normalized_args)
+    return tp  # pragma: no cover
+
+
+def _normalize_union(members: Tuple[TypeLike, ...]) -> TypeLike:
+    flat_members: List[TypeLike] = []
+    literal_values: List[Any] = []
+    for member in members:
+        member = normalize(member)
+        if member is Any:
+            return Any
+
+        if get_origin(member) in UNION_TYPES:
+            submembers = get_args(member)
+        else:
+            submembers = (member,)
+
+        for submember in submembers:
+            if is_literal(submember) and submember not in NONE_TYPES:
+                literal_values += _get_all_literal_values(submember)
+            elif submember not in flat_members:
+                flat_members.append(submember)
+
+    if literal_values:
+        # `1` and `True` are equal but are not the same literal value
+        unique_values = {(type(v), v): v for v in literal_values}
+        flat_members.append(Literal[tuple(unique_values.values())])
+
+    if len(flat_members) == 1:
+        return flat_members[0]
+    return Union[tuple(flat_members)]
@@ -2,6 +2,7 @@
 Module that handles differences between supported versions of Python
 for some methods / classes of the `typing` module
 """
+import collections
 import collections.abc
 import sys
 import typing as T
@@ -29,6 +30,25 @@ TypeLike = T.Union[T.Type[T.Any], T.Union[T.Any]]
 OneOrManyTypes = T.Union[TypeLike, T.Tuple[TypeLike, ...]]
 
 
+#######################################
+# cache
+#######################################
+# `get_args` and `get_origin` are called many times on the same types so their results are
+# cached by identity of the type. The type is kept in the cache so its `id` cannot be reused.
+# Entries are immutable tuples set and read with single dict operations so the caches can be
+# shared by threads without lock: a race can only compute the same value twice
+CACHE_MAX_SIZE = 4096
+
+_ARGS_CACHE: T.Dict[int, T.Tuple[TypeLike, T.Tuple[T.Any, ...]]] = {}
+_ORIGIN_CACHE: T.Dict[int, T.Tuple[TypeLike, T.Optional[TypeLike]]] = {}
+
+
+def _cache(cache: T.Dict[int, T.Tuple[TypeLike, T.Any]], tp: TypeLike, value: T.Any) -> None:
+    if len(cache) >= CACHE_MAX_SIZE:
+        cache.clear()
+    cache[id(tp)] = (tp, value)
+
+
 #######################################
 # get_args
 #######################################
@@ -106,6 +126,20 @@ else:
 
 
 def get_args(tp: TypeLike) -> T.Tuple[T.Any, ...]:
+    try:
+        cached_tp, args = _ARGS_CACHE[id(tp)]
+    except KeyError:
+        pass
+    else:
+        if cached_tp is tp:
+            return args
+
+    args = _get_args(tp)
+    _cache(_ARGS_CACHE, tp, args)
+    return args
+
+
+def _get_args(tp: TypeLike) -> T.Tuple[T.Any, ...]:
     if sys.version_info >= (3, 10):
         return T_get_args(tp)
     else:
@@ -128,32 +162,55 @@ elif sys.version_info[:2] == (3, 7):
         return getattr(tp, "__origin__", None)
 
 else:
+    # In python 3.6, the origin of `List[str]` for example
+    # is `List` and not `list`. We hence need an explicit mapping...
+    TYPING_TO_BUILTIN_MAP = {
+        T.AbstractSet: collections.abc.Set,
+        T.Callable: collections.abc.Callable,
+        T.Collection: collections.abc.Collection,
+        T.Counter: collections.Counter,
+        T.DefaultDict: collections.defaultdict,
+        T.Deque: collections.deque,
+        T.Dict: dict,
+        T.FrozenSet: frozenset,
+        T.Generator: collections.abc.Generator,
+        T.Iterable: collections.abc.Iterable,
+        T.Iterator: collections.abc.Iterator,
+        T.List: list,
+        T.Mapping: collections.abc.Mapping,
+        T.MutableMapping: collections.abc.MutableMapping,
+        T.MutableSequence: collections.abc.MutableSequence,
+        T.MutableSet: collections.abc.MutableSet,
+        T.Set: set,
+        T.Sequence: collections.abc.Sequence,
+        T.Tuple: tuple,
+        T.Type: type,
+    }
 
     def T_get_origin(tp: TypeLike) -> T.Optional[TypeLike]:
-        # In python 3.6, the origin of `List[str]` for example
-        # is `List` and not `list`. We hence need an explicit mapping...
-        typing_to_builtin_map = {
-            T.Callable: collections.abc.Callable,
-            T.Collection: collections.abc.Collection,
-            T.Dict: dict,
-            T.FrozenSet: frozenset,
-            T.List: list,
-            T.Mapping: collections.abc.Mapping,
-            T.Set: set,
-            T.Sequence: collections.abc.Sequence,
-            T.Tuple: tuple,
-            T.Type: type,
-        }
-
         origin = getattr(tp, "_gorg", getattr(tp, "__origin__", None))
 
         while getattr(origin, "__args__", None):
             origin = T_get_origin(origin)
 
-        return typing_to_builtin_map.get(origin, origin)
+        return TYPING_TO_BUILTIN_MAP.get(origin, origin)
 
 
 def get_origin(tp: TypeLike) -> T.Optional[TypeLike]:
+    try:
+        cached_tp, origin = _ORIGIN_CACHE[id(tp)]
+    except KeyError:
+        pass
+    else:
+        if cached_tp is tp:
+            return origin
+
+    origin = _get_origin(tp)
+    _cache(_ORIGIN_CACHE, tp, origin)
+    return origin
+
+
+def _get_origin(tp: TypeLike) -> T.Optional[TypeLike]:
     # Python 3.9+
     if sys.version_info >= (3, 9):
         return T_get_origin(tp)
@@ -247,10 +304,14 @@ else:
         from typing import TypedDict
 
 
+_TestTypedDict = TypedDict("_TestTypedDict", {"a": int})  # type: ignore[call-overload]
+
+
 def is_typeddict(tp: TypeLike) -> bool:
     # Python 3.10+
     if sys.version_info >= (3, 10):
-        return T.is_typeddict(tp)
+        # `typing_extensions.TypedDict` may not be the one of `typing`
+        return T.is_typeddict(tp) or isinstance(tp, _TestTypedDict.__class__)
 
     # Python 3.6 to Python 3.9
     else:
@@ -273,7 +334,8 @@ def is_literal(tp: TypeLike) -> bool:
     if sys.version_info >= (3, 7):
         return T_get_origin(tp) is Literal
     else:
-        return hasattr(tp, "__values__") and tp == Literal[tp.__values__]
+        # `Literal` itself has no values
+        return tp.__class__ is Literal.__class__ and tp.__values__ is not None
 
 
 def _get_literal_values(tp: TypeLike) -> T.Tuple[T.Any, ...]:
@@ -326,7 +388,9 @@ def is_annotated(tp: TypeLike) -> bool:
 # Utils
 #######################################
 def display_type(tp: TypeLike) -> str:
-    if tp.__class__.__module__ in {"typing", "typing_extensions"}:
+    if is_typeddict(tp):
+        return tp.__name__
+    elif tp.__class__.__module__ in {"typing", "typing_extensions"}:
         return str(tp).replace("typing_extensions.", "").replace("typing.", "")
     else:
         return tp.__name__
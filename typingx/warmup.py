@@ -0,0 +1,140 @@
+"""
+Resolve the plans of the types checked by an application before they are first checked,
+e.g. in the master process of a web server before it forks its workers, so the workers share
+the resolved plans instead of each resolving them on their first requests
+"""
+import gc
+import importlib
+import re
+from types import ModuleType
+from typing import Any, Dict, Generic, Iterable, Union
+
+from .fields_check import _FieldsChecker
+from .func_check import _CheckedFunction
+from .main import (
+    _TYPE_HANDLERS,
+    NATIVE_GENERIC_MODULES,
+    Constraints,
+    _convert_shorthand,
+    _get_generic_plan,
+    _get_items_plan,
+    _get_protocol_plan,
+    _get_typeddict_plan,
+    _is_protocol,
+    _is_user_generic,
+)
+from .typing_compat import Annotated, TypeLike, get_args, get_origin, is_literal, is_typeddict
+
+__all__ = ("warmup",)
+
+# modules imported by functions of typingx when they are first called
+LAZY_IMPORTS = ("inspect", "re", "warnings", "typing_extensions")
+
+
+def warmup(
+    types_or_modules: Iterable[Union[TypeLike, ModuleType]], *, freeze: bool = False
+) -> None:
+    """
+    Resolve and cache the plans of the given types (and of all the types they contain) or,
+    for modules, of the `TypedDict`s, protocols, user generic classes, classes decorated with
+    `fields_check` and functions decorated with `func_check` defined in these modules.
+    With `freeze=True`, all the objects tracked by the garbage collector are then frozen
+    (see `gc.freeze`) so forked processes do not copy the memory pages of the plans
+
+        >>> import myapp.models, myapp.views
+        >>> warmup([myapp.models, myapp.views, Dict[str, int]], freeze=True)
+    """
+    for name in LAZY_IMPORTS:
+        try:
+            importlib.import_module(name)
+        except ImportError:  # pragma: no cover
+            pass
+
+    seen: Dict[int, Any] = {}
+    for obj in types_or_modules:
+        if isinstance(obj, ModuleType):
+            for value in vars(obj).values():
+                if getattr(value, "__module__", None) == obj.__name__:
+                    _warmup_object(value, seen)
+        else:
+            _warmup_object(obj, seen)
+
+    if freeze and hasattr(gc, "freeze"):  # python 3.7+
+        gc.collect()
+        gc.freeze()
+
+
+def _warmup_object(obj: Any, seen: Dict[int, Any]) -> None:
+    if isinstance(obj, _CheckedFunction):
+        _warmup_function(obj, seen)
+    elif isinstance(obj, type) and not is_typeddict(obj) and not _is_protocol(obj):
+        # methods of a class decorated with `func_check_class`
+        for value in vars(obj).values():
+            value = getattr(value, "__func__", value)  # classmethod and staticmethod
+            if isinstance(value, _CheckedFunction):
+                _warmup_function(value, seen)
+        if _is_plain_user_generic(obj):
+            _get_generic_plan(obj)
+        _warmup_type(obj, seen)
+    else:
+        _warmup_type(obj, seen)
+
+
+def _warmup_function(func: _CheckedFunction, seen: Dict[int, Any]) -> None:
+    plan = func.plan
+    for _, _, tp, _, _ in plan.params:
+        _warmup_type(tp, seen)
+    if plan.var_args is not None:
+        _warmup_type(plan.var_args[1], seen)
+    if plan.var_kwargs is not None:
+        _warmup_type(plan.var_kwargs, seen)
+    _warmup_type(plan.return_type, seen)
+
+
+def _is_plain_user_generic(cls: type) -> bool:
+    # e.g. `Box` with `class Box(Generic[T])`, whose plan is shared by `Box[int]`, `Box[str]`...
+    return (
+        issubclass(cls, Generic)  # type: ignore[arg-type]
+        and bool(getattr(cls, "__parameters__", ()))
+        and cls.__module__ not in NATIVE_GENERIC_MODULES
+    )
+
+
+def _warmup_type(tp: Any, seen: Dict[int, Any]) -> None:
+    """Resolve the plans of `tp` and of all the types it contains"""
+    # the types are kept in `seen` so their `id` cannot be reused by another type meanwhile
+    if id(tp) in seen:
+        return
+    seen[id(tp)] = tp
+
+    tp = _convert_shorthand(tp)
+    origin = get_origin(tp)
+    args = get_args(tp)
+    if is_literal(tp):
+        return
+
+    if origin is Annotated:
+        _get_items_plan(tp)
+        for constraints in args[1:]:
+            if isinstance(constraints, Constraints) and constraints.regex is not None:
+                # cached by `re` for the `re.search` of the checks
+                re.compile(constraints.regex)
+        args = args[:1]
+
+    if is_typeddict(tp):
+        plan = _get_typeddict_plan(tp)
+        args = (*plan.field_types.values(), plan.rest_type)
+    elif _is_protocol(tp):
+        protocol_plan = _get_protocol_plan(tp)
+        args = tuple(t for _, t in protocol_plan.attributes)
+    elif _is_user_generic(tp):
+        attribute_types, items_type = _get_generic_plan(origin).resolve(tp)
+        args = (*args, *(t for _, t in attribute_types), items_type)
+
+    handler = _TYPE_HANDLERS.get(tp) if origin is None else None
+    if isinstance(handler, _FieldsChecker):
+        args = tuple(t for _, t in handler.plan.fields)
+
+    for arg in args:
+        if arg is not None and arg is not ...:
+            _warmup_type(arg, seen)